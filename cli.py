@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Punto de entrada de DotaTwin sin interfaz gráfica.
+
+Ejecuta los subcomandos de src.cli (scan, copy, backup, restore y
+list-ignored) sin importar tkinter ni PIL. Ejemplo:
+
+    python cli.py scan --fast
+    python cli.py copy 12345678 87654321
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path para imports
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+if __name__ == "__main__":
+    if sys.version_info < (3, 7):
+        print("Error: Se requiere Python 3.7 o superior", file=sys.stderr)
+        sys.exit(1)
+    
+    from src.cli.main import main
+    main()
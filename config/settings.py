@@ -65,9 +65,14 @@ DOCS_DIR = PROJECT_ROOT / "docs"
 # Rutas de Steam (Windows)
 STEAM_USERDATA_PATH = Path(r"C:\Program Files (x86)\Steam\userdata")
 AVATAR_CACHE_PATH = Path(r"C:\Program Files (x86)\Steam\config\avatarcache")
+LOGIN_USERS_FILE = "loginusers.vdf"  # En <Steam>/config, con los nombres de todas las cuentas
+
+# Diferencia entre SteamID64 y el Steam3 ID usado como nombre de carpeta
+STEAMID64_BASE = 76561197960265728
 
 # Archivos de configuración
 CACHE_FILE = "ultima_seleccion.json"
+ACCOUNT_INDEX_FILE = "account_index.json"  # Índice de cuentas junto al caché de selección
 ICON_PATH = _get_resource_path("dota2.ico")  # Usar función de detección de rutas
 LOG_FILE = "app.log"
 
@@ -153,6 +158,52 @@ EXCLUDE_FOLDERS = [
     "logs"
 ]
 
+# Perfiles de copia: archivos a incluir (vacío = todos) y carpetas a omitir.
+# Se aplican a las copias y a los backups; lo omitido no se toca en el destino.
+COPY_PROFILES = {
+    "completo": {"include": [], "exclude_dirs": []},
+    "sin_temporales": {"include": [], "exclude_dirs": EXCLUDE_FOLDERS},
+    "solo_configuracion": {"include": CONFIG_PATTERNS, "exclude_dirs": EXCLUDE_FOLDERS},
+}
+DEFAULT_COPY_PROFILE = "completo"
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONFIGURACIONES DE RENDIMIENTO
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Número máximo de hilos para la detección concurrente de cuentas
+DISCOVERY_MAX_WORKERS = 8
+DISCOVERY_DRAIN_MS = 50          # Milisegundos entre lotes de la detección progresiva
+
+# Vigilancia de cambios en userdata/avatarcache
+ACCOUNT_WATCH_INTERVAL = 2.0     # Segundos entre instantáneas (modo sondeo)
+ACCOUNT_WATCH_DEBOUNCE = 0.5     # Segundos para agrupar eventos de inotify
+ACCOUNT_WATCH_POLL_MS = 500      # Milisegundos entre consultas de la interfaz
+
+# Detección de la instalación de Steam en las rutas típicas
+STEAM_PROBE_TIMEOUT = 2.0        # Segundos máximos por ruta (unidades dormidas o de red)
+
+# Caché de metadatos (stat) compartida durante un escaneo u operación
+STAT_CACHE_TTL = 2.0             # Segundos de validez de cada entrada
+
+# Backups: "store" (almacén deduplicado por contenido), "zip" (archivo
+# comprimido) o "tree" (copia completa)
+BACKUP_FORMAT = "tree"
+BACKUP_STORE_DIR = "store"       # Subcarpeta de backups con blobs y manifiestos
+BACKUP_ARCHIVE_COMPRESSION = "deflate"   # Compresión de los zip: "deflate", "lzma" o "none"
+
+# Copia de archivos (reflink, copy_file_range, sendfile o búfer)
+COPY_BUFFER_SIZE = 1024 * 1024   # Bytes por lectura cuando no hay copia en el kernel
+COPY_MAX_WORKERS = 8             # Hilos para copiar archivos en paralelo (1 = secuencial)
+
+# Estimación de tamaño y comprobación de espacio libre antes de copiar
+SIZE_ESTIMATE_MAX_WORKERS = 4                # Hilos para listar carpetas (1 = secuencial)
+DISK_SPACE_MARGIN = 64 * 1024 * 1024         # Bytes libres que se dejan de reserva
+
+# Servicio en segundo plano de la CLI (cli.py daemon)
+DAEMON_NAME = "dotatwin"             # Base del socket Unix o de la tubería con nombre
+DAEMON_AUTHKEY_FILE = "daemon.key"   # Clave compartida con los clientes, junto al caché de selección
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURACIONES DE LOGGING
 # ═══════════════════════════════════════════════════════════════════════════
@@ -216,6 +267,7 @@ MESSAGES = {
     "select_accounts": "Selecciona origen y destino",
     "ready_to_copy": "Listo para copiar de '{}' a '{}'",
     "no_accounts": "No se encontraron cuentas de Steam con Dota 2",
+    "loading_account_name": "Cargando...",
     "no_ignored_accounts": "No hay cuentas ignoradas",
     "error_steam_path": "No se encontró la instalación de Steam en la ruta estándar",
     "error_permissions": "Error de permisos. Ejecuta como administrador.",
@@ -0,0 +1 @@
+# Archivo vacío para hacer el directorio un paquete Python
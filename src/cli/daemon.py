@@ -0,0 +1,382 @@
+"""
+Servicio en segundo plano de la CLI.
+
+Mantiene en memoria la lista de cuentas, el índice de avatares y la
+configuración, y atiende las peticiones de la CLI (o de cualquier script)
+por un socket Unix o una tubería con nombre de Windows. La lista se
+mantiene al día con el vigilante de cuentas y la configuración se relee
+si cambia en disco, de modo que una consulta no vuelve a escanear userdata.
+
+El protocolo es JSON sobre multiprocessing.connection, autenticado con
+una clave aleatoria guardada junto al archivo de configuración:
+
+    petición:  {"command": "scan", "params": {"fast": false}}
+    respuesta: {"ok": true, "accounts": [...]}
+
+Además de los subcomandos de la CLI acepta "ping" y "shutdown".
+"""
+
+import os
+import sys
+import json
+import errno
+import socket
+import logging
+import tempfile
+import threading
+from multiprocessing.connection import Client, Connection, Listener, AuthenticationError
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from ..core.account_index import FileStamp, stat_stamp
+from ..core.account_watcher import AccountWatcher
+from ..models.domain_models import SteamAccount
+from .main import CliApp, execute_request
+from config.settings import CACHE_FILE, DAEMON_NAME, DAEMON_AUTHKEY_FILE
+
+logger = logging.getLogger(__name__)
+
+_PIPE_PREFIX = "\\\\.\\pipe\\"
+
+
+class DaemonUnavailable(Exception):
+    """No hay un servicio en segundo plano accesible."""
+
+
+def default_address() -> str:
+    """
+    Dirección por defecto del servicio para el usuario actual.
+
+    Returns:
+        Ruta del socket Unix o nombre de la tubería de Windows
+    """
+    if sys.platform == "win32":
+        user = os.environ.get("USERNAME", "user")
+        return f"{_PIPE_PREFIX}{DAEMON_NAME}-{user}"
+    return os.path.join(tempfile.gettempdir(), f"{DAEMON_NAME}-{os.getuid()}.sock")
+
+
+def _address_family(address: str) -> str:
+    """Familia de multiprocessing.connection que corresponde a una dirección."""
+    return "AF_PIPE" if address.startswith(_PIPE_PREFIX) else "AF_UNIX"
+
+
+def authkey_path(config_file: Optional[Path] = None) -> Path:
+    """Ruta de la clave del servicio, junto al archivo de configuración."""
+    config_file = config_file or Path(CACHE_FILE)
+    return config_file.parent / DAEMON_AUTHKEY_FILE
+
+
+def load_authkey(key_file: Path, create: bool = False) -> bytes:
+    """
+    Lee la clave compartida entre el servicio y sus clientes.
+
+    Args:
+        key_file: Archivo de la clave
+        create: Genera una clave nueva si el archivo no existe
+
+    Returns:
+        Clave en bytes
+    """
+    try:
+        return key_file.read_bytes()
+    except FileNotFoundError:
+        if not create:
+            raise DaemonUnavailable(f"No existe la clave del servicio: {key_file}")
+
+    key = os.urandom(32)
+    key_file.parent.mkdir(parents=True, exist_ok=True)
+    # Sólo el usuario actual puede leer la clave
+    fd = os.open(str(key_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+class DaemonApp(CliApp):
+    """
+    CliApp que conserva las cuentas en memoria entre peticiones.
+
+    Las cuentas se detectan una vez al arrancar. Después, cada petición
+    aplica los cambios que haya notificado el vigilante de la instalación
+    principal y relee la configuración si su archivo cambió; si cambian
+    las instalaciones configuradas se repite la detección.
+    """
+
+    def __init__(self, config_file: Optional[Path] = None, steam_path: str = ""):
+        super().__init__(config_file, steam_path)
+        self._accounts: List[SteamAccount] = []
+        self._watcher: Optional[AccountWatcher] = None
+        self._config_stamp: FileStamp = stat_stamp(self.config_service.config_file)
+        self._roots: List[Path] = []
+
+    @property
+    def account_count(self) -> int:
+        """Número de cuentas en memoria."""
+        return len(self._accounts)
+
+    def start(self) -> None:
+        """Detecta las cuentas y empieza a vigilar la instalación principal."""
+        self.stop()
+        self._roots = self.session.steam_roots
+        if not self._roots:
+            logger.warning("No se encontró ninguna instalación de Steam")
+            self._accounts = []
+            return
+
+        self._accounts = self.session.discovery_service.find_accounts_with_dota2()
+        self._watcher = AccountWatcher(self.session.account_service)
+        self._watcher.start(self._accounts)
+        logger.info(f"Servicio listo con {len(self._accounts)} cuentas")
+
+    def stop(self) -> None:
+        """Detiene la vigilancia."""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def sync(self) -> None:
+        """Aplica los cambios pendientes de disco a las cuentas en memoria."""
+        stamp = stat_stamp(self.config_service.config_file)
+        if stamp != self._config_stamp:
+            self._config_stamp = stamp
+            self.config_service.reload_config()
+            self.session.config = self._session_config()
+            if self.session.steam_roots != self._roots:
+                logger.info("Cambiaron las instalaciones de Steam: se repite la detección")
+                self.start()
+                return
+
+        if self._watcher is not None:
+            events = self._watcher.drain_events()
+            if events:
+                self._accounts = AccountWatcher.apply_events(self._accounts, events)
+
+    def _discover(self, fast: bool) -> List[SteamAccount]:
+        """Devuelve las cuentas en memoria (ya enriquecidas)."""
+        self._require_steam()
+        self.sync()
+        return list(self._accounts)
+
+
+class AccountDaemon:
+    """
+    Servidor que atiende peticiones JSON sobre un socket o una tubería.
+
+    Cada conexión se atiende en su propio hilo y puede enviar varias
+    peticiones seguidas; las peticiones se ejecutan de una en una.
+    """
+
+    def __init__(self, app: DaemonApp, address: Optional[str] = None,
+                 authkey: Optional[bytes] = None):
+        """
+        Inicializa el servidor.
+
+        Args:
+            app: Aplicación que ejecuta los comandos
+            address: Dirección en la que escuchar (por defecto default_address())
+            authkey: Clave compartida (por defecto la del archivo de configuración)
+        """
+        self.app = app
+        self.address = address or default_address()
+        self.authkey = authkey if authkey is not None else load_authkey(
+            authkey_path(app.config_service.config_file), create=True
+        )
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._listener: Optional[Listener] = None
+        self.ready = threading.Event()
+
+    def serve_forever(self) -> None:
+        """Escucha peticiones hasta que se llama a stop() o llega "shutdown"."""
+        family = _address_family(self.address)
+        if family == "AF_UNIX":
+            self._remove_stale_socket()
+
+        with Listener(self.address, family, authkey=self.authkey) as listener:
+            self._listener = listener
+            logger.info(f"Servicio escuchando en {self.address}")
+            self.ready.set()
+
+            while not self._stopped.is_set():
+                try:
+                    conn = listener.accept()
+                except AuthenticationError:
+                    logger.warning("Conexión rechazada: clave incorrecta")
+                    continue
+                except OSError as e:
+                    if self._stopped.is_set():
+                        break
+                    logger.warning(f"Error aceptando conexión: {e}")
+                    continue
+
+                if self._stopped.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._serve_connection, args=(conn,),
+                                 name="daemon-connection", daemon=True).start()
+
+        self.app.stop()
+        logger.info("Servicio detenido")
+
+    def stop(self) -> None:
+        """Detiene el servidor desde cualquier hilo."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        # accept() no se interrumpe al cerrar el socket: conectarse para despertarlo
+        try:
+            Client(self.address, _address_family(self.address), authkey=self.authkey).close()
+        except (OSError, AuthenticationError, EOFError):
+            pass
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ejecuta una petición.
+
+        Args:
+            request: Diccionario con "command" y "params"
+
+        Returns:
+            Respuesta con "ok" y el resultado o el error
+        """
+        command = request.get("command", "")
+        params = request.get("params") or {}
+
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid(), "accounts": self.app.account_count}
+        if command == "shutdown":
+            return {"ok": True}
+
+        with self._lock:
+            return execute_request(lambda: self.app, command, params)
+
+    def _serve_connection(self, conn: Connection) -> None:
+        """Atiende las peticiones de una conexión hasta que el cliente cierra."""
+        with conn:
+            while not self._stopped.is_set():
+                try:
+                    request = json.loads(conn.recv_bytes().decode("utf-8"))
+                except (EOFError, OSError):
+                    return
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Petición inválida: {e}"}
+                else:
+                    response = self.handle_request(request)
+
+                try:
+                    conn.send_bytes(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+                except OSError:
+                    return
+
+                if isinstance(request, dict) and request.get("command") == "shutdown":
+                    self.stop()
+                    return
+
+    def _remove_stale_socket(self) -> None:
+        """
+        Elimina el socket de un servicio anterior que ya no escucha.
+
+        Sólo se considera abandonado si nadie acepta la conexión; un
+        servicio vivo con otra clave (otro --config) no se desplaza.
+
+        Raises:
+            RuntimeError: Si otro servicio sigue escuchando en la dirección
+        """
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.address)
+        except OSError as e:
+            if e.errno in (errno.ECONNREFUSED, errno.ENOENT):
+                if os.path.lexists(self.address):
+                    os.unlink(self.address)
+                return
+            raise
+        finally:
+            probe.close()
+        raise RuntimeError(f"Ya hay un servicio escuchando en {self.address}")
+
+
+class DaemonClient:
+    """
+    Cliente del servicio en segundo plano.
+
+    Usado como context manager mantiene una sola conexión para varias
+    peticiones; si no, abre una conexión por petición.
+    """
+
+    def __init__(self, address: Optional[str] = None, config_file: Optional[Path] = None,
+                 authkey: Optional[bytes] = None):
+        """
+        Inicializa el cliente.
+
+        Args:
+            address: Dirección del servicio (por defecto default_address())
+            config_file: Archivo de configuración junto al que está la clave
+            authkey: Clave compartida (por defecto la del archivo de configuración)
+        """
+        self.address = address or default_address()
+        self.config_file = config_file
+        self.authkey = authkey
+        self._conn: Optional[Connection] = None
+
+    def __enter__(self) -> "DaemonClient":
+        self._conn = self._connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        return False  # No suprimir excepciones
+
+    def request(self, command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Envía una petición y espera la respuesta.
+
+        Args:
+            command: Subcomando de la CLI, "ping" o "shutdown"
+            params: Argumentos del subcomando
+
+        Returns:
+            Respuesta del servicio
+        """
+        conn = self._conn or self._connect()
+        try:
+            message = json.dumps({"command": command, "params": params or {}})
+            conn.send_bytes(message.encode("utf-8"))
+            return json.loads(conn.recv_bytes().decode("utf-8"))
+        except (EOFError, OSError) as e:
+            raise DaemonUnavailable(f"Se perdió la conexión con el servicio: {e}")
+        finally:
+            if conn is not self._conn:
+                conn.close()
+
+    def _connect(self) -> Connection:
+        """Abre una conexión autenticada con el servicio."""
+        authkey = self.authkey
+        if authkey is None:
+            authkey = load_authkey(authkey_path(self.config_file))
+        try:
+            return Client(self.address, _address_family(self.address), authkey=authkey)
+        except (OSError, AuthenticationError, EOFError) as e:
+            raise DaemonUnavailable(f"No se pudo conectar con {self.address}: {e}")
+
+
+def serve(config_file: Optional[Path] = None, steam_path: str = "",
+          address: Optional[str] = None) -> None:
+    """
+    Arranca el servicio en primer plano hasta recibir "shutdown" o Ctrl+C.
+
+    Args:
+        config_file: Archivo de configuración
+        steam_path: Ruta de Steam que sustituye a la configurada (opcional)
+        address: Dirección en la que escuchar (opcional)
+    """
+    app = DaemonApp(config_file, steam_path)
+    app.start()
+    daemon = AccountDaemon(app, address)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.stop()
+        app.stop()
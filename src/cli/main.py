@@ -0,0 +1,503 @@
+"""
+Modo de línea de comandos de DotaTwin.
+
+Permite detectar cuentas, copiar configuraciones y gestionar backups desde
+scripts sin arrancar la interfaz gráfica. Usa directamente los servicios
+del núcleo y escribe el resultado en JSON por la salida estándar; los
+mensajes de log van a la salida de error.
+
+Este módulo no debe importar tkinter ni PIL (ni nada de src.gui o de
+src.utils.ui_utils), de modo que el arranque sea inmediato.
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import sys
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+from ..core.account_index import AccountIndex
+from ..core.config_service import ConfigurationService, FileCopyService
+from ..core.steam_service import AccountFilterService, ValidationService
+from ..core.steam_session import SteamSession
+from ..models.domain_models import AppConfig, CopyOperation, SteamAccount
+from ..utils.copy_filter import CopyFilter
+from config.settings import (
+    APP_NAME, APP_VERSION, ACCOUNT_INDEX_FILE, BACKUP_FORMAT, COPY_MAX_WORKERS, COPY_PROFILES
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CliError(Exception):
+    """Error de uso o de ejecución que se informa como JSON."""
+
+
+# Subcomando -> método de CliApp que lo implementa
+COMMANDS = {
+    "scan": "scan",
+    "copy": "copy",
+    "backup": "backup",
+    "restore": "restore",
+    "ignore": "ignore",
+    "unignore": "unignore",
+    "list-ignored": "list_ignored",
+}
+
+
+class CliApp:
+    """
+    Ejecuta los subcomandos de la CLI sobre los servicios del núcleo.
+    """
+
+    def __init__(self, config_file: Optional[Path] = None, steam_path: str = ""):
+        """
+        Inicializa los servicios.
+
+        Args:
+            config_file: Archivo de configuración (por defecto el de la aplicación)
+            steam_path: Ruta de Steam que sustituye a la configurada (opcional)
+        """
+        self.config_service = ConfigurationService(config_file)
+        self.steam_path = steam_path
+        # Índice de cuentas junto a la configuración, compartido con la interfaz
+        index_file = config_file.parent / ACCOUNT_INDEX_FILE if config_file else None
+        self.session = SteamSession(self._session_config(), account_index=AccountIndex(index_file))
+
+    @property
+    def config(self) -> AppConfig:
+        """Configuración persistente de la aplicación."""
+        return self.config_service.config
+
+    def _session_config(self) -> AppConfig:
+        """
+        Configuración para la sesión de Steam.
+
+        La ruta de --steam-path se aplica sobre una copia, de modo que no
+        se guarda en el archivo al modificar otras opciones.
+        """
+        if self.steam_path:
+            return replace(self.config, custom_steam_path=self.steam_path)
+        return self.config
+
+    def scan(self, fast: bool = False, include_ignored: bool = False) -> Dict[str, Any]:
+        """
+        Detecta las cuentas con Dota 2.
+
+        Args:
+            fast: Sólo lista las carpetas, sin resolver nombres ni avatares
+            include_ignored: Incluye las cuentas ignoradas
+
+        Returns:
+            Resultado con las cuentas detectadas
+        """
+        accounts = self._discover(fast)
+        if not include_ignored:
+            accounts = AccountFilterService.filter_available_accounts(
+                accounts, self.config.cuentas_ignoradas
+            )
+
+        return {
+            "steam_roots": [str(root) for root in self.session.steam_roots],
+            "accounts": [self._account_to_dict(account) for account in accounts],
+        }
+
+    def copy(self, origen_id: str, destino_id: str, backup: bool = True,
+             sync: bool = True, compare_content: bool = False,
+             workers: int = COPY_MAX_WORKERS, profile: str = "") -> Dict[str, Any]:
+        """
+        Copia la configuración de Dota 2 entre dos cuentas.
+
+        Args:
+            origen_id: SteamID de la cuenta origen
+            destino_id: SteamID de la cuenta destino
+            backup: Respalda antes la configuración destino
+            sync: Escribe sólo los archivos que cambiaron
+            compare_content: Compara también el contenido de los archivos
+            workers: Hilos para copiar archivos en paralelo
+            profile: Perfil de copia (por defecto el de la configuración)
+
+        Returns:
+            Resultado de la copia
+        """
+        accounts = self._list_accounts()
+        origen = self._find_account(accounts, origen_id)
+        destino = self._find_account(accounts, destino_id)
+
+        is_valid, error_msg = ValidationService.validate_copy_operation(origen, destino)
+        if not is_valid:
+            raise CliError(error_msg)
+
+        file_service = FileCopyService(enable_backup=backup, sync_mode=sync,
+                                       compare_content=compare_content,
+                                       max_workers=max(1, workers),
+                                       copy_filter=self._copy_filter(profile))
+        try:
+            success, message = file_service.copy_configuration(
+                CopyOperation(origen, destino, backup_enabled=backup)
+            )
+        finally:
+            # El árbol anterior se elimina en un hilo daemon: que acabe antes de salir
+            file_service.wait_for_cleanup()
+        if not success:
+            raise CliError(message)
+
+        result = {"origen": origen.steamid, "destino": destino.steamid, "message": message,
+                  "profile": file_service.copy_filter.name}
+        if file_service.last_sync_stats is not None:
+            result["sync"] = asdict(file_service.last_sync_stats)
+        result["strategies"] = file_service.copy_strategy_stats
+        return result
+
+    def backup(self, steamid: str, backup_format: str = "", profile: str = "") -> Dict[str, Any]:
+        """
+        Crea un backup de la configuración de una cuenta.
+
+        Args:
+            steamid: SteamID de la cuenta
+            backup_format: "store", "zip" o "tree" (por defecto BACKUP_FORMAT)
+            profile: Perfil de copia (por defecto el de la configuración)
+
+        Returns:
+            Resultado con el nombre y la ruta del backup
+        """
+        account = self._find_account(self._list_accounts(), steamid)
+        file_service = FileCopyService(backup_format=backup_format or BACKUP_FORMAT,
+                                       copy_filter=self._copy_filter(profile))
+        backup = file_service.backup_account(account)
+        if backup is None:
+            raise CliError(f"No se pudo crear el backup de la cuenta {steamid}")
+        return {"steamid": steamid, "backup": str(backup.path), "info": backup.to_dict()}
+
+    def restore(self, steamid: str, backup_name: str = "",
+                files: Optional[List[str]] = None, profile: str = "") -> Dict[str, Any]:
+        """
+        Restaura un backup sobre la configuración de una cuenta.
+
+        Args:
+            steamid: SteamID de la cuenta
+            backup_name: Nombre o ruta del backup (por defecto el más reciente)
+            files: Rutas relativas de los únicos archivos a restaurar (opcional)
+            profile: Perfil de copia (por defecto el de la configuración)
+
+        Returns:
+            Resultado de la restauración
+        """
+        account = self._find_account(self._list_accounts(), steamid)
+        file_service = FileCopyService(copy_filter=self._copy_filter(profile))
+
+        if backup_name:
+            try:
+                backup = file_service.find_backup(backup_name)
+            except ValueError as e:
+                raise CliError(f"{e}. Indique la ruta del backup")
+            if backup is None:
+                raise CliError(f"No existe el backup {backup_name}")
+        else:
+            backups = file_service.list_backups(steamid)
+            if not backups:
+                raise CliError(f"No hay backups de la cuenta {steamid}")
+            backup = backups[0]
+
+        try:
+            success, message = file_service.restore_backup(backup, account, files)
+        finally:
+            file_service.wait_for_cleanup()
+        if not success:
+            raise CliError(message)
+        return {"steamid": steamid, "backup": str(backup.path), "info": backup.to_dict(),
+                "message": message}
+
+    def _copy_filter(self, profile: str = "") -> CopyFilter:
+        """
+        Filtro de un perfil de copia.
+
+        Args:
+            profile: Nombre del perfil (por defecto el de la configuración)
+
+        Returns:
+            Filtro del perfil
+        """
+        try:
+            return CopyFilter.from_profile(profile or self.config.copy_profile)
+        except ValueError as e:
+            raise CliError(str(e))
+
+    def ignore(self, steamid: str) -> Dict[str, Any]:
+        """
+        Marca una cuenta como ignorada.
+
+        Args:
+            steamid: SteamID de la cuenta
+
+        Returns:
+            Resultado con los SteamIDs ignorados
+        """
+        if not self.config_service.ignore_account(steamid):
+            raise CliError("No se pudo guardar la configuración")
+        return self.list_ignored()
+
+    def unignore(self, steamid: str) -> Dict[str, Any]:
+        """
+        Quita una cuenta de la lista de ignoradas.
+
+        Args:
+            steamid: SteamID de la cuenta
+
+        Returns:
+            Resultado con los SteamIDs ignorados
+        """
+        if not self.config_service.restore_account(steamid):
+            raise CliError("No se pudo guardar la configuración")
+        return self.list_ignored()
+
+    def list_ignored(self) -> Dict[str, Any]:
+        """
+        Lista las cuentas ignoradas de la configuración.
+
+        Returns:
+            Resultado con los SteamIDs ignorados
+        """
+        return {"ignored": self.config_service.get_ignored_accounts()}
+
+    def execute(self, command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Ejecuta un subcomando por su nombre.
+
+        Lo usan tanto la línea de comandos como el servicio en segundo plano.
+
+        Args:
+            command: Nombre del subcomando (ver COMMANDS)
+            params: Argumentos del subcomando
+
+        Returns:
+            Resultado del subcomando
+        """
+        method_name = COMMANDS.get(command)
+        if method_name is None:
+            raise CliError(f"Comando desconocido: {command}")
+        method = getattr(self, method_name)
+        # Sólo un fallo al asociar los argumentos es culpa de quien llama; un
+        # TypeError dentro del comando es un error del programa y se propaga
+        try:
+            bound = inspect.signature(method).bind(**(params or {}))
+        except TypeError as e:
+            raise CliError(f"Argumentos inválidos para {command}: {e}")
+        return method(*bound.args, **bound.kwargs)
+
+    def _require_steam(self) -> None:
+        """Falla si no hay ninguna instalación de Steam utilizable."""
+        if self.session.steam_root is None:
+            raise CliError("No se encontró ninguna instalación de Steam")
+
+    def _discover(self, fast: bool) -> List[SteamAccount]:
+        """
+        Detecta las cuentas con Dota 2 en todas las instalaciones.
+
+        Args:
+            fast: Sólo lista las carpetas, sin nombres ni avatares
+
+        Returns:
+            Cuentas detectadas
+        """
+        self._require_steam()
+        service = self.session.discovery_service
+        if fast:
+            return service.list_accounts_with_dota2()
+        return service.find_accounts_with_dota2()
+
+    def _list_accounts(self) -> List[SteamAccount]:
+        """Lista las cuentas sin resolver nombres (suficiente para copiar)."""
+        return self._discover(fast=True)
+
+    @staticmethod
+    def _find_account(accounts: List[SteamAccount], steamid: str) -> SteamAccount:
+        """Busca una cuenta o falla con un mensaje claro."""
+        account = AccountFilterService.find_account_by_id(accounts, steamid)
+        if account is None:
+            raise CliError(f"No se encontró la cuenta {steamid} con Dota 2")
+        return account
+
+    @staticmethod
+    def _account_to_dict(account: SteamAccount) -> Dict[str, Any]:
+        """Representación JSON de una cuenta."""
+        return {
+            "steamid": account.steamid,
+            "steamid64": account.steamid64,
+            "nombre": account.nombre,
+            "ruta": str(account.ruta),
+            "avatar": str(account.avatar) if account.avatar else None,
+            "steam_root": str(account.steam_root) if account.steam_root else None,
+        }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Construye el parser de argumentos de la CLI.
+
+    Returns:
+        Parser con todos los subcomandos
+    """
+    parser = argparse.ArgumentParser(
+        prog="dotatwin",
+        description=f"{APP_NAME} {APP_VERSION} - modo sin interfaz gráfica"
+    )
+    parser.add_argument("--config", type=Path, help="Archivo de configuración a usar")
+    parser.add_argument("--steam-path", default="", help="Ruta de la instalación de Steam")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Envía el comando al servicio en segundo plano si está activo "
+                             "(se ignora con --steam-path)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Muestra el log por stderr")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan = subparsers.add_parser("scan", help="Detecta las cuentas con Dota 2")
+    scan.add_argument("--fast", action="store_true",
+                      help="Sólo lista las carpetas, sin nombres ni avatares")
+    scan.add_argument("--include-ignored", action="store_true",
+                      help="Incluye las cuentas ignoradas")
+
+    copy = subparsers.add_parser("copy", help="Copia la configuración entre cuentas")
+    copy.add_argument("origen", help="SteamID de la cuenta origen")
+    copy.add_argument("destino", help="SteamID de la cuenta destino")
+    copy.add_argument("--no-backup", action="store_true",
+                      help="No respalda la configuración destino")
+    copy.add_argument("--full", action="store_true",
+                      help="Borra el destino y lo copia entero en lugar de sincronizarlo")
+    copy.add_argument("--verify-content", action="store_true",
+                      help="Compara el contenido de los archivos, no sólo tamaño y fecha")
+    copy.add_argument("--workers", type=int, default=COPY_MAX_WORKERS,
+                      help=f"Hilos para copiar archivos (por defecto {COPY_MAX_WORKERS})")
+    _add_profile_argument(copy)
+
+    backup = subparsers.add_parser("backup", help="Respalda la configuración de una cuenta")
+    backup.add_argument("steamid", help="SteamID de la cuenta")
+    backup.add_argument("--format", choices=("store", "zip", "tree"), default="",
+                        help=f"Formato del backup (por defecto {BACKUP_FORMAT})")
+    _add_profile_argument(backup)
+
+    restore = subparsers.add_parser("restore", help="Restaura un backup")
+    restore.add_argument("steamid", help="SteamID de la cuenta")
+    restore.add_argument("--backup", default="",
+                         help="Nombre o ruta del backup (por defecto el más reciente)")
+    restore.add_argument("--file", action="append", default=[], dest="files",
+                         help="Restaura sólo este archivo (ruta relativa a 570, repetible)")
+    _add_profile_argument(restore)
+
+    ignore = subparsers.add_parser("ignore", help="Ignora una cuenta")
+    ignore.add_argument("steamid", help="SteamID de la cuenta")
+
+    unignore = subparsers.add_parser("unignore", help="Deja de ignorar una cuenta")
+    unignore.add_argument("steamid", help="SteamID de la cuenta")
+
+    subparsers.add_parser("list-ignored", help="Lista las cuentas ignoradas")
+
+    daemon = subparsers.add_parser("daemon", help="Inicia el servicio en segundo plano")
+    daemon.add_argument("--address", default="", help="Socket o tubería en la que escuchar")
+
+    return parser
+
+
+def _add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    """Añade la opción --profile a un subcomando."""
+    parser.add_argument("--profile", choices=sorted(COPY_PROFILES), default="",
+                        help="Perfil de copia: qué archivos y carpetas se incluyen "
+                             "(por defecto el de la configuración)")
+
+
+def command_params(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Extrae los argumentos de un subcomando con los nombres de CliApp.
+
+    Args:
+        args: Argumentos ya analizados
+
+    Returns:
+        Parámetros para CliApp.execute
+    """
+    if args.command == "scan":
+        return {"fast": args.fast, "include_ignored": args.include_ignored}
+    if args.command == "copy":
+        return {"origen_id": args.origen, "destino_id": args.destino,
+                "backup": not args.no_backup, "sync": not args.full,
+                "compare_content": args.verify_content, "workers": args.workers,
+                "profile": args.profile}
+    if args.command == "restore":
+        return {"steamid": args.steamid, "backup_name": args.backup, "files": args.files,
+                "profile": args.profile}
+    if args.command == "backup":
+        return {"steamid": args.steamid, "backup_format": args.format,
+                "profile": args.profile}
+    if args.command in ("ignore", "unignore"):
+        return {"steamid": args.steamid}
+    return {}
+
+
+def run(argv: Optional[List[str]] = None, out: TextIO = sys.stdout) -> int:
+    """
+    Ejecuta la CLI.
+
+    Args:
+        argv: Argumentos (por defecto los de la línea de comandos)
+        out: Flujo donde escribir el JSON de resultado
+
+    Returns:
+        Código de salida (0 si el comando tuvo éxito)
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        stream=sys.stderr,
+                        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if args.command == "daemon":
+        from .daemon import serve
+        serve(args.config, args.steam_path, args.address or None)
+        return 0
+
+    params = command_params(args)
+    payload = None
+    if args.daemon and args.steam_path:
+        # El servicio atiende una sola instalación: la indicada se usa localmente
+        logger.info("--steam-path indicado: el comando se ejecuta localmente")
+    elif args.daemon:
+        from .daemon import DaemonClient, DaemonUnavailable
+        try:
+            payload = DaemonClient(config_file=args.config).request(args.command, params)
+        except DaemonUnavailable as e:
+            logger.warning(f"Servicio en segundo plano no disponible, se ejecuta localmente: {e}")
+
+    if payload is None:
+        payload = execute_request(lambda: CliApp(args.config, args.steam_path),
+                                  args.command, params)
+
+    json.dump(payload, out, indent=2, ensure_ascii=False)
+    out.write("\n")
+    return 0 if payload["ok"] else 1
+
+
+def execute_request(app_factory, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ejecuta un subcomando y lo convierte en la respuesta JSON.
+
+    Args:
+        app_factory: Función que devuelve la CliApp a usar
+        command: Nombre del subcomando
+        params: Argumentos del subcomando
+
+    Returns:
+        Respuesta con "ok" y el resultado o el error
+    """
+    try:
+        return {"ok": True, **app_factory().execute(command, params)}
+    except CliError as e:
+        return {"ok": False, "error": str(e)}
+    except Exception as e:
+        logger.error(f"Error inesperado en la CLI: {e}", exc_info=True)
+        return {"ok": False, "error": f"Error inesperado: {e}"}
+
+
+def main() -> None:
+    """Punto de entrada de la CLI."""
+    sys.exit(run())
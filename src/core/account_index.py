@@ -0,0 +1,279 @@
+"""
+Índice persistente de cuentas de Steam.
+
+Este módulo guarda en disco la información ya resuelta de cada cuenta
+(nombre, ruta de Dota 2 y avatar) junto con la huella de los archivos de
+los que se obtuvo, para que la detección sólo vuelva a procesar las
+carpetas que realmente cambiaron.
+
+Los nombres de loginusers.vdf, compartido por todas las cuentas de una
+instalación, no forman parte de la huella de cada carpeta: el índice guarda
+una sola huella de loginusers.vdf por instalación y, cuando cambia, sólo
+vuelve a resolver los nombres.
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..models.domain_models import SteamAccount
+from config.settings import ACCOUNT_INDEX_FILE
+
+logger = logging.getLogger(__name__)
+
+# Versión del formato del índice; un cambio invalida los índices existentes
+INDEX_VERSION = 2
+
+# Huella de un archivo: (mtime_ns, tamaño) o None si no existe
+FileStamp = Optional[Tuple[int, int]]
+
+
+def stat_stamp(path: Path) -> FileStamp:
+    """
+    Obtiene la huella (mtime, tamaño) de un archivo o carpeta.
+
+    Args:
+        path: Ruta a inspeccionar
+
+    Returns:
+        Tupla (mtime_ns, tamaño) o None si la ruta no existe
+    """
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def compute_fingerprint(user_path: Path, avatar_path: Optional[Path]) -> Dict[str, FileStamp]:
+    """
+    Calcula la huella de una carpeta de usuario de Steam.
+
+    El mtime de la carpeta de usuario cambia cuando se crea o elimina la
+    carpeta de Dota 2, por lo que cubre también la detección de la app.
+
+    Args:
+        user_path: Carpeta del usuario en userdata
+        avatar_path: Ruta esperada del avatar en el caché
+
+    Returns:
+        Diccionario con las huellas de carpeta, localconfig.vdf y avatar
+    """
+    return {
+        "folder": stat_stamp(user_path),
+        "localconfig": stat_stamp(user_path / "config" / "localconfig.vdf"),
+        "avatar": stat_stamp(avatar_path) if avatar_path else None,
+    }
+
+
+def _normalize_fingerprint(fingerprint: Dict[str, FileStamp]) -> Dict[str, Optional[List[int]]]:
+    """Convierte las tuplas a listas para compararlas con los datos del JSON."""
+    return {key: list(value) if value is not None else None
+            for key, value in fingerprint.items()}
+
+
+class AccountIndex:
+    """
+    Índice en disco de cuentas detectadas, indexado por huellas de archivos.
+
+    Las entradas se agrupan por carpeta userdata para que cambiar la ruta de
+    Steam no mezcle cuentas de instalaciones distintas. Es seguro usarlo
+    desde los hilos de detección.
+    """
+
+    def __init__(self, index_file: Optional[Path] = None):
+        """
+        Inicializa el índice.
+
+        Args:
+            index_file: Ruta del archivo del índice (opcional)
+        """
+        self.index_file = index_file or Path(ACCOUNT_INDEX_FILE)
+        self._roots: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Huella de loginusers.vdf con la que se resolvieron los nombres, por raíz
+        self._login_stamps: Dict[str, Optional[List[int]]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+
+    def load(self) -> None:
+        """Carga el índice desde disco (sólo la primera vez)."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+
+            if not self.index_file.exists():
+                return
+
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
+                if data.get("version") == INDEX_VERSION:
+                    self._roots = data.get("roots", {})
+                    self._login_stamps = data.get("loginusers", {})
+                else:
+                    logger.info("Índice de cuentas con formato antiguo, se reconstruirá")
+
+            except (OSError, json.JSONDecodeError, AttributeError) as e:
+                logger.warning(f"Índice de cuentas dañado, se reconstruirá: {e}")
+                self._roots = {}
+                self._login_stamps = {}
+
+    def save(self) -> bool:
+        """
+        Guarda el índice en disco si hubo cambios.
+
+        La escritura se hace en un archivo temporal que luego reemplaza al
+        original, para no dejar un índice a medio escribir.
+
+        Returns:
+            True si el índice quedó persistido
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+
+            payload = {"version": INDEX_VERSION, "roots": self._roots,
+                       "loginusers": self._login_stamps}
+            temp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+
+            try:
+                self.index_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, ensure_ascii=False)
+                os.replace(temp_file, self.index_file)
+                self._dirty = False
+                logger.debug(f"Índice de cuentas guardado en {self.index_file}")
+                return True
+
+            except OSError as e:
+                logger.warning(f"No se pudo guardar el índice de cuentas: {e}")
+                return False
+
+    def lookup(self, root: str, steamid: str,
+               fingerprint: Dict[str, FileStamp]) -> Tuple[bool, Optional[SteamAccount]]:
+        """
+        Busca una entrada vigente del índice.
+
+        Args:
+            root: Carpeta userdata a la que pertenece la cuenta
+            steamid: Nombre de la carpeta de usuario
+            fingerprint: Huella actual de la carpeta
+
+        Returns:
+            Tupla (encontrada, cuenta). La cuenta es None si la carpeta
+            no contiene Dota 2.
+        """
+        self.load()
+
+        with self._lock:
+            entry = self._roots.get(root, {}).get(steamid)
+
+        if not entry or entry.get("fingerprint") != _normalize_fingerprint(fingerprint):
+            return False, None
+
+        account_data = entry.get("account")
+        if account_data is None:
+            return True, None
+
+        avatar = account_data.get("avatar")
+        return True, SteamAccount(
+            steamid=steamid,
+            nombre=account_data["nombre"],
+            ruta=Path(account_data["ruta"]),
+            avatar=Path(avatar) if avatar else None
+        )
+
+    def store(self, root: str, steamid: str, fingerprint: Dict[str, FileStamp],
+              account: Optional[SteamAccount], name_from_login_users: bool = False) -> None:
+        """
+        Guarda (en memoria) el resultado de procesar una carpeta.
+
+        Args:
+            root: Carpeta userdata a la que pertenece la cuenta
+            steamid: Nombre de la carpeta de usuario
+            fingerprint: Huella con la que se procesó la carpeta
+            account: Cuenta resultante o None si no tiene Dota 2
+            name_from_login_users: El nombre salió de loginusers.vdf
+        """
+        account_data = None
+        if account is not None:
+            account_data = {
+                "nombre": account.nombre,
+                "ruta": str(account.ruta),
+                "avatar": str(account.avatar) if account.avatar else None,
+                "from_loginusers": name_from_login_users,
+            }
+
+        entry = {
+            "fingerprint": _normalize_fingerprint(fingerprint),
+            "account": account_data,
+        }
+
+        self.load()
+        with self._lock:
+            self._roots.setdefault(root, {})[steamid] = entry
+            self._dirty = True
+
+    def sync_login_names(self, root: str, stamp: FileStamp, names: Dict[str, str]) -> None:
+        """
+        Actualiza los nombres indexados si cambió loginusers.vdf.
+
+        Las cuentas que aparecen en loginusers.vdf toman su nombre de ahí;
+        las que tenían ese origen y ya no aparecen se invalidan para volver
+        a leer su localconfig.vdf. El resto del índice sigue vigente.
+
+        Args:
+            root: Carpeta userdata
+            stamp: Huella actual de loginusers.vdf
+            names: Nombres de loginusers.vdf (Steam3 ID -> PersonaName)
+        """
+        normalized = list(stamp) if stamp is not None else None
+
+        self.load()
+        with self._lock:
+            if root in self._login_stamps and self._login_stamps[root] == normalized:
+                return
+            for steamid, entry in self._roots.get(root, {}).items():
+                account_data = entry.get("account")
+                if account_data is None:
+                    continue
+                nombre = names.get(steamid)
+                if nombre:
+                    account_data["nombre"] = nombre
+                    account_data["from_loginusers"] = True
+                elif account_data.get("from_loginusers"):
+                    entry["fingerprint"] = None
+            self._login_stamps[root] = normalized
+            self._dirty = True
+
+    def prune(self, root: str, present_ids: Iterable[str]) -> None:
+        """
+        Elimina las entradas de carpetas que ya no existen.
+
+        Args:
+            root: Carpeta userdata
+            present_ids: Carpetas presentes en el último escaneo
+        """
+        present = set(present_ids)
+
+        self.load()
+        with self._lock:
+            entries = self._roots.get(root, {})
+            stale = [steamid for steamid in entries if steamid not in present]
+            for steamid in stale:
+                del entries[steamid]
+            if stale:
+                self._dirty = True
+
+    def clear(self) -> None:
+        """Vacía el índice (se reconstruye en la próxima detección)."""
+        with self._lock:
+            self._roots = {}
+            self._login_stamps = {}
+            self._loaded = True
+            self._dirty = True
@@ -0,0 +1,465 @@
+"""
+Vigilancia de cambios en las carpetas de Steam.
+
+Este módulo detecta altas, bajas y cambios de cuentas observando las
+carpetas userdata y avatarcache, para mantener la lista de cuentas al día
+sin repetir la detección completa. En Linux usa inotify y en el resto de
+plataformas compara instantáneas periódicas de stat().
+"""
+
+import os
+import sys
+import queue
+import select
+import struct
+import bisect
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+from ..models.domain_models import SteamAccount
+from .account_index import compute_fingerprint
+from config.settings import ACCOUNT_WATCH_INTERVAL, ACCOUNT_WATCH_DEBOUNCE, STEAMID64_BASE
+
+logger = logging.getLogger(__name__)
+
+# Marcador devuelto por un backend cuando hay que revisar todas las carpetas
+RESCAN_ALL = "*"
+
+
+@dataclass
+class AccountChangeEvent:
+    """
+    Cambio detectado en una cuenta de Steam.
+
+    kind es "added", "removed" o "changed". Para "removed" la cuenta es
+    la última versión conocida.
+    """
+    kind: str
+    steamid: str
+    account: Optional[SteamAccount] = None
+
+
+class PollingBackend:
+    """
+    Backend portable que compara instantáneas de stat() de cada carpeta.
+
+    Usa la misma huella que el índice de cuentas (carpeta, localconfig.vdf
+    y avatar), por lo que cada ciclo cuesta un scandir más tres stat por cuenta.
+    """
+
+    def __init__(self, userdata_dir: Path, avatar_dir: Path,
+                 interval: float = ACCOUNT_WATCH_INTERVAL):
+        self.userdata_dir = Path(userdata_dir)
+        self.avatar_dir = Path(avatar_dir)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> Dict[str, dict]:
+        """Obtiene la huella actual de todas las carpetas de usuario."""
+        snapshot = {}
+        try:
+            with os.scandir(self.userdata_dir) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    avatar = None
+                    if entry.name.isdigit():
+                        avatar = self.avatar_dir / f"{int(entry.name) + STEAMID64_BASE}.png"
+                    snapshot[entry.name] = compute_fingerprint(Path(entry.path), avatar)
+        except OSError as e:
+            logger.debug(f"No se pudo listar {self.userdata_dir}: {e}")
+        return snapshot
+
+    def poll(self, stop_event: threading.Event) -> Set[str]:
+        """
+        Espera un intervalo y devuelve las carpetas que cambiaron.
+
+        Args:
+            stop_event: Evento que interrumpe la espera
+
+        Returns:
+            Conjunto de Steam IDs modificados
+        """
+        if stop_event.wait(self.interval):
+            return set()
+
+        current = self._take_snapshot()
+        previous = self._snapshot
+        self._snapshot = current
+
+        return {steamid for steamid in current.keys() | previous.keys()
+                if current.get(steamid) != previous.get(steamid)}
+
+    def close(self) -> None:
+        """No mantiene recursos abiertos."""
+
+
+class InotifyBackend:
+    """
+    Backend para Linux basado en inotify (vía ctypes).
+
+    Vigila userdata, cada carpeta de usuario (para la carpeta de Dota 2),
+    su subcarpeta config (para localconfig.vdf) y el caché de avatares.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+
+    _DIR_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+    _FILE_MASK = _DIR_MASK | IN_CLOSE_WRITE | IN_MODIFY
+    _ROOT_MASK = _DIR_MASK | IN_DELETE_SELF | IN_MOVE_SELF
+
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, userdata_dir: Path, avatar_dir: Path,
+                 debounce: float = ACCOUNT_WATCH_DEBOUNCE):
+        import ctypes
+        import ctypes.util
+
+        self.userdata_dir = Path(userdata_dir)
+        self.avatar_dir = Path(avatar_dir)
+        self.debounce = debounce
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+
+        # wd -> (tipo, steamid)
+        self._watches: Dict[int, tuple] = {}
+
+        try:
+            self._add_watch(self.userdata_dir, self._ROOT_MASK, ("userdata", None))
+            self._add_watch(self.avatar_dir, self._FILE_MASK, ("avatars", None))
+            with os.scandir(self.userdata_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        self._watch_user_folder(entry.name)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, path: Path, mask: int, target: tuple) -> None:
+        """Registra un watch de inotify sobre una carpeta."""
+        import ctypes
+
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch falló para {path}")
+        self._watches[wd] = target
+
+    def _watch_user_folder(self, steamid: str) -> None:
+        """Vigila una carpeta de usuario y, si existe, su carpeta config."""
+        user_path = self.userdata_dir / steamid
+        try:
+            self._add_watch(user_path, self._DIR_MASK, ("user", steamid))
+        except OSError as e:
+            logger.debug(f"No se pudo vigilar {user_path}: {e}")
+            return
+        self._watch_config_folder(steamid)
+
+    def _watch_config_folder(self, steamid: str) -> None:
+        """Vigila la carpeta config de un usuario si existe."""
+        config_path = self.userdata_dir / steamid / "config"
+        if config_path.is_dir():
+            try:
+                self._add_watch(config_path, self._FILE_MASK, ("config", steamid))
+            except OSError as e:
+                logger.debug(f"No se pudo vigilar {config_path}: {e}")
+
+    def poll(self, stop_event: threading.Event) -> Set[str]:
+        """
+        Espera eventos de inotify y devuelve las carpetas afectadas.
+
+        Tras el primer evento sigue leyendo durante la ventana de debounce,
+        ya que Steam suele escribir varias veces el mismo archivo.
+
+        Args:
+            stop_event: Evento que interrumpe la espera
+
+        Returns:
+            Conjunto de Steam IDs afectados (o RESCAN_ALL)
+        """
+        dirty: Set[str] = set()
+
+        # Espera acotada para poder atender stop_event
+        if not self._read_events(dirty, timeout=1.0):
+            return dirty
+
+        while not stop_event.is_set() and self._read_events(dirty, timeout=self.debounce):
+            pass
+
+        return dirty
+
+    def _read_events(self, dirty: Set[str], timeout: float) -> bool:
+        """
+        Lee los eventos pendientes del descriptor de inotify.
+
+        Returns:
+            True si se leyó algún evento
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        offset = 0
+        while offset + self._EVENT_HEADER.size <= len(buffer):
+            wd, mask, _cookie, length = self._EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self._EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            self._handle_event(wd, mask, name, dirty)
+
+        return True
+
+    def _handle_event(self, wd: int, mask: int, name: str, dirty: Set[str]) -> None:
+        """Traduce un evento de inotify a las cuentas afectadas."""
+        if mask & self.IN_Q_OVERFLOW:
+            dirty.add(RESCAN_ALL)
+            return
+
+        if mask & self.IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+
+        kind, steamid = self._watches.get(wd, (None, None))
+
+        if kind == "userdata":
+            if mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                dirty.add(RESCAN_ALL)
+            elif name:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and mask & self.IN_ISDIR:
+                    self._watch_user_folder(name)
+                dirty.add(name)
+
+        elif kind == "user":
+            if name == "config" and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self._watch_config_folder(steamid)
+            if name in ("570", "config"):
+                dirty.add(steamid)
+
+        elif kind == "config":
+            if name == "localconfig.vdf":
+                dirty.add(steamid)
+
+        elif kind == "avatars":
+            stem, _, extension = name.partition(".")
+            if extension == "png" and stem.isdigit():
+                dirty.add(str(int(stem) - STEAMID64_BASE))
+
+    def close(self) -> None:
+        """Cierra el descriptor de inotify."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watch_backend(userdata_dir: Path, avatar_dir: Path):
+    """
+    Crea el backend de vigilancia más eficiente disponible.
+
+    Args:
+        userdata_dir: Carpeta userdata de Steam
+        avatar_dir: Carpeta avatarcache de Steam
+
+    Returns:
+        InotifyBackend en Linux, PollingBackend en otro caso o si inotify falla
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyBackend(userdata_dir, avatar_dir)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify no disponible, usando sondeo periódico: {e}")
+
+    return PollingBackend(userdata_dir, avatar_dir)
+
+
+class AccountWatcher:
+    """
+    Vigila las carpetas de Steam y emite eventos de cambio por cuenta.
+
+    Las carpetas afectadas se resuelven en un hilo propio (leyendo
+    localconfig.vdf si hace falta) y los eventos quedan en una cola que la
+    interfaz consume desde su propio hilo con drain_events().
+    """
+
+    def __init__(self, steam_service, on_event: Optional[Callable[[AccountChangeEvent], None]] = None,
+                 backend_factory: Callable = create_watch_backend):
+        """
+        Inicializa el vigilante.
+
+        Args:
+            steam_service: SteamAccountService usado para resolver carpetas
+            on_event: Callback opcional invocado desde el hilo del vigilante
+            backend_factory: Fábrica del backend (userdata, avatarcache)
+        """
+        self.steam_service = steam_service
+        self.on_event = on_event
+        self.backend_factory = backend_factory
+
+        self._known: Dict[str, SteamAccount] = {}
+        self._events: "queue.Queue[AccountChangeEvent]" = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._backend = None
+
+    @property
+    def is_running(self) -> bool:
+        """Indica si el hilo de vigilancia está activo."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, accounts: List[SteamAccount]) -> bool:
+        """
+        Comienza a vigilar partiendo de las cuentas ya conocidas.
+
+        Args:
+            accounts: Cuentas detectadas en el último escaneo completo
+
+        Returns:
+            True si la vigilancia quedó activa
+        """
+        self.stop()
+        # Sólo se siguen las cuentas de la instalación vigilada
+        root = self.steam_service.steam_root
+        self._known = {account.steamid: account for account in accounts
+                       if account.steam_root is None or account.steam_root == root}
+
+        try:
+            self._backend = self.backend_factory(self.steam_service.userdata_dir,
+                                                 Path(self.steam_service.avatar_cache_path))
+        except OSError as e:
+            logger.warning(f"No se pudo iniciar la vigilancia de cuentas: {e}")
+            return False
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="account-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Vigilancia de cuentas iniciada ({type(self._backend).__name__})")
+        return True
+
+    def stop(self) -> None:
+        """Detiene la vigilancia y libera el backend."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+    def drain_events(self) -> List[AccountChangeEvent]:
+        """
+        Obtiene (sin bloquear) los eventos pendientes.
+
+        Returns:
+            Eventos en el orden en que se detectaron
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _run(self) -> None:
+        """Bucle del hilo de vigilancia."""
+        while not self._stop_event.is_set():
+            try:
+                dirty = self._backend.poll(self._stop_event)
+                if dirty:
+                    self.process_changes(dirty)
+            except Exception as e:
+                logger.error(f"Error en la vigilancia de cuentas: {e}")
+                self._stop_event.wait(ACCOUNT_WATCH_INTERVAL)
+
+    def process_changes(self, dirty: Set[str]) -> List[AccountChangeEvent]:
+        """
+        Resuelve las carpetas modificadas y publica los eventos resultantes.
+
+        Args:
+            dirty: Steam IDs afectados (o RESCAN_ALL)
+
+        Returns:
+            Eventos generados
+        """
+        if RESCAN_ALL in dirty:
+            dirty = set(self._known)
+            try:
+                dirty.update(self.steam_service._list_user_folders())
+            except OSError as e:
+                logger.debug(f"No se pudo relistar userdata: {e}")
+
+        events = []
+        for steamid in sorted(dirty):
+            previous = self._known.get(steamid)
+            current = self.steam_service.resolve_folder(steamid)
+
+            if current is None and previous is None:
+                continue
+            if current is None:
+                del self._known[steamid]
+                events.append(AccountChangeEvent("removed", steamid, previous))
+            elif previous is None:
+                self._known[steamid] = current
+                events.append(AccountChangeEvent("added", steamid, current))
+            else:
+                # El avatar puede cambiar de contenido sin cambiar de ruta
+                self._known[steamid] = current
+                events.append(AccountChangeEvent("changed", steamid, current))
+
+        for event in events:
+            logger.info(f"Cuenta {event.kind}: {event.steamid}")
+            self._events.put(event)
+            if self.on_event:
+                self.on_event(event)
+
+        return events
+
+    @staticmethod
+    def apply_events(accounts: List[SteamAccount],
+                     events: List[AccountChangeEvent]) -> List[SteamAccount]:
+        """
+        Aplica eventos de cambio a una lista de cuentas.
+
+        Conserva el orden por carpeta (SteamID) que produce la detección
+        completa, tanto de una raíz como de varias.
+
+        Args:
+            accounts: Lista actual de cuentas
+            events: Eventos a aplicar
+
+        Returns:
+            Nueva lista de cuentas actualizada
+        """
+        updated = list(accounts)
+
+        for event in events:
+            ids = [account.steamid for account in updated]
+            position = ids.index(event.steamid) if event.steamid in ids else None
+
+            if event.kind == "removed":
+                if position is not None:
+                    del updated[position]
+            elif position is not None:
+                updated[position] = event.account
+            else:
+                updated.insert(bisect.bisect_left(ids, event.steamid), event.account)
+
+        return updated
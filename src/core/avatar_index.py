@@ -0,0 +1,159 @@
+"""
+Índice en memoria del caché de avatares de Steam.
+
+Este módulo recorre la carpeta avatarcache con una sola pasada de scandir
+y guarda, por SteamID64, la ruta, el tamaño y la fecha de modificación de
+cada avatar. La detección de cuentas, SteamAccount.has_avatar y el gestor
+de avatares de la interfaz consultan este índice en lugar de llamar a
+exists() sobre cada archivo.
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+AVATAR_EXTENSION = ".png"
+
+
+@dataclass(frozen=True)
+class AvatarEntry:
+    """
+    Avatar presente en el caché de Steam.
+
+    Attributes:
+        path: Ruta del archivo
+        size: Tamaño en bytes
+        mtime_ns: Fecha de modificación en nanosegundos
+    """
+    path: Path
+    size: int
+    mtime_ns: int
+
+    @property
+    def stamp(self) -> Tuple[int, int]:
+        """Huella (mtime_ns, tamaño), con el mismo formato que el índice de cuentas."""
+        return self.mtime_ns, self.size
+
+
+class AvatarIndex:
+    """
+    Índice del caché de avatares construido con un único scandir.
+
+    El tamaño y la fecha de cada avatar se obtienen de la entrada de
+    scandir sólo cuando se consultan; en Windows ya vienen incluidos en el
+    listado, por lo que no cuestan llamadas adicionales al sistema.
+    """
+
+    def __init__(self, avatar_dir: Path):
+        """
+        Inicializa el índice (vacío hasta llamar a scan).
+
+        Args:
+            avatar_dir: Carpeta avatarcache de Steam
+        """
+        self.avatar_dir = Path(avatar_dir)
+        self._entries: Dict[str, Union[os.DirEntry, AvatarEntry]] = {}
+
+    def scan(self) -> "AvatarIndex":
+        """
+        Recorre la carpeta de avatares y reemplaza el contenido del índice.
+
+        Returns:
+            El propio índice, para encadenar llamadas
+        """
+        entries = {}
+        try:
+            with os.scandir(self.avatar_dir) as listing:
+                for entry in listing:
+                    stem, extension = os.path.splitext(entry.name)
+                    if extension.lower() == AVATAR_EXTENSION and stem.isdigit():
+                        entries[stem] = entry
+        except OSError as e:
+            logger.debug(f"No se pudo recorrer el caché de avatares: {e}")
+
+        self._entries = entries
+        return self
+
+    def get(self, steamid64: str) -> Optional[AvatarEntry]:
+        """
+        Obtiene el avatar de una cuenta.
+
+        Args:
+            steamid64: SteamID64 de la cuenta
+
+        Returns:
+            AvatarEntry o None si la cuenta no tiene avatar en caché
+        """
+        entry = self._entries.get(steamid64)
+        if entry is None or isinstance(entry, AvatarEntry):
+            return entry
+
+        try:
+            st = entry.stat()
+        except OSError:
+            self._entries.pop(steamid64, None)
+            return None
+
+        avatar = AvatarEntry(Path(entry.path), st.st_size, st.st_mtime_ns)
+        self._entries[steamid64] = avatar
+        return avatar
+
+    def refresh_entry(self, steamid64: str) -> Optional[AvatarEntry]:
+        """
+        Vuelve a comprobar en disco el avatar de una sola cuenta.
+
+        Se usa cuando el vigilante informa un cambio, para no recorrer de
+        nuevo toda la carpeta.
+
+        Args:
+            steamid64: SteamID64 de la cuenta
+
+        Returns:
+            AvatarEntry actualizado o None si el avatar ya no existe
+        """
+        path = self.avatar_dir / f"{steamid64}{AVATAR_EXTENSION}"
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._entries.pop(steamid64, None)
+            return None
+
+        avatar = AvatarEntry(path, st.st_size, st.st_mtime_ns)
+        self._entries[steamid64] = avatar
+        return avatar
+
+    def contains(self, path: Path) -> bool:
+        """
+        Indica si una ruta de avatar figura en el índice.
+
+        Args:
+            path: Ruta del avatar
+
+        Returns:
+            True si el archivo estaba presente en el último recorrido
+        """
+        path = Path(path)
+        return path.parent == self.avatar_dir and path.stem in self._entries
+
+    def stamp_for(self, path: Path) -> Optional[Tuple[int, int]]:
+        """
+        Obtiene la huella de un avatar a partir de su ruta.
+
+        Args:
+            path: Ruta del avatar
+
+        Returns:
+            Tupla (mtime_ns, tamaño) o None si no figura en el índice
+        """
+        path = Path(path)
+        if path.parent != self.avatar_dir:
+            return None
+        avatar = self.get(path.stem)
+        return avatar.stamp if avatar else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,219 @@
+"""
+Backups comprimidos en un único archivo zip.
+
+Los archivos de configuración (.vcfg, .cfg) son texto y se comprimen muy
+bien, así que un backup en zip ocupa y escribe varias veces menos que una
+copia completa de la carpeta. El zip se escribe en streaming mientras se
+recorre el origen, sin pasar por una copia intermedia, y su directorio
+central sirve de índice para restaurar un único archivo sin descomprimir
+el resto.
+
+Además de los archivos, cada zip lleva un índice JSON (INDEX_NAME) con la
+cuenta, la fecha y los metadatos exactos de cada archivo (mtime en
+nanosegundos y permisos), que el formato zip sólo guarda con resolución de
+dos segundos.
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from ..models.domain_models import BackupInfo
+from ..utils.copy_filter import CopyFilter
+from ..utils.fs_utils import TEMP_FILE_SUFFIX, check_relative_path
+from config.settings import COPY_BUFFER_SIZE
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".zip"
+INDEX_NAME = ".dotatwin-index.json"
+INDEX_VERSION = 1
+
+COMPRESSIONS = {
+    "deflate": zipfile.ZIP_DEFLATED,
+    "lzma": zipfile.ZIP_LZMA,
+    "none": zipfile.ZIP_STORED,
+}
+
+
+def write_archive(source: Path, archive_path: Path, steamid: str,
+                  compression: str = "deflate", level: Optional[int] = None,
+                  copy_filter: Optional[CopyFilter] = None) -> BackupInfo:
+    """
+    Comprime una carpeta en un zip de backup.
+
+    El zip se escribe en un temporal junto al destino y se renombra al
+    terminar, de modo que nunca queda un backup a medias con el nombre final.
+
+    Args:
+        source: Carpeta a respaldar
+        archive_path: Ruta del zip a crear
+        steamid: Cuenta a la que pertenece
+        compression: "deflate", "lzma" o "none"
+        level: Nivel de compresión (sólo deflate; None usa el de zlib)
+        copy_filter: Archivos y carpetas a respaldar (por defecto todos)
+
+    Returns:
+        Backup creado
+
+    Raises:
+        ValueError: Si la compresión no es válida
+        OSError: Si no se puede leer el origen (o alguna subcarpeta) o escribir el zip
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Compresión desconocida: {compression}")
+
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = archive_path.with_name(archive_path.name + TEMP_FILE_SUFFIX)
+    created = time.time()
+    index: Dict[str, Any] = {"version": INDEX_VERSION, "steamid": steamid,
+                             "created": created, "source": str(source),
+                             "dirs": [], "files": {}}
+    try:
+        # Las fechas fuera del rango de zip se ajustan: la exacta va en el índice
+        with zipfile.ZipFile(temp_path, "w", COMPRESSIONS[compression],
+                             compresslevel=level, strict_timestamps=False) as archive:
+            for root, dirs, files in os.walk(source, onerror=_raise):
+                if copy_filter is not None:
+                    # Podar en el sitio: os.walk no entra en lo que se quita de dirs
+                    dirs[:] = [name for name in dirs if copy_filter.includes_dir(name)]
+                    files = [name for name in files if copy_filter.includes_file(name)]
+                relative_root = Path(root).relative_to(source)
+                for name in dirs:
+                    index["dirs"].append((relative_root / name).as_posix())
+                for name in files:
+                    path = Path(root) / name
+                    relative = (relative_root / name).as_posix()
+                    st = path.stat()
+                    # ZipFile.write comprime por bloques, sin cargar el archivo
+                    archive.write(path, relative)
+                    index["files"][relative] = {"size": st.st_size,
+                                                "mtime_ns": st.st_mtime_ns,
+                                                "mode": st.st_mode & 0o7777}
+            archive.writestr(INDEX_NAME, json.dumps(index, ensure_ascii=False))
+        os.replace(temp_path, archive_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    logger.info(f"Backup comprimido {archive_path.name}: {len(index['files'])} archivos, "
+                f"{archive_path.stat().st_size} bytes")
+    return BackupInfo(name=archive_path.stem, steamid=steamid, path=archive_path,
+                      created=created, format="zip")
+
+
+def _raise(error: OSError) -> None:
+    """onerror de os.walk: una carpeta ilegible hace fallar el backup."""
+    raise error
+
+
+def read_index(archive_path: Path) -> Dict[str, Any]:
+    """
+    Lee el índice de un zip de backup.
+
+    Args:
+        archive_path: Ruta del zip
+
+    Returns:
+        Índice con cuenta, fecha, carpetas y metadatos de cada archivo
+
+    Raises:
+        OSError: Si el zip no existe o no es válido
+    """
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            index = json.loads(archive.read(INDEX_NAME).decode("utf-8"))
+    except (KeyError, ValueError, zipfile.BadZipFile) as e:
+        raise OSError(f"Backup comprimido inválido {archive_path}: {e}")
+    if index.get("version") != INDEX_VERSION:
+        raise OSError(f"Versión de backup comprimido no soportada: {archive_path}")
+    return index
+
+
+def archive_info(archive_path: Path) -> Optional[BackupInfo]:
+    """
+    Describe un zip de backup.
+
+    Args:
+        archive_path: Ruta del zip
+
+    Returns:
+        Backup o None si el zip no es un backup válido
+    """
+    try:
+        index = read_index(archive_path)
+    except OSError as e:
+        logger.debug(f"Se omite {archive_path}: {e}")
+        return None
+    return BackupInfo(name=archive_path.stem, steamid=index["steamid"], path=archive_path,
+                      created=index["created"], format="zip")
+
+
+def extract_archive(archive_path: Path, target: Path) -> None:
+    """
+    Descomprime un zip de backup en target (que no debe existir).
+
+    Args:
+        archive_path: Ruta del zip
+        target: Carpeta a crear
+
+    Raises:
+        OSError: Si el zip no es válido o no se puede escribir
+    """
+    index = read_index(archive_path)
+    target.mkdir(parents=True)
+    for relative in index["dirs"]:
+        (target / relative).mkdir(parents=True, exist_ok=True)
+
+    with zipfile.ZipFile(archive_path) as archive:
+        for relative, info in index["files"].items():
+            _extract_member(archive, relative, info, target / relative)
+
+
+def extract_files(archive_path: Path, files: Iterable[str], target: Path) -> None:
+    """
+    Restaura archivos sueltos de un zip de backup sobre una carpeta.
+
+    Sólo se descomprimen los archivos pedidos; cada uno se escribe en un
+    temporal y se renombra encima del existente.
+
+    Args:
+        archive_path: Ruta del zip
+        files: Rutas relativas (con "/") de los archivos a restaurar
+        target: Carpeta sobre la que restaurarlos
+
+    Raises:
+        FileNotFoundError: Si algún archivo no está en el backup
+        OSError: Si el zip no es válido, una ruta sale de target o no se puede escribir
+    """
+    index = read_index(archive_path)
+    with zipfile.ZipFile(archive_path) as archive:
+        for relative in files:
+            check_relative_path(relative)
+            info = index["files"].get(relative)
+            if info is None:
+                raise FileNotFoundError(f"{relative} no está en el backup {archive_path.name}")
+            destination = target / relative
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = destination.with_name(destination.name + TEMP_FILE_SUFFIX)
+            try:
+                _extract_member(archive, relative, info, temp_path)
+                os.replace(temp_path, destination)
+            finally:
+                if temp_path.exists():
+                    temp_path.unlink()
+
+
+def _extract_member(archive: zipfile.ZipFile, relative: str, info: Dict[str, Any],
+                    destination: Path) -> None:
+    """Descomprime un archivo y le aplica los metadatos del índice."""
+    check_relative_path(relative)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with archive.open(relative) as src, open(destination, "wb") as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+    os.chmod(destination, info["mode"])
+    os.utime(destination, ns=(info["mtime_ns"], info["mtime_ns"]))
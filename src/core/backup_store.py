@@ -0,0 +1,394 @@
+"""
+Almacén de backups deduplicado por contenido.
+
+Cada archivo respaldado se guarda una sola vez como blob con el nombre de
+su hash SHA-256; cada backup es un manifiesto JSON que asocia rutas
+relativas con hashes, tamaños, fechas y permisos. Un archivo que no cambió
+entre dos backups sólo ocupa una entrada más en el manifiesto, así que los
+backups frecuentes cuestan lo que cambió y no la carpeta entera.
+
+Estructura en disco:
+
+    store/
+        blobs/ab/abcdef...    contenido de cada archivo
+        manifests/backup_<steamid>_<fecha>.json
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from ..models.domain_models import BackupInfo
+from ..utils.copy_filter import CopyFilter
+from ..utils.fast_copy import FastCopier
+from ..utils.fs_utils import swap_in_tree, check_relative_path, TEMP_FILE_SUFFIX
+from config.settings import COPY_BUFFER_SIZE
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+class BackupStore:
+    """
+    Backups incrementales con blobs por contenido y manifiestos por backup.
+
+    Para no releer archivos sin cambios, create_backup reutiliza el hash del
+    manifiesto anterior de la misma cuenta cuando el tamaño y el mtime
+    coinciden.
+    """
+
+    def __init__(self, root: Path, copier: Optional[FastCopier] = None,
+                 name_taken: Optional[Callable[[str], bool]] = None):
+        """
+        Inicializa el almacén.
+
+        Args:
+            root: Carpeta del almacén (se crea al hacer el primer backup)
+            copier: Copiador de archivos al restaurar (permite clonar con reflink)
+            name_taken: Indica si un nombre ya lo usa un backup de otro formato
+        """
+        self.root = Path(root)
+        self.name_taken = name_taken
+        self.blobs_dir = self.root / "blobs"
+        self.manifests_dir = self.root / "manifests"
+        self.copier = copier or FastCopier()
+        self._lock = threading.RLock()
+
+    def create_backup(self, source: Path, steamid: str,
+                      copy_filter: Optional[CopyFilter] = None) -> BackupInfo:
+        """
+        Respalda una carpeta en el almacén.
+
+        Args:
+            source: Carpeta a respaldar
+            steamid: Cuenta a la que pertenece
+            copy_filter: Archivos y carpetas a respaldar (por defecto todos)
+
+        Returns:
+            Backup creado
+
+        Raises:
+            OSError: Si no se puede leer el origen o escribir en el almacén
+        """
+        # Exclusión con gc(): los blobs nuevos aún no están en ningún manifiesto
+        with self._lock:
+            return self._create_backup(source, steamid, copy_filter)
+
+    def _create_backup(self, source: Path, steamid: str,
+                       copy_filter: Optional[CopyFilter]) -> BackupInfo:
+        """Crea el backup con el almacén bloqueado."""
+        previous = self._latest_files(steamid)
+        files: Dict[str, Dict[str, Any]] = {}
+        dirs: List[str] = []
+        new_bytes = 0
+
+        for relative, entry in _walk(Path(source), copy_filter):
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(relative)
+                continue
+
+            st = entry.stat(follow_symlinks=False)
+            known = previous.get(relative)
+            if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns \
+                    and self.blob_path(known["hash"]).exists():
+                digest = known["hash"]
+            else:
+                digest, written = self._store_file(entry.path)
+                new_bytes += written
+
+            files[relative] = {"hash": digest, "size": st.st_size,
+                               "mtime_ns": st.st_mtime_ns, "mode": st.st_mode & 0o7777}
+
+        created = time.time()
+        name = self._unique_name(steamid, created)
+        manifest = {"version": MANIFEST_VERSION, "name": name, "steamid": steamid,
+                    "created": created, "source": str(source),
+                    "dirs": dirs, "files": files}
+        _write_json_atomic(self.manifests_dir / f"{name}.json", manifest)
+
+        logger.info(f"Backup {name} creado: {len(files)} archivos, {new_bytes} bytes nuevos")
+        return self._info(manifest, self.manifests_dir / f"{name}.json")
+
+    def list_backups(self, steamid: Optional[str] = None) -> List[BackupInfo]:
+        """
+        Lista los backups del almacén, del más reciente al más antiguo.
+
+        Args:
+            steamid: Sólo los backups de esta cuenta (opcional)
+
+        Returns:
+            Backups encontrados
+        """
+        prefix = f"backup_{steamid}_" if steamid else "backup_"
+        backups = []
+        try:
+            paths = [path for path in self.manifests_dir.iterdir()
+                     if path.suffix == ".json" and path.name.startswith(prefix)]
+        except OSError:
+            return []
+
+        for path in paths:
+            manifest = self._read_manifest(path)
+            if manifest is not None:
+                backups.append(self._info(manifest, path))
+        return sorted(backups, key=lambda backup: backup.created, reverse=True)
+
+    def materialize(self, name: str, target: Path) -> None:
+        """
+        Reconstruye en target (que no debe existir) el árbol de un backup.
+
+        Args:
+            name: Nombre del backup
+            target: Carpeta a crear
+
+        Raises:
+            FileNotFoundError: Si el backup o alguno de sus blobs no existe
+        """
+        manifest = self._read_manifest(self.manifests_dir / f"{name}.json")
+        if manifest is None:
+            raise FileNotFoundError(f"No existe el backup {name}")
+
+        target.mkdir(parents=True)
+        for relative in manifest["dirs"]:
+            (target / relative).mkdir(parents=True, exist_ok=True)
+
+        for relative, info in manifest["files"].items():
+            path = target / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_file(info, path)
+
+    def extract_files(self, name: str, files: Iterable[str], target: Path) -> None:
+        """
+        Restaura archivos sueltos de un backup sobre una carpeta.
+
+        Cada archivo se copia a un temporal y se renombra encima del existente.
+
+        Args:
+            name: Nombre del backup
+            files: Rutas relativas (con "/") de los archivos a restaurar
+            target: Carpeta sobre la que restaurarlos
+
+        Raises:
+            FileNotFoundError: Si el backup o alguno de los archivos no existe
+            OSError: Si alguna ruta sale de target
+        """
+        manifest = self._read_manifest(self.manifests_dir / f"{name}.json")
+        if manifest is None:
+            raise FileNotFoundError(f"No existe el backup {name}")
+
+        for relative in files:
+            check_relative_path(relative)
+            info = manifest["files"].get(relative)
+            if info is None:
+                raise FileNotFoundError(f"{relative} no está en el backup {name}")
+            path = target / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(path.name + TEMP_FILE_SUFFIX)
+            self._write_file(info, temp_path)
+            os.replace(temp_path, path)
+
+    def restore(self, name: str, target: Path) -> Optional[Path]:
+        """
+        Restaura un backup sobre target de forma atómica.
+
+        El árbol se reconstruye en una carpeta hermana y se intercambia con
+        target mediante renombrados (ver fs_utils.swap_in_tree).
+
+        Args:
+            name: Nombre del backup
+            target: Carpeta a reemplazar
+
+        Returns:
+            Árbol anterior apartado (o None si target no existía)
+        """
+        return swap_in_tree(target, lambda staging: self.materialize(name, staging))
+
+    def delete(self, name: str) -> bool:
+        """
+        Elimina el manifiesto de un backup (los blobs se liberan con gc).
+
+        Args:
+            name: Nombre del backup
+
+        Returns:
+            True si se eliminó
+        """
+        try:
+            (self.manifests_dir / f"{name}.json").unlink()
+            return True
+        except OSError:
+            return False
+
+    def gc(self) -> int:
+        """
+        Elimina los blobs que ya no referencia ningún manifiesto.
+
+        Returns:
+            Número de blobs eliminados
+        """
+        with self._lock:
+            referenced = set()
+            for backup in self.list_backups():
+                manifest = self._read_manifest(backup.path)
+                if manifest is not None:
+                    referenced.update(info["hash"] for info in manifest["files"].values())
+
+            removed = 0
+            for blob in self._iter_blobs():
+                if blob.name not in referenced:
+                    try:
+                        blob.unlink()
+                        removed += 1
+                    except OSError as e:
+                        logger.warning(f"No se pudo eliminar el blob {blob}: {e}")
+
+        if removed:
+            logger.info(f"Almacén de backups: {removed} blobs sin referencias eliminados")
+        return removed
+
+    def blob_path(self, digest: str) -> Path:
+        """Ruta del blob con un hash dado."""
+        return self.blobs_dir / digest[:2] / digest
+
+    def _write_file(self, info: Dict[str, Any], path: Path) -> None:
+        """Copia el blob de una entrada del manifiesto con sus metadatos."""
+        self.copier.copy_file(self.blob_path(info["hash"]), path)
+        os.chmod(path, info["mode"])
+        os.utime(path, ns=(info["mtime_ns"], info["mtime_ns"]))
+
+    def _store_file(self, path: str) -> Tuple[str, int]:
+        """
+        Guarda un archivo como blob si su contenido aún no está.
+
+        El archivo se lee una sola vez: se copia a un temporal del almacén
+        calculando el hash de lo que se escribe, de modo que el blob
+        coincide con su nombre aunque el original cambie mientras tanto.
+
+        Returns:
+            Tupla (hash, bytes escritos en el almacén)
+        """
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.blobs_dir / f".tmp-{uuid.uuid4().hex}"
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with open(path, "rb") as src, open(temp_path, "wb") as dst:
+                for chunk in iter(lambda: src.read(COPY_BUFFER_SIZE), b""):
+                    hasher.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+            digest = hasher.hexdigest()
+            blob = self.blob_path(digest)
+            if blob.exists():
+                return digest, 0
+            blob.parent.mkdir(exist_ok=True)
+            os.replace(temp_path, blob)
+            return digest, size
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def _latest_files(self, steamid: str) -> Dict[str, Dict[str, Any]]:
+        """Archivos del backup más reciente de una cuenta (vacío si no hay)."""
+        for backup in self.list_backups(steamid):
+            manifest = self._read_manifest(backup.path)
+            if manifest is not None:
+                return manifest["files"]
+        return {}
+
+    def has_backup(self, name: str) -> bool:
+        """Indica si el almacén tiene un backup con este nombre."""
+        return (self.manifests_dir / f"{name}.json").exists()
+
+    def _unique_name(self, steamid: str, created: float) -> str:
+        """Nombre de backup libre en el almacén y entre los demás formatos."""
+        return allocate_backup_name(steamid, created, lambda name: self.has_backup(name) or (
+            self.name_taken is not None and self.name_taken(name)))
+
+    def _iter_blobs(self) -> Iterator[Path]:
+        """Recorre todos los blobs del almacén."""
+        try:
+            prefixes = list(self.blobs_dir.iterdir())
+        except OSError:
+            return
+        for prefix in prefixes:
+            if prefix.is_dir():
+                yield from (blob for blob in prefix.iterdir() if blob.is_file())
+
+    @staticmethod
+    def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+        """Lee un manifiesto (None si no existe o está dañado)."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Manifiesto ilegible {path}: {e}")
+            return None
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    @staticmethod
+    def _info(manifest: Dict[str, Any], path: Path) -> BackupInfo:
+        """Convierte un manifiesto en BackupInfo."""
+        return BackupInfo(name=manifest["name"], steamid=manifest["steamid"], path=path,
+                          created=manifest["created"], format="store")
+
+
+def allocate_backup_name(steamid: str, created: float,
+                         is_taken: Callable[[str], bool]) -> str:
+    """
+    Nombre libre para un backup nuevo, común a los tres formatos.
+
+    Args:
+        steamid: Cuenta respaldada
+        created: Fecha del backup (timestamp)
+        is_taken: Indica si un nombre ya lo usa algún backup
+
+    Returns:
+        backup_<steamid>_<fecha>, con un sufijo _N si ya existe
+    """
+    timestamp = datetime.fromtimestamp(created).strftime("%Y%m%d_%H%M%S")
+    name = f"backup_{steamid}_{timestamp}"
+    suffix = 1
+    while is_taken(name):
+        name = f"backup_{steamid}_{timestamp}_{suffix}"
+        suffix += 1
+    return name
+
+
+def _walk(root: Path, copy_filter: Optional[CopyFilter] = None
+          ) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Recorre un árbol con scandir devolviendo (ruta relativa POSIX, entrada).
+
+    Las carpetas que excluye el filtro no se recorren.
+    """
+    pending = [(root, "")]
+    while pending:
+        current, prefix = pending.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if copy_filter is not None and not copy_filter.includes(
+                        entry.name, entry.is_dir(follow_symlinks=False)):
+                    continue
+                relative = f"{prefix}{entry.name}"
+                yield relative, entry
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((Path(entry.path), relative + "/"))
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """Escribe un JSON en un temporal y lo renombra encima del destino."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temp_path, path)
@@ -8,10 +8,28 @@ de copia de archivos siguiendo principios de responsabilidad única.
 import os
 import shutil
 import logging
+import threading
+import time
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
-from ..models.domain_models import AppConfig, CopyOperation, SteamAccount
-from config.settings import CACHE_FILE, CONFIG_PATTERNS, EXCLUDE_FOLDERS
+from ..models.domain_models import AppConfig, BackupInfo, CopyOperation, SteamAccount
+from ..utils.fast_copy import FastCopier
+from ..utils.fs_utils import (
+    SyncStats, CancellationToken, CopyCancelled, CopyMonitor, ProgressCallback,
+    sync_tree, parallel_copytree, swap_in_copy, swap_in_tree,
+    recover_interrupted_swap, check_relative_path, STAGING_SUFFIX, TEMP_FILE_SUFFIX
+)
+from ..utils.copy_filter import CopyFilter
+from ..utils.size_estimator import SizeEstimator
+from ..utils.stat_cache import StatScope, path_exists, path_is_dir, invalidate_path
+from .backup_store import BackupStore, allocate_backup_name
+from .backup_archive import (
+    ARCHIVE_SUFFIX, write_archive, archive_info, extract_archive, extract_files
+)
+from config.settings import (
+    CACHE_FILE, BACKUP_FORMAT, BACKUP_STORE_DIR,
+    BACKUP_ARCHIVE_COMPRESSION, COPY_MAX_WORKERS, DISK_SPACE_MARGIN
+)
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +79,16 @@ class ConfigurationService:
             logger.warning(f"Error cargando configuración: {e}")
             return AppConfig()
     
+    def reload_config(self) -> AppConfig:
+        """
+        Descarta la configuración en memoria y la vuelve a leer del archivo.
+        
+        Returns:
+            Configuración recargada
+        """
+        self._config = self.load_config()
+        return self._config
+    
     def save_config(self, config: Optional[AppConfig] = None) -> bool:
         """
         Guarda la configuración al archivo.
@@ -193,39 +221,106 @@ class FileCopyService:
     y manejo de errores robusto.
     """
     
-    def __init__(self, enable_backup: bool = True):
+    def __init__(self, enable_backup: bool = True, sync_mode: bool = True,
+                 compare_content: bool = False, backup_format: str = BACKUP_FORMAT,
+                 max_workers: int = COPY_MAX_WORKERS,
+                 copy_filter: Optional[CopyFilter] = None, preflight: bool = True):
         """
         Inicializa el servicio de copia.
         
         Args:
             enable_backup: Habilita backups automáticos
+            sync_mode: Sobre un destino existente escribe sólo lo que cambió
+                en lugar de borrarlo y copiarlo entero
+            compare_content: En modo sincronización compara también el
+                contenido de los archivos con igual tamaño
+            backup_format: "store" (almacén deduplicado), "zip" (archivo
+                comprimido) o "tree" (copia completa)
+            max_workers: Hilos para copiar archivos en paralelo (1 = secuencial)
+            copy_filter: Archivos y carpetas que entran en copias y backups
+                (por defecto el perfil DEFAULT_COPY_PROFILE)
+            preflight: Comprueba el espacio libre antes de cada copia
         """
         self.enable_backup = enable_backup
+        self.sync_mode = sync_mode
+        self.compare_content = compare_content
+        self.backup_format = backup_format
+        self.max_workers = max_workers
+        self.copy_filter = copy_filter or CopyFilter.from_profile()
+        self.preflight = preflight
+        # Tamaños por carpeta, reutilizados mientras no cambie su mtime
+        self.size_estimator = SizeEstimator(self.copy_filter)
+        self._backup_store: Optional[BackupStore] = None
+        # Estadísticas de la última sincronización (None si fue copia completa)
+        self.last_sync_stats: Optional[SyncStats] = None
+        # Eliminaciones de árboles apartados en curso
+        self._cleanup_threads: List[threading.Thread] = []
+        # Copia con reflink / copy_file_range / sendfile cuando sea posible
+        self.copier = FastCopier()
     
-    def copy_configuration(self, operation: CopyOperation) -> Tuple[bool, str]:
+    def copy_configuration(self, operation: CopyOperation,
+                           progress: Optional[ProgressCallback] = None,
+                           cancel_token: Optional[CancellationToken] = None) -> Tuple[bool, str]:
         """
         Copia la configuración entre cuentas.
         
+        Si se cancela, el destino queda como estaba: la copia completa se
+        prepara aparte y la sincronización sólo aplica los cambios cuando
+        todos los archivos están copiados.
+        
         Args:
             operation: Operación de copia a realizar
+            progress: Recibe un CopyProgress tras cada archivo copiado, desde
+                los hilos de copia (opcional)
+            cancel_token: Permite cancelar la copia desde otro hilo (opcional)
             
         Returns:
             Tupla (éxito, mensaje)
         """
+        self.copier.reset_stats()
+        monitor = CopyMonitor(progress, cancel_token)
+        with StatScope():
+            return self._copy_configuration(operation, monitor)
+    
+    @property
+    def copy_strategy_stats(self) -> Dict[str, int]:
+        """Archivos copiados con cada estrategia desde la última copia."""
+        return self.copier.strategy_counts()
+    
+    def _copy_configuration(self, operation: CopyOperation,
+                            monitor: Optional[CopyMonitor] = None) -> Tuple[bool, str]:
+        """Realiza la copia dentro de un ámbito de caché de stat."""
         if not operation.is_valid:
             return False, "Operación de copia inválida"
         
         try:
-            # Crear backup si está habilitado
+            if self.preflight:
+                has_space, space_msg = self.check_disk_space(operation)
+                if not has_space:
+                    logger.error(space_msg)
+                    return False, space_msg
+            
+            backup_path = None
             if self.enable_backup and operation.backup_enabled:
-                backup_success = self._create_backup(operation)
-                if not backup_success:
-                    logger.warning("No se pudo crear backup, continuando sin él")
+                if self.backup_format == "tree" and \
+                        not self._syncs_in_place(operation.destino.ruta):
+                    # La copia completa aparta el árbol anterior: será el backup
+                    backup_path = operation.get_backup_path()
+                else:
+                    # La copia modifica el destino (o el almacén sólo guarda
+                    # lo que cambió): respaldarlo antes
+                    backup_success = self._create_backup(operation)
+                    if not backup_success:
+                        logger.warning("No se pudo crear backup, continuando sin él")
             
             # Realizar la copia
+            if monitor is not None:
+                monitor.check()
             success = self._copy_folder_recursive(
                 operation.origen.ruta, 
-                operation.destino.ruta
+                operation.destino.ruta,
+                retire_to=backup_path,
+                monitor=monitor
             )
             
             if success:
@@ -233,6 +328,10 @@ class FileCopyService:
                 return True, "Configuración copiada exitosamente"
             else:
                 return False, "Error durante la copia de archivos"
+        
+        except CopyCancelled:
+            logger.info(f"Copia cancelada: {operation.description}")
+            return False, "Copia cancelada; el destino no se modificó"
                 
         except Exception as e:
             error_msg = f"Error inesperado durante la copia: {e}"
@@ -249,12 +348,19 @@ class FileCopyService:
         Returns:
             True si se creó el backup correctamente
         """
+        if self.backup_format != "tree":
+            return self.backup_account(operation.destino) is not None \
+                or not path_exists(operation.destino.ruta)
+        
         try:
             backup_path = operation.get_backup_path()
             
-            if operation.destino.ruta.exists():
+            if path_exists(operation.destino.ruta):
                 backup_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copytree(operation.destino.ruta, backup_path)
+                parallel_copytree(operation.destino.ruta, backup_path,
+                                  self.copier.copy2, self.max_workers,
+                                  copy_filter=self.copy_filter)
+                invalidate_path(backup_path)
                 logger.info(f"Backup creado en: {backup_path}")
                 return True
             
@@ -264,29 +370,68 @@ class FileCopyService:
             logger.error(f"Error creando backup: {e}")
             return False
     
-    def _copy_folder_recursive(self, origen: Path, destino: Path) -> bool:
+    def _syncs_in_place(self, destino: Path) -> bool:
+        """
+        Indica si la copia a destino se hará sincronizando en el sitio.
+        
+        Con un filtro selectivo siempre se sincroniza: una copia completa
+        reemplazaría el árbol y perdería lo excluido del destino.
+        """
+        return (self.sync_mode or not self.copy_filter.is_everything) and path_is_dir(destino)
+    
+    def _copy_folder_recursive(self, origen: Path, destino: Path,
+                               retire_to: Optional[Path] = None,
+                               monitor: Optional[CopyMonitor] = None) -> bool:
         """
-        Copia una carpeta de forma recursiva (método simplificado v2.1.2).
+        Copia una carpeta de forma recursiva.
+        
+        En modo sincronización, si el destino ya existe sólo se escriben los
+        archivos nuevos o modificados y se eliminan los que sobran. En otro
+        caso la copia se prepara en una carpeta hermana y se intercambia con
+        el destino mediante renombrados: un fallo a mitad de copia deja el
+        destino intacto y el destino sólo deja de existir durante un rename.
         
         Args:
             origen: Carpeta origen
             destino: Carpeta destino
+            retire_to: Ruta a la que mover el árbol anterior como backup
+                (si no se indica, se elimina en segundo plano)
+            monitor: Progreso y cancelación (opcional)
             
         Returns:
             True si la copia fue exitosa
+            
+        Raises:
+            CopyCancelled: Si se canceló (el destino queda intacto)
         """
+        self.last_sync_stats = None
         try:
             # Asegurar que el directorio padre del destino existe
             destino.parent.mkdir(parents=True, exist_ok=True)
             
-            # Eliminar destino si existe para hacer una copia limpia
-            if destino.exists():
-                import shutil
-                shutil.rmtree(destino)
+            # Reparar una copia anterior interrumpida antes de tocar nada
+            recover_interrupted_swap(destino)
+            invalidate_path(destino)
+            
+            if self._syncs_in_place(destino):
+                stats = sync_tree(origen, destino, self.compare_content,
+                                  copy_function=self.copier.copy2,
+                                  max_workers=self.max_workers, monitor=monitor,
+                                  copy_filter=self.copy_filter)
+                invalidate_path(destino)
+                self.last_sync_stats = stats
+                logger.info(f"Carpeta sincronizada: {origen} -> {destino} "
+                            f"({stats.copied} nuevos, {stats.updated} modificados, "
+                            f"{stats.deleted} eliminados, {stats.unchanged} sin cambios)")
+                return True
             
-            # Copiar toda la carpeta recursivamente (como en v1)
-            import shutil
-            shutil.copytree(origen, destino)
+            # Copia completa en una carpeta de preparación e intercambio
+            retired = swap_in_copy(origen, destino, copy_function=self.copier.copy2,
+                                   max_workers=self.max_workers, monitor=monitor,
+                                   copy_filter=self.copy_filter)
+            invalidate_path(destino)
+            if retired is not None:
+                self._retire_tree(retired, retire_to)
             
             logger.info(f"Carpeta copiada completamente: {origen} -> {destino}")
             return True
@@ -295,6 +440,260 @@ class FileCopyService:
             logger.error(f"Error copiando carpeta {origen} -> {destino}: {e}")
             return False
     
+    def _retire_tree(self, retired: Path, backup_path: Optional[Path]) -> None:
+        """
+        Da destino al árbol anterior apartado por una copia completa.
+        
+        Si se pidió backup, se mueve a la carpeta de backups (un rename si
+        está en el mismo volumen). Lo que no se conserva se elimina en un
+        hilo en segundo plano, fuera del camino crítico de la copia.
+        
+        Args:
+            retired: Árbol anterior apartado
+            backup_path: Ruta del backup (None si no se quiere backup)
+        """
+        if backup_path is not None:
+            try:
+                backup_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(retired), str(backup_path), copy_function=self.copier.copy2)
+                invalidate_path(backup_path)
+                logger.info(f"Backup creado en: {backup_path}")
+                return
+            except (OSError, shutil.Error) as e:
+                logger.warning(f"No se pudo crear backup, continuando sin él: {e}")
+        
+        thread = threading.Thread(target=shutil.rmtree, args=(retired,),
+                                  kwargs={"ignore_errors": True},
+                                  name="retired-tree-cleanup", daemon=True)
+        self._cleanup_threads.append(thread)
+        thread.start()
+    
+    def wait_for_cleanup(self, timeout: Optional[float] = None) -> None:
+        """
+        Espera a que terminen las eliminaciones en segundo plano.
+        
+        Args:
+            timeout: Segundos máximos de espera por eliminación (opcional)
+        """
+        while self._cleanup_threads:
+            self._cleanup_threads.pop().join(timeout)
+    
+    @property
+    def backup_dir(self) -> Path:
+        """Carpeta donde se guardan los backups."""
+        return Path.cwd() / "backups"
+    
+    @property
+    def backup_store(self) -> BackupStore:
+        """Almacén de backups deduplicado (dentro de la carpeta de backups)."""
+        if self._backup_store is None:
+            self._backup_store = BackupStore(self.backup_dir / BACKUP_STORE_DIR, self.copier,
+                                             name_taken=self._backup_name_taken)
+        return self._backup_store
+    
+    def backup_account(self, account: SteamAccount) -> Optional[BackupInfo]:
+        """
+        Crea un backup de la configuración de una cuenta.
+        
+        Args:
+            account: Cuenta a respaldar
+            
+        Returns:
+            Backup creado o None si no había nada que respaldar o falló
+        """
+        if not path_exists(account.ruta):
+            return None
+        
+        try:
+            if self.backup_format == "store":
+                backup = self.backup_store.create_backup(account.ruta, account.steamid,
+                                                         self.copy_filter)
+            elif self.backup_format == "zip":
+                backup = write_archive(account.ruta,
+                                       self._new_backup_path(account.steamid, ARCHIVE_SUFFIX),
+                                       account.steamid, BACKUP_ARCHIVE_COMPRESSION,
+                                       copy_filter=self.copy_filter)
+            else:
+                backup = self._backup_tree(account)
+            logger.info(f"Backup creado en: {backup.path}")
+            return backup
+            
+        except (OSError, shutil.Error) as e:
+            logger.error(f"Error creando backup: {e}")
+            return None
+    
+    def _backup_tree(self, account: SteamAccount) -> BackupInfo:
+        """Copia completa de la carpeta de una cuenta en la carpeta de backups."""
+        backup_path = self._new_backup_path(account.steamid)
+        backup_path.parent.mkdir(parents=True, exist_ok=True)
+        parallel_copytree(account.ruta, backup_path, self.copier.copy2, self.max_workers,
+                          copy_filter=self.copy_filter)
+        invalidate_path(backup_path)
+        return BackupInfo(name=backup_path.name, steamid=account.steamid,
+                          path=backup_path, created=backup_path.stat().st_mtime)
+    
+    def _new_backup_path(self, steamid: str, extension: str = "") -> Path:
+        """Ruta libre para un backup nuevo, con un nombre que no use ningún formato."""
+        name = allocate_backup_name(steamid, time.time(), self._backup_name_taken)
+        return self.backup_dir / f"{name}{extension}"
+    
+    def _backup_name_taken(self, name: str) -> bool:
+        """Indica si una copia completa, un zip o el almacén ya usan este nombre."""
+        return ((self.backup_dir / name).exists()
+                or (self.backup_dir / f"{name}{ARCHIVE_SUFFIX}").exists()
+                or self.backup_store.has_backup(name))
+    
+    def list_backups(self, steamid: Optional[str] = None) -> List[BackupInfo]:
+        """
+        Lista los backups existentes, del más reciente al más antiguo.
+        
+        Incluye las copias completas, los zip y los backups del almacén.
+        
+        Args:
+            steamid: Sólo los backups de esta cuenta (opcional)
+            
+        Returns:
+            Backups encontrados
+        """
+        prefix = f"backup_{steamid}_" if steamid else "backup_"
+        backups = []
+        try:
+            for path in self.backup_dir.iterdir():
+                if not path.name.startswith(prefix):
+                    continue
+                if path.is_dir():
+                    backups.append(BackupInfo(
+                        name=path.name, steamid=path.name.split("_")[1],
+                        path=path, created=path.stat().st_mtime
+                    ))
+                elif path.suffix == ARCHIVE_SUFFIX:
+                    backup = archive_info(path)
+                    if backup is not None:
+                        backups.append(backup)
+        except OSError:
+            pass
+        
+        backups.extend(self.backup_store.list_backups(steamid))
+        return sorted(backups, key=lambda backup: backup.created, reverse=True)
+    
+    def find_backup(self, name: str) -> Optional[BackupInfo]:
+        """
+        Busca un backup por su nombre o su ruta.
+        
+        Args:
+            name: Nombre del backup, nombre de su archivo (ej. el .zip) o su ruta
+            
+        Returns:
+            Backup encontrado o None
+            
+        Raises:
+            ValueError: Si el nombre corresponde a varios backups
+        """
+        matches = [backup for backup in self.list_backups()
+                   if name in (backup.name, backup.path.name, str(backup.path))]
+        if len(matches) > 1:
+            raise ValueError(f"El nombre {name} corresponde a varios backups: "
+                             f"{', '.join(str(backup.path) for backup in matches)}")
+        if matches:
+            return matches[0]
+        
+        # Copia completa o zip fuera de la carpeta de backups
+        path = Path(name)
+        if path.is_dir():
+            return BackupInfo(name=path.name, steamid="", path=path,
+                              created=path.stat().st_mtime)
+        if path.is_file() and path.suffix == ARCHIVE_SUFFIX:
+            return archive_info(path)
+        return None
+    
+    def restore_backup(self, backup: BackupInfo, account: SteamAccount,
+                       files: Optional[List[str]] = None) -> Tuple[bool, str]:
+        """
+        Restaura un backup sobre la configuración de una cuenta.
+        
+        Si los backups están habilitados, antes se respalda la configuración
+        actual de la cuenta.
+        
+        Args:
+            backup: Backup a restaurar
+            account: Cuenta destino
+            files: Rutas relativas (con "/") de los únicos archivos a
+                restaurar; por defecto se restaura la carpeta entera
+            
+        Returns:
+            Tupla (éxito, mensaje)
+        """
+        if not backup.path.exists():
+            return False, f"El backup no existe: {backup.path}"
+        
+        with StatScope():
+            if self.enable_backup and self.backup_account(account) is None \
+                    and path_exists(account.ruta):
+                logger.warning("No se pudo crear backup, continuando sin él")
+            
+            try:
+                if files:
+                    self._restore_files(backup, account.ruta, files)
+                elif backup.format == "tree":
+                    if not self._copy_folder_recursive(backup.path, account.ruta):
+                        return False, "Error durante la restauración de archivos"
+                else:
+                    self._restore_tree(backup, account.ruta)
+            except (OSError, shutil.Error) as e:
+                logger.error(f"Error restaurando {backup.name}: {e}")
+                return False, f"Error durante la restauración de archivos: {e}"
+            finally:
+                invalidate_path(account.ruta)
+        
+        logger.info(f"Backup restaurado: {backup.name} -> {account.ruta}")
+        return True, "Backup restaurado exitosamente"
+    
+    def _restore_tree(self, backup: BackupInfo, destino: Path) -> None:
+        """
+        Reconstruye un backup del almacén o un zip y lo lleva a destino.
+        
+        Normalmente el árbol reconstruido se intercambia con destino. Con un
+        filtro selectivo el backup no contiene lo excluido, así que se
+        sincroniza sobre destino para conservarlo.
+        """
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        recover_interrupted_swap(destino)
+        if backup.format == "store":
+            build = lambda staging: self.backup_store.materialize(backup.name, staging)
+        else:
+            build = lambda staging: extract_archive(backup.path, staging)
+        
+        if self.copy_filter.is_everything or not path_is_dir(destino):
+            retired = swap_in_tree(destino, build)
+            if retired is not None:
+                self._retire_tree(retired, None)
+            return
+        
+        staging = destino.with_name(destino.name + STAGING_SUFFIX)
+        try:
+            build(staging)
+            sync_tree(staging, destino, copy_function=self.copier.copy2,
+                      max_workers=self.max_workers, copy_filter=self.copy_filter)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    
+    def _restore_files(self, backup: BackupInfo, destino: Path, files: List[str]) -> None:
+        """Restaura archivos sueltos de un backup sin tocar el resto del destino."""
+        if backup.format == "zip":
+            extract_files(backup.path, files, destino)
+        elif backup.format == "store":
+            self.backup_store.extract_files(backup.name, files, destino)
+        else:
+            for relative in files:
+                source = backup.path / check_relative_path(relative)
+                if not source.is_file():
+                    raise FileNotFoundError(f"{relative} no está en el backup {backup.name}")
+                target = destino / relative
+                target.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = target.with_name(target.name + TEMP_FILE_SUFFIX)
+                self.copier.copy2(str(source), str(temp_path))
+                os.replace(temp_path, target)
+    
     def validate_paths(self, origen: Path, destino: Path) -> Tuple[bool, str]:
         """
         Valida que las rutas sean accesibles para la copia.
@@ -328,53 +727,122 @@ class FileCopyService:
         """
         Estima el tamaño de la copia en bytes.
         
+        Sólo cuenta lo que deja pasar el perfil de copia; las carpetas que
+        no cambiaron desde la última estimación se toman de la caché.
+        
         Args:
             origen: Carpeta origen
             
         Returns:
             Tamaño estimado en bytes
         """
-        total_size = 0
+        stats = self.size_estimator.estimate(origen)
+        if stats.unreadable:
+            logger.warning(f"No se pudo calcular el tamaño de {len(stats.unreadable)} "
+                           f"carpetas de {origen}")
+        return stats.size
+    
+    def plan_disk_usage(self, operation: CopyOperation) -> Dict[Path, int]:
+        """
+        Calcula cuántos bytes escribirá una copia en cada volumen.
         
+        La copia necesita el tamaño del origen en el volumen destino (los
+        temporales o la carpeta de preparación conviven con el árbol
+        actual hasta el final). El backup necesita el tamaño actual del
+        destino en el volumen de los backups; es una cota superior para el
+        almacén y los zip, que suelen ocupar menos. Un backup que sólo
+        aparta el árbol anterior con un rename no ocupa nada.
+        
+        Args:
+            operation: Operación de copia
+            
+        Returns:
+            Bytes necesarios por volumen, indexados por una carpeta existente de él
+        """
+        destino = operation.destino.ruta
+        needs: Dict[Path, int] = {}
+        volumes: Dict[int, Path] = {}
+        
+        def add(path: Path, size: int) -> None:
+            anchor = _existing_ancestor(path)
+            device = os.stat(anchor).st_dev
+            anchor = volumes.setdefault(device, anchor)
+            needs[anchor] = needs.get(anchor, 0) + size
+        
+        add(destino, self.get_copy_size_estimate(operation.origen.ruta))
+        
+        if self.enable_backup and operation.backup_enabled and path_is_dir(destino):
+            retired_by_rename = (
+                self.backup_format == "tree" and not self._syncs_in_place(destino)
+                and os.stat(_existing_ancestor(self.backup_dir)).st_dev
+                == os.stat(_existing_ancestor(destino)).st_dev
+            )
+            if not retired_by_rename:
+                add(self.backup_dir, self.get_copy_size_estimate(destino))
+        
+        return needs
+    
+    def check_disk_space(self, operation: CopyOperation) -> Tuple[bool, str]:
+        """
+        Comprueba que hay espacio libre para la copia y su backup.
+        
+        Cada volumen debe conservar además DISK_SPACE_MARGIN bytes libres.
+        
+        Args:
+            operation: Operación de copia
+            
+        Returns:
+            Tupla (hay espacio, mensaje de error)
+        """
         try:
-            # Calcular tamaño de toda la carpeta (simplificado)
-            for root, dirs, files in os.walk(origen):
-                for file in files:
-                    file_path = Path(root) / file
-                    try:
-                        total_size += file_path.stat().st_size
-                    except (OSError, FileNotFoundError):
-                        continue
-                        
-        except (OSError, PermissionError):
-            logger.warning(f"No se pudo calcular el tamaño de {origen}")
+            needs = self.plan_disk_usage(operation)
+        except OSError as e:
+            logger.warning(f"No se pudo comprobar el espacio libre: {e}")
+            return True, ""
+        
+        for anchor, needed in needs.items():
+            try:
+                free = shutil.disk_usage(anchor).free
+            except OSError as e:
+                logger.warning(f"No se pudo comprobar el espacio libre en {anchor}: {e}")
+                continue
+            if needed + DISK_SPACE_MARGIN > free:
+                return False, (f"Espacio insuficiente en {anchor}: se necesitan "
+                               f"{needed / 1024 / 1024:.1f} MB y hay "
+                               f"{free / 1024 / 1024:.1f} MB libres")
         
-        return total_size
+        return True, ""
     
     def cleanup_old_backups(self, max_backups: int = 10) -> None:
         """
         Limpia backups antiguos manteniendo solo los más recientes.
         
+        Después libera los blobs del almacén que ya no usa ningún backup.
+        
         Args:
             max_backups: Número máximo de backups a mantener
         """
         try:
-            backup_dir = Path.cwd() / "backups"
-            
-            if not backup_dir.exists():
-                return
-            
-            # Obtener todos los backups ordenados por fecha
-            backups = sorted(
-                [d for d in backup_dir.iterdir() if d.is_dir()],
-                key=lambda x: x.stat().st_mtime,
-                reverse=True
-            )
-            
             # Eliminar backups antiguos
-            for backup in backups[max_backups:]:
-                shutil.rmtree(backup)
-                logger.info(f"Backup eliminado: {backup}")
+            for backup in self.list_backups()[max_backups:]:
+                if backup.format == "store":
+                    self.backup_store.delete(backup.name)
+                elif backup.format == "zip":
+                    backup.path.unlink()
+                else:
+                    shutil.rmtree(backup.path)
+                    invalidate_path(backup.path)
+                logger.info(f"Backup eliminado: {backup.name}")
+            
+            self.backup_store.gc()
                 
         except Exception as e:
             logger.error(f"Error limpiando backups: {e}")
+
+
+def _existing_ancestor(path: Path) -> Path:
+    """La propia ruta o su antecesor más cercano que exista."""
+    path = Path(path).absolute()
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    return path
@@ -0,0 +1,188 @@
+"""
+Detección de cuentas sobre varias instalaciones de Steam.
+
+Es habitual tener a la vez el Steam del sistema y una instalación
+secundaria (otra biblioteca, una copia portable...). Este módulo agrupa un
+SteamAccountService por raíz, escanea todas las raíces en paralelo y
+combina los resultados en una sola lista, de modo que el usuario ve todas
+las cuentas sin cambiar la ruta personalizada y volver a escanear.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+from ..models.domain_models import SteamAccount
+from .steam_service import SteamAccountService
+
+logger = logging.getLogger(__name__)
+
+
+class MultiRootAccountService:
+    """
+    Servicio de cuentas que combina varias instalaciones de Steam.
+
+    Ofrece la misma interfaz de detección y enriquecimiento que
+    SteamAccountService. Cada cuenta queda marcada con la raíz en la que se
+    encontró (SteamAccount.steam_root) y se enriquece con el servicio de esa
+    raíz. Si un SteamID aparece en varias raíces se conserva el de la raíz
+    con más prioridad (la primera de la lista, es decir, la principal).
+    """
+
+    def __init__(self, services: List[SteamAccountService]):
+        """
+        Inicializa el servicio combinado.
+
+        Args:
+            services: Servicios por raíz, en orden de prioridad (no vacío)
+        """
+        if not services:
+            raise ValueError("Se necesita al menos una instalación de Steam")
+        self.services = list(services)
+
+    @property
+    def primary(self) -> SteamAccountService:
+        """Servicio de la instalación principal."""
+        return self.services[0]
+
+    @property
+    def steam_roots(self) -> List[Path]:
+        """Raíces de Steam incluidas, en orden de prioridad."""
+        return [service.steam_root for service in self.services]
+
+    @property
+    def userdata_dir(self) -> Path:
+        """Carpeta userdata de la instalación principal."""
+        return self.primary.userdata_dir
+
+    @property
+    def avatar_cache_path(self) -> Path:
+        """Carpeta avatarcache de la instalación principal."""
+        return Path(self.primary.avatar_cache_path)
+
+    def service_for(self, account: SteamAccount) -> SteamAccountService:
+        """
+        Obtiene el servicio de la instalación a la que pertenece una cuenta.
+
+        Args:
+            account: Cuenta detectada
+
+        Returns:
+            Servicio de su raíz (el principal si la raíz no es conocida)
+        """
+        for service in self.services:
+            if service.steam_root == account.steam_root:
+                return service
+        return self.primary
+
+    def list_accounts_with_dota2(self) -> List[SteamAccount]:
+        """
+        Fase rápida de la detección en todas las raíces a la vez.
+
+        Returns:
+            Cuentas sin enriquecer de todas las instalaciones, sin duplicados
+        """
+        accounts = self._merge(self._scan_roots(SteamAccountService.list_accounts_with_dota2))
+        logger.info(f"Se listaron {len(accounts)} cuentas con Dota 2 "
+                    f"en {len(self.services)} instalaciones")
+        return accounts
+
+    def find_accounts_with_dota2(self, parallel: bool = True,
+                                 max_workers: Optional[int] = None) -> List[SteamAccount]:
+        """
+        Detección completa en todas las raíces a la vez.
+
+        Args:
+            parallel: Procesa las carpetas de cada raíz de forma concurrente
+            max_workers: Número máximo de hilos por raíz
+
+        Returns:
+            Cuentas de todas las instalaciones, sin duplicados
+        """
+        return self._merge(self._scan_roots(
+            lambda service: service.find_accounts_with_dota2(parallel, max_workers)
+        ))
+
+    def enrich_account(self, account: SteamAccount) -> SteamAccount:
+        """Resuelve nombre y avatar con el servicio de la raíz de la cuenta."""
+        return self.service_for(account).enrich_account(account)
+
+    def enrich_accounts(self, accounts: List[SteamAccount], parallel: bool = True,
+                        max_workers: Optional[int] = None) -> Iterator[SteamAccount]:
+        """
+        Enriquece en lote las cuentas pendientes, raíz por raíz.
+
+        Dentro de cada raíz se respeta el orden recibido; las raíces se
+        recorren en orden de prioridad.
+
+        Args:
+            accounts: Cuentas obtenidas en la fase rápida
+            parallel: Procesa las carpetas de forma concurrente
+            max_workers: Número máximo de hilos (por defecto DISCOVERY_MAX_WORKERS)
+
+        Yields:
+            Cada cuenta en cuanto queda enriquecida
+        """
+        groups: Dict[int, List[SteamAccount]] = {}
+        for account in accounts:
+            groups.setdefault(id(self.service_for(account)), []).append(account)
+
+        for service in self.services:
+            group = groups.get(id(service))
+            if group:
+                yield from service.enrich_accounts(group, parallel, max_workers)
+
+    def validate_account(self, account: SteamAccount) -> bool:
+        """Valida la configuración de Dota 2 de una cuenta."""
+        return self.service_for(account).validate_account(account)
+
+    def _scan_roots(self, scan: Callable[[SteamAccountService], List[SteamAccount]]
+                    ) -> List[List[SteamAccount]]:
+        """
+        Ejecuta un escaneo en todas las raíces de forma concurrente.
+
+        Un error en una raíz no impide obtener las cuentas de las demás.
+
+        Args:
+            scan: Función que escanea una raíz
+
+        Returns:
+            Resultados por raíz, en orden de prioridad
+        """
+        if len(self.services) == 1:
+            return [scan(self.primary)]
+
+        with ThreadPoolExecutor(max_workers=len(self.services),
+                                thread_name_prefix="steam-root") as executor:
+            futures = [executor.submit(scan, service) for service in self.services]
+
+            results = []
+            for service, future in zip(self.services, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error detectando cuentas en {service.steam_root}: {e}")
+                    results.append([])
+            return results
+
+    @staticmethod
+    def _merge(results: List[List[SteamAccount]]) -> List[SteamAccount]:
+        """
+        Combina los resultados de varias raíces eliminando SteamIDs repetidos.
+
+        Args:
+            results: Cuentas por raíz, en orden de prioridad
+
+        Returns:
+            Cuentas combinadas y ordenadas por SteamID, como la detección de
+            una sola raíz; ante un conflicto gana la raíz más prioritaria
+        """
+        merged: Dict[str, SteamAccount] = {}
+        for accounts in results:
+            for account in accounts:
+                kept = merged.setdefault(account.steamid, account)
+                if kept is not account:
+                    logger.info(f"Cuenta {account.steamid} duplicada en {account.steam_root}; "
+                                f"se usa la de {kept.steam_root}")
+        # AccountWatcher.apply_events inserta las cuentas nuevas según este orden
+        return [merged[steamid] for steamid in sorted(merged)]
@@ -12,6 +12,7 @@ from typing import Optional, List
 from pathlib import Path
 from ..models.domain_models import AppConfig
 from .steam_service import SteamAccountService
+from .steam_session import SteamSession
 from ..utils.logging_utils import LoggingMixin
 
 
@@ -23,37 +24,34 @@ class SteamConfigurationService(LoggingMixin):
     automática cuando Steam no se encuentra en ubicaciones estándar.
     """
     
-    def __init__(self, config: AppConfig):
+    def __init__(self, config: AppConfig, session: Optional[SteamSession] = None):
+        """
+        Inicializa el servicio.
+        
+        Args:
+            config: Configuración de la aplicación
+            session: Sesión de Steam compartida (se crea una si no se indica)
+        """
         super().__init__()
         self.config = config
-        self.steam_service = None
-        self._initialize_steam_service()
+        self.session = session if session is not None else SteamSession(config)
     
-    def _initialize_steam_service(self):
-        """Inicializa el servicio de Steam con la configuración actual."""
-        self.steam_service = SteamAccountService(self.config.custom_steam_path)
+    @property
+    def steam_service(self) -> SteamAccountService:
+        """Servicio de cuentas de la sesión compartida."""
+        return self.session.account_service
     
     def detect_steam_installation(self) -> bool:
         """
         Detecta automáticamente la instalación de Steam.
         
+        La ruta personalizada tiene prioridad; si no es válida se descarta
+        y se usan las rutas estándar. El resultado queda en la sesión.
+        
         Returns:
             True si Steam se detecta correctamente
         """
-        # Primero intentar con ruta personalizada si existe
-        if self.config.custom_steam_path:
-            if self.steam_service._validate_steam_path(self.config.custom_steam_path):
-                self.logger.info(f"Steam detectado en ruta personalizada: {self.config.custom_steam_path}")
-                return True
-            else:
-                self.logger.warning(f"Ruta personalizada de Steam no válida: {self.config.custom_steam_path}")
-                self.config.custom_steam_path = ""
-        
-        # Buscar en rutas estándar
-        default_paths = self.steam_service.get_default_steam_paths()
-        if default_paths:
-            steam_path = default_paths[0]
-            self.logger.info(f"Steam detectado automáticamente en: {steam_path}")
+        if self.session.resolve() is not None:
             return True
         
         self.logger.warning("No se pudo detectar Steam automáticamente")
@@ -94,9 +92,7 @@ class SteamConfigurationService(LoggingMixin):
             return False
         
         # Validar la ruta seleccionada
-        if self.steam_service._validate_steam_path(steam_path):
-            self.config.custom_steam_path = steam_path
-            self._initialize_steam_service()
+        if self.session.set_steam_root(steam_path):
             
             messagebox.showinfo(
                 "Steam configurado",
@@ -126,13 +122,11 @@ class SteamConfigurationService(LoggingMixin):
         Returns:
             Nueva ruta de Steam si se configuró, None si se canceló
         """
-        dialog = SteamConfigDialog(parent_window, self.config.custom_steam_path)
+        dialog = SteamConfigDialog(parent_window, self.config.custom_steam_path, self.session)
         result = dialog.show()
         
         if result:
-            if self.steam_service._validate_steam_path(result):
-                self.config.custom_steam_path = result
-                self._initialize_steam_service()
+            if self.session.set_steam_root(result):
                 self.logger.info(f"Steam reconfigurado a: {result}")
                 return result
             else:
@@ -150,9 +144,6 @@ class SteamConfigurationService(LoggingMixin):
         Returns:
             Lista de cuentas Steam encontradas
         """
-        if not self.steam_service:
-            return []
-        
         return self.steam_service.find_accounts_with_dota2()
 
 
@@ -161,9 +152,11 @@ class SteamConfigDialog:
     Diálogo para configurar la ubicación de Steam.
     """
     
-    def __init__(self, parent: tk.Tk, current_path: str = ""):
+    def __init__(self, parent: tk.Tk, current_path: str = "",
+                 session: Optional[SteamSession] = None):
         self.parent = parent
         self.current_path = current_path
+        self.session = session if session is not None else SteamSession()
         self.result = None
         self.dialog = None
     
@@ -283,9 +276,8 @@ class SteamConfigDialog:
         ok_btn.pack(side="right")
     
     def _auto_detect(self):
-        """Detecta automáticamente Steam."""
-        steam_service = SteamAccountService()
-        paths = steam_service.get_default_steam_paths()
+        """Detecta automáticamente Steam (reutiliza la detección del inicio)."""
+        paths = self.session.probe_service.get_default_steam_paths()
         
         if paths:
             self.current_path = paths[0]
@@ -307,8 +299,7 @@ class SteamConfigDialog:
         )
         
         if steam_path:
-            steam_service = SteamAccountService()
-            if steam_service._validate_steam_path(steam_path):
+            if self.session.probe_service._validate_steam_path(steam_path):
                 self.current_path = steam_path
                 self.path_var.set(steam_path)
             else:
@@ -0,0 +1,123 @@
+"""
+Comprobación concurrente de rutas candidatas de Steam.
+
+Una unidad ausente, dormida o de red puede bloquear durante segundos una
+simple comprobación de existencia. Este módulo comprueba todas las rutas
+candidatas a la vez, cada una en su propio hilo con un tiempo máximo, y
+guarda la respuesta para que la detección al inicio y el diálogo de
+configuración no repitan la espera.
+
+Una candidata que agota el tiempo no se da por inválida: se informa aparte
+y la respuesta no se guarda, de modo que la siguiente consulta la vuelve a
+comprobar.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from config.settings import STEAM_PROBE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Función que comprueba una ruta candidata y devuelve las instalaciones válidas
+ProbeFunction = Callable[[str], List[str]]
+
+
+@dataclass
+class ProbeResult:
+    """Respuesta de una comprobación de candidatas."""
+    valid_paths: List[str] = field(default_factory=list)
+    # Candidatas que no respondieron a tiempo: ni válidas ni inválidas
+    timed_out: List[str] = field(default_factory=list)
+
+
+# Respuestas completas ya calculadas, por función de sondeo y lista de candidatas
+_probe_cache: Dict[Tuple[Any, Tuple[str, ...]], List[str]] = {}
+_probe_cache_lock = threading.Lock()
+
+
+def probe_steam_candidates(candidates: Sequence[str], probe: ProbeFunction,
+                           timeout: float = STEAM_PROBE_TIMEOUT,
+                           refresh: bool = False) -> ProbeResult:
+    """
+    Comprueba varias rutas candidatas de forma concurrente.
+
+    Cada candidata se comprueba en un hilo daemon; las que no responden
+    dentro del tiempo máximo se informan en timed_out y su hilo se abandona
+    sin bloquear la salida de la aplicación. Sólo se guardan las respuestas
+    en las que respondieron todas las candidatas.
+
+    Args:
+        candidates: Rutas a comprobar, en orden de preferencia
+        probe: Función que devuelve las instalaciones válidas de una candidata
+        timeout: Segundos máximos de espera por candidata
+        refresh: Ignora la respuesta guardada y vuelve a comprobar
+
+    Returns:
+        Instalaciones válidas en el orden de las candidatas y candidatas sin respuesta
+    """
+    paths = tuple(candidates)
+    # Un método ligado es un objeto nuevo en cada acceso: se usa su función
+    key = (getattr(probe, "__func__", probe), paths)
+
+    with _probe_cache_lock:
+        if not refresh and key in _probe_cache:
+            return ProbeResult(list(_probe_cache[key]))
+
+    results: List[Optional[List[str]]] = [None] * len(paths)
+
+    def run(position: int, candidate: str) -> None:
+        try:
+            results[position] = probe(candidate)
+        except Exception as e:
+            logger.debug(f"Error comprobando {candidate}: {e}")
+            results[position] = []
+
+    threads = []
+    for position, candidate in enumerate(paths):
+        thread = threading.Thread(target=run, args=(position, candidate),
+                                  name="steam-probe", daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    # Todas las candidatas arrancan a la vez: un plazo común equivale a
+    # un tiempo máximo por ruta
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    result = ProbeResult()
+    for candidate, found in zip(paths, results):
+        if found is None:
+            logger.warning(f"Tiempo agotado comprobando {candidate}")
+            result.timed_out.append(candidate)
+            continue
+        result.valid_paths.extend(found)
+
+    if not result.timed_out:
+        with _probe_cache_lock:
+            _probe_cache[key] = list(result.valid_paths)
+
+    return result
+
+
+def probe_steam_paths(candidates: Sequence[str], probe: ProbeFunction,
+                      timeout: float = STEAM_PROBE_TIMEOUT,
+                      refresh: bool = False) -> List[str]:
+    """
+    Comprueba varias rutas candidatas y devuelve sólo las instalaciones válidas.
+
+    Ver probe_steam_candidates; las candidatas sin respuesta no aparecen.
+
+    Returns:
+        Instalaciones válidas en el orden de las candidatas
+    """
+    return probe_steam_candidates(candidates, probe, timeout, refresh).valid_paths
+
+
+def clear_probe_cache() -> None:
+    """Descarta las respuestas guardadas (por ejemplo, al conectar una unidad)."""
+    with _probe_cache_lock:
+        _probe_cache.clear()
@@ -6,16 +6,83 @@ con Dota 2 y extraer información relevante.
 """
 
 import os
-import re
+import glob
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
-from ..models.domain_models import SteamAccount
-from config.settings import STEAM_USERDATA_PATH, AVATAR_CACHE_PATH, DOTA2_APP_ID
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..models.domain_models import SteamAccount, AccountHealthReport
+from ..utils.fs_utils import walk_tree
+from ..utils.stat_cache import (
+    StatScope, bind_stat_cache, path_exists, path_is_dir, dir_has_entries
+)
+from .avatar_index import AvatarIndex, AvatarEntry
+from .account_index import AccountIndex, FileStamp, compute_fingerprint, stat_stamp
+from .steam_probe import ProbeResult, probe_steam_candidates, probe_steam_paths
+from .vdf_parser import find_value_in_file, load as load_vdf, VdfParseError, SCAN_CHUNK_SIZE
+from config.settings import (
+    STEAM_USERDATA_PATH, AVATAR_CACHE_PATH, DOTA2_APP_ID, DISCOVERY_MAX_WORKERS,
+    LOGIN_USERS_FILE, STEAMID64_BASE, MESSAGES
+)
 
 logger = logging.getLogger(__name__)
 
 
+def scan_persona_name(config_path: Path, chunk_size: int = SCAN_CHUNK_SIZE) -> Optional[str]:
+    """
+    Busca PersonaName en localconfig.vdf con salida temprana.
+    
+    Args:
+        config_path: Ruta del archivo VDF
+        chunk_size: Tamaño de cada bloque leído
+        
+    Returns:
+        Nombre encontrado o None si el archivo no lo contiene
+        
+    Raises:
+        OSError: Si el archivo no se puede leer
+    """
+    return find_value_in_file(config_path, "PersonaName", chunk_size)
+
+
+def load_login_user_names(loginusers_path: Path) -> Dict[str, str]:
+    """
+    Lee config/loginusers.vdf y obtiene el PersonaName de cada cuenta.
+    
+    Steam guarda en este archivo todas las cuentas que iniciaron sesión,
+    indexadas por SteamID64. Se traducen al Steam3 ID que da nombre a las
+    carpetas de userdata.
+    
+    Args:
+        loginusers_path: Ruta de loginusers.vdf
+        
+    Returns:
+        Diccionario Steam3 ID -> PersonaName (vacío si el archivo no existe
+        o no se puede interpretar)
+    """
+    try:
+        users = load_vdf(loginusers_path).get("users", {})
+    except FileNotFoundError:
+        return {}
+    except (OSError, VdfParseError) as e:
+        logger.debug(f"Error leyendo {loginusers_path}: {e}")
+        return {}
+    
+    names = {}
+    for steamid64, data in users.items():
+        if not isinstance(data, dict) or not data.get("PersonaName"):
+            continue
+        try:
+            steam3_id = int(steamid64) - STEAMID64_BASE
+        except ValueError:
+            continue
+        if steam3_id >= 0:
+            names[str(steam3_id)] = data["PersonaName"]
+    
+    return names
+
+
 class SteamAccountService:
     """
     Servicio para detectar y gestionar cuentas de Steam.
@@ -24,11 +91,31 @@ class SteamAccountService:
     y extracción de información de usuario.
     """
     
-    def __init__(self, custom_steam_path: str = ""):
+    def __init__(self, custom_steam_path: str = "",
+                 account_index: Optional[AccountIndex] = None):
+        """
+        Inicializa el servicio de cuentas.
+        
+        Args:
+            custom_steam_path: Ruta personalizada de Steam (opcional)
+            account_index: Índice persistente para evitar reprocesar carpetas (opcional)
+        """
         self.custom_steam_path = custom_steam_path
         self.steam_userdata_path = self._get_steam_userdata_path()
-        self.avatar_cache_path = AVATAR_CACHE_PATH
+        self.avatar_cache_path = self._get_avatar_cache_path()
         self.dota2_app_id = DOTA2_APP_ID
+        self.account_index = account_index
+        
+        # Nombres de loginusers.vdf, releídos sólo si cambia su huella
+        self._login_names: Dict[str, str] = {}
+        self._login_names_stamp: FileStamp = None
+        self._login_names_lock = threading.Lock()
+        
+        # Serializa la actualización de las cuentas entre la detección y las peticiones
+        self._enrichment_lock = threading.Lock()
+        
+        # Índice de avatarcache, reconstruido al inicio de cada escaneo
+        self.avatar_index: Optional[AvatarIndex] = None
     
     def _get_steam_userdata_path(self) -> str:
         """
@@ -41,6 +128,17 @@ class SteamAccountService:
             return os.path.join(self.custom_steam_path, "userdata")
         return STEAM_USERDATA_PATH
     
+    def _get_avatar_cache_path(self) -> Path:
+        """
+        Obtiene la ruta de avatarcache de la misma instalación que userdata.
+        
+        Returns:
+            Ruta del caché de avatares de Steam
+        """
+        if self.custom_steam_path and os.path.exists(self.custom_steam_path):
+            return Path(self.custom_steam_path) / "config" / "avatarcache"
+        return AVATAR_CACHE_PATH
+    
     def set_custom_steam_path(self, steam_path: str) -> bool:
         """
         Configura una ruta personalizada de Steam.
@@ -54,6 +152,8 @@ class SteamAccountService:
         if self._validate_steam_path(steam_path):
             self.custom_steam_path = steam_path
             self.steam_userdata_path = os.path.join(steam_path, "userdata")
+            self.avatar_cache_path = self._get_avatar_cache_path()
+            self.avatar_index = None
             logger.info(f"Ruta de Steam configurada: {steam_path}")
             return True
         return False
@@ -79,14 +179,54 @@ class SteamAccountService:
         return (os.path.exists(steam_exe) or os.path.exists(userdata_dir)) and \
                os.path.exists(steamapps_dir)
     
-    def get_default_steam_paths(self) -> List[str]:
+    def get_default_steam_paths(self, refresh: bool = False) -> List[str]:
         """
         Obtiene una lista de rutas típicas donde puede estar instalado Steam.
         
+        Las rutas se comprueban en paralelo con un tiempo máximo por ruta y
+        la respuesta se reutiliza en llamadas posteriores.
+        
+        Args:
+            refresh: Vuelve a comprobar las rutas ignorando la respuesta guardada
+        
         Returns:
             Lista de rutas potenciales de Steam
         """
-        potential_paths = [
+        return probe_steam_paths(self._candidate_steam_paths(), self._probe_candidate,
+                                 refresh=refresh)
+    
+    def is_valid_steam_path(self, steam_path: str, refresh: bool = False) -> bool:
+        """
+        Valida una ruta con tiempo máximo, reutilizando comprobaciones previas.
+        
+        Args:
+            steam_path: Ruta a validar
+            refresh: Vuelve a comprobar la ruta ignorando la respuesta guardada
+            
+        Returns:
+            True si es una instalación válida de Steam
+        """
+        return bool(self.check_steam_path(steam_path, refresh=refresh).valid_paths)
+    
+    def check_steam_path(self, steam_path: str, refresh: bool = False) -> ProbeResult:
+        """
+        Comprueba una ruta con tiempo máximo distinguiendo si no respondió.
+        
+        Args:
+            steam_path: Ruta a comprobar
+            refresh: Vuelve a comprobar la ruta ignorando la respuesta guardada
+            
+        Returns:
+            Resultado con la ruta en valid_paths, en timed_out o en ninguna (inválida)
+        """
+        if not steam_path:
+            return ProbeResult()
+        return probe_steam_candidates([steam_path], self._probe_candidate, refresh=refresh)
+    
+    @staticmethod
+    def _candidate_steam_paths() -> List[str]:
+        """Rutas típicas de instalación de Steam, en orden de preferencia."""
+        return [
             r"C:\Program Files (x86)\Steam",
             r"C:\Program Files\Steam",
             r"D:\Steam",
@@ -95,47 +235,334 @@ class SteamAccountService:
             # Steam desde Microsoft Store
             os.path.expanduser(r"~\AppData\Local\Packages\ValveCorporation.Steam_*"),
         ]
+    
+    def _probe_candidate(self, path: str) -> List[str]:
+        """
+        Comprueba una ruta candidata (se ejecuta en un hilo de sondeo).
         
-        valid_paths = []
-        for path in potential_paths:
-            if "*" in path:
-                # Manejar wildcards para Steam de Microsoft Store
-                import glob
-                for expanded_path in glob.glob(path):
-                    steam_path = os.path.join(expanded_path, "LocalCache", "Local", "Steam")
-                    if self._validate_steam_path(steam_path):
-                        valid_paths.append(steam_path)
-            elif self._validate_steam_path(path):
-                valid_paths.append(path)
+        Args:
+            path: Ruta candidata, admite comodines para Steam de Microsoft Store
+            
+        Returns:
+            Instalaciones válidas encontradas en la candidata
+        """
+        if "*" not in path:
+            return [path] if self._validate_steam_path(path) else []
         
+        # Manejar wildcards para Steam de Microsoft Store
+        valid_paths = []
+        for expanded_path in glob.glob(path):
+            steam_path = os.path.join(expanded_path, "LocalCache", "Local", "Steam")
+            if self._validate_steam_path(steam_path):
+                valid_paths.append(steam_path)
         return valid_paths
     
-    def find_accounts_with_dota2(self) -> List[SteamAccount]:
+    @property
+    def userdata_dir(self) -> Path:
+        """Ruta de userdata como Path (la ruta personalizada se guarda como str)."""
+        return Path(self.steam_userdata_path)
+    
+    @property
+    def steam_root(self) -> Path:
+        """Raíz de la instalación de Steam a la que pertenece userdata."""
+        return self.userdata_dir.parent
+    
+    @property
+    def login_users_path(self) -> Path:
+        """Ruta de config/loginusers.vdf en la instalación de Steam."""
+        return self.userdata_dir.parent / "config" / LOGIN_USERS_FILE
+    
+    def _refresh_login_names(self) -> Dict[str, str]:
+        """
+        Carga los nombres de loginusers.vdf una vez por escaneo.
+        
+        El archivo sólo se vuelve a leer si cambió su huella (mtime y tamaño)
+        desde la última carga.
+        
+        Returns:
+            Diccionario Steam3 ID -> PersonaName
+        """
+        stamp = stat_stamp(self.login_users_path)
+        with self._login_names_lock:
+            if stamp != self._login_names_stamp:
+                self._login_names = load_login_user_names(self.login_users_path) if stamp else {}
+                self._login_names_stamp = stamp
+            names = self._login_names
+        if self.account_index is not None:
+            self.account_index.sync_login_names(str(self.userdata_dir), stamp, names)
+        return names
+    
+    def _refresh_avatar_index(self) -> AvatarIndex:
+        """
+        Reconstruye el índice de avatares con un único scandir de avatarcache.
+        
+        Returns:
+            Índice actualizado
+        """
+        self.avatar_index = AvatarIndex(Path(self.avatar_cache_path)).scan()
+        return self.avatar_index
+    
+    def find_accounts_with_dota2(self, parallel: bool = True,
+                                 max_workers: Optional[int] = None) -> List[SteamAccount]:
         """
         Detecta todas las cuentas de Steam que tienen Dota 2 instalado.
         
+        Las carpetas se procesan en un pool de hilos acotado y los resultados
+        se devuelven ordenados por nombre de carpeta, independientemente del
+        orden en que terminen los hilos.
+        
+        Args:
+            parallel: Procesa las carpetas de forma concurrente
+            max_workers: Número máximo de hilos (por defecto DISCOVERY_MAX_WORKERS)
+        
         Returns:
             Lista de cuentas Steam con Dota 2
         """
-        accounts = []
+        accounts = list(self.iter_accounts_with_dota2(parallel, max_workers))
+        
+        logger.info(f"Se encontraron {len(accounts)} cuentas con Dota 2")
+        return accounts
+    
+    def iter_accounts_with_dota2(self, parallel: bool = True,
+                                 max_workers: Optional[int] = None) -> Iterator[SteamAccount]:
+        """
+        Detecta las cuentas con Dota 2 entregándolas a medida que se resuelven.
         
+        Permite que la interfaz muestre las primeras cuentas sin esperar a
+        que termine el escaneo completo. El orden es el mismo que el de
+        find_accounts_with_dota2.
+        
+        Args:
+            parallel: Procesa las carpetas de forma concurrente
+            max_workers: Número máximo de hilos (por defecto DISCOVERY_MAX_WORKERS)
+        
+        Yields:
+            Cuentas Steam con Dota 2
+        """
         if not self._validate_steam_installation():
             logger.warning("Instalación de Steam no encontrada o inválida")
-            return accounts
+            return
         
         try:
-            for folder in os.listdir(self.steam_userdata_path):
-                account = self._process_steam_folder(folder)
+            folder_names = self._list_user_folders()
+        except (OSError, PermissionError) as e:
+            logger.error(f"Error accediendo a userdata de Steam: {e}")
+            return
+        
+        self._refresh_login_names()
+        self._refresh_avatar_index()
+        
+        with StatScope():
+            for account in self._process_folders(folder_names, parallel, max_workers):
                 if account:
-                    accounts.append(account)
                     logger.debug(f"Cuenta encontrada: {account.display_name}")
+                    yield account
+        
+        if self.account_index is not None:
+            self.account_index.prune(str(self.userdata_dir), folder_names)
+            self.account_index.save()
+    
+    def list_accounts_with_dota2(self) -> List[SteamAccount]:
+        """
+        Fase rápida de la detección: lista las cuentas sin resolver sus datos.
+        
+        Sólo recorre userdata y comprueba qué carpetas contienen Dota 2; no
+        lee archivos VDF ni consulta avatares. Las cuentas quedan con un
+        nombre provisional y enriched=False hasta pasar por enrich_account
+        o enrich_accounts.
+        
+        Returns:
+            Cuentas con Dota 2, ordenadas por nombre de carpeta
+        """
+        if not self._validate_steam_installation():
+            logger.warning("Instalación de Steam no encontrada o inválida")
+            return []
         
+        try:
+            folder_names = self._list_user_folders()
         except (OSError, PermissionError) as e:
             logger.error(f"Error accediendo a userdata de Steam: {e}")
+            return []
         
-        logger.info(f"Se encontraron {len(accounts)} cuentas con Dota 2")
+        accounts = []
+        with StatScope():
+            for folder_name in folder_names:
+                dota_path = self.userdata_dir / folder_name / self.dota2_app_id
+                if path_is_dir(dota_path):
+                    accounts.append(SteamAccount(
+                        steamid=folder_name,
+                        nombre=MESSAGES["loading_account_name"],
+                        ruta=dota_path,
+                        steam_root=self.steam_root,
+                        enriched=False
+                    ))
+        
+        logger.info(f"Se listaron {len(accounts)} cuentas con Dota 2")
         return accounts
     
+    def enrich_account(self, account: SteamAccount) -> SteamAccount:
+        """
+        Resuelve bajo demanda el nombre y el avatar de una cuenta.
+        
+        La cuenta se actualiza en el sitio, de modo que las vistas que ya la
+        muestran sólo tienen que redibujarse.
+        
+        Args:
+            account: Cuenta obtenida en la fase rápida
+            
+        Returns:
+            La misma cuenta, ya enriquecida
+        """
+        if account.enriched:
+            return account
+        
+        self._refresh_login_names()
+        self._apply_enrichment(account, self._process_folder_safely(account.steamid))
+        return account
+    
+    def enrich_accounts(self, accounts: List[SteamAccount], parallel: bool = True,
+                        max_workers: Optional[int] = None) -> Iterator[SteamAccount]:
+        """
+        Enriquece en lote las cuentas pendientes (fase de segundo plano).
+        
+        Args:
+            accounts: Cuentas obtenidas en la fase rápida, en orden de prioridad
+            parallel: Procesa las carpetas de forma concurrente
+            max_workers: Número máximo de hilos (por defecto DISCOVERY_MAX_WORKERS)
+            
+        Yields:
+            Cada cuenta en cuanto queda enriquecida, en el orden recibido
+        """
+        pending = [account for account in accounts if not account.enriched]
+        if not pending:
+            return
+        
+        self._refresh_login_names()
+        self._refresh_avatar_index()
+        
+        folder_names = [account.steamid for account in pending]
+        with StatScope():
+            for account, resolved in zip(pending, self._process_folders(folder_names, parallel,
+                                                                         max_workers)):
+                self._apply_enrichment(account, resolved)
+                yield account
+        
+        if self.account_index is not None:
+            self.account_index.save()
+    
+    def _apply_enrichment(self, account: SteamAccount, resolved: Optional[SteamAccount]) -> None:
+        """
+        Copia en una cuenta provisional los datos resueltos.
+        
+        Si otro hilo la enriqueció mientras tanto (detección en lote y
+        petición bajo demanda), se conservan sus datos.
+        
+        Args:
+            account: Cuenta de la fase rápida
+            resolved: Resultado completo de procesar su carpeta (None si falló)
+        """
+        with self._enrichment_lock:
+            if account.enriched:
+                return
+            if resolved is not None:
+                account.nombre = resolved.nombre
+                account.avatar = resolved.avatar
+                account.avatar_index = resolved.avatar_index
+            else:
+                account.nombre = "Desconocido"
+            account.enriched = True
+    
+    def _list_user_folders(self) -> List[str]:
+        """
+        Lista las carpetas de usuario de userdata con una sola pasada de scandir.
+        
+        Returns:
+            Nombres de carpeta ordenados para obtener resultados deterministas
+        """
+        with os.scandir(self.userdata_dir) as entries:
+            return sorted(entry.name for entry in entries if entry.is_dir())
+    
+    def _process_folders(self, folder_names: List[str], parallel: bool,
+                         max_workers: Optional[int]) -> Iterator[Optional[SteamAccount]]:
+        """
+        Procesa las carpetas de usuario, opcionalmente en paralelo.
+        
+        Args:
+            folder_names: Carpetas a procesar
+            parallel: Usa un pool de hilos si hay más de una carpeta
+            max_workers: Límite de hilos del pool
+            
+        Yields:
+            Resultados en el mismo orden que folder_names, en cuanto están listos
+        """
+        workers = min(max_workers or DISCOVERY_MAX_WORKERS, len(folder_names))
+        
+        if not parallel or workers <= 1:
+            for name in folder_names:
+                yield self._process_folder_safely(name)
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="steam-discovery")
+        process = bind_stat_cache(self._process_folder_safely)
+        futures = [executor.submit(process, name) for name in folder_names]
+        
+        try:
+            # Recorrer los futures en orden de entrada mantiene el resultado determinista
+            for future in futures:
+                yield future.result()
+        finally:
+            # Si el consumidor deja de iterar, no procesar las carpetas pendientes
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def _process_folder_safely(self, folder_name: str) -> Optional[SteamAccount]:
+        """
+        Procesa una carpeta aislando cualquier error inesperado.
+        
+        Un fallo en una carpeta no debe interrumpir la detección del resto.
+        """
+        try:
+            if self.account_index is not None:
+                return self._process_folder_indexed(folder_name)
+            return self._process_steam_folder(folder_name)
+        except Exception as e:
+            logger.warning(f"Error inesperado procesando carpeta {folder_name}: {e}")
+            return None
+    
+    def _process_folder_indexed(self, folder_name: str) -> Optional[SteamAccount]:
+        """
+        Procesa una carpeta consultando primero el índice persistente.
+        
+        Si la huella (mtime y tamaño) de la carpeta, de localconfig.vdf y del
+        avatar no cambió, se reutiliza la entrada guardada sin leer archivos.
+        Los cambios de loginusers.vdf los aplica el índice al cargar los
+        nombres (ver AccountIndex.sync_login_names).
+        
+        Args:
+            folder_name: Nombre de la carpeta de usuario
+            
+        Returns:
+            SteamAccount si la carpeta contiene Dota 2, None en caso contrario
+        """
+        root = str(self.userdata_dir)
+        fingerprint = compute_fingerprint(self.userdata_dir / folder_name, None)
+        # La huella del avatar sale del índice de avatarcache, sin otro stat
+        avatar = self._avatar_entry_for(folder_name)
+        fingerprint["avatar"] = avatar.stamp if avatar else None
+        
+        found, account = self.account_index.lookup(root, folder_name, fingerprint)
+        if found:
+            if account is not None:
+                account.avatar_index = self.avatar_index
+                account.steam_root = self.steam_root
+            return account
+        
+        account = self._process_steam_folder(folder_name)
+        self.account_index.store(root, folder_name, fingerprint, account,
+                                 name_from_login_users=folder_name in self._login_names)
+        return account
+    
     def _validate_steam_installation(self) -> bool:
         """
         Valida que la instalación de Steam sea accesible.
@@ -143,8 +570,8 @@ class SteamAccountService:
         Returns:
             True si Steam está correctamente instalado
         """
-        return (self.steam_userdata_path.exists() and 
-                self.avatar_cache_path.exists())
+        return (self.userdata_dir.exists() and 
+                Path(self.avatar_cache_path).exists())
     
     def _process_steam_folder(self, folder_name: str) -> Optional[SteamAccount]:
         """
@@ -157,11 +584,11 @@ class SteamAccountService:
             SteamAccount si la carpeta contiene Dota 2, None en caso contrario
         """
         try:
-            user_path = self.steam_userdata_path / folder_name
+            user_path = self.userdata_dir / folder_name
             dota_path = user_path / self.dota2_app_id
             
             # Verificar que existe la carpeta de Dota 2
-            if not dota_path.exists():
+            if not path_exists(dota_path):
                 return None
             
             # Extraer información del usuario
@@ -172,7 +599,9 @@ class SteamAccountService:
                 steamid=folder_name,
                 nombre=nombre,
                 ruta=dota_path,
-                avatar=avatar_path
+                avatar=avatar_path,
+                avatar_index=self.avatar_index,
+                steam_root=self.steam_root
             )
             
         except (ValueError, OSError) as e:
@@ -181,7 +610,10 @@ class SteamAccountService:
     
     def _extract_username(self, user_path: Path) -> str:
         """
-        Extrae el nombre de usuario desde localconfig.vdf.
+        Extrae el nombre de usuario.
+        
+        Usa primero los nombres ya cargados de loginusers.vdf y sólo lee el
+        localconfig.vdf de la cuenta si no aparece allí.
         
         Args:
             user_path: Ruta de la carpeta del usuario
@@ -189,25 +621,54 @@ class SteamAccountService:
         Returns:
             Nombre del usuario o "Desconocido"
         """
-        config_path = user_path / "config" / "localconfig.vdf"
+        nombre = self._login_names.get(user_path.name)
+        if nombre:
+            return nombre
         
-        if not config_path.exists():
-            return "Desconocido"
+        config_path = user_path / "config" / "localconfig.vdf"
         
         try:
-            with open(config_path, encoding='utf-8', errors='ignore') as f:
-                contenido = f.read()
-                
-            # Buscar el nombre de usuario en el archivo VDF
-            match = re.search(r'"PersonaName"\s+"([^"]+)"', contenido)
-            if match:
-                return match.group(1)
+            nombre = scan_persona_name(config_path)
+            if nombre:
+                return nombre
                 
-        except (IOError, UnicodeDecodeError) as e:
+        except FileNotFoundError:
+            pass
+        except OSError as e:
             logger.debug(f"Error leyendo localconfig.vdf: {e}")
         
         return "Desconocido"
     
+    def _refresh_avatar_entry(self, steamid: str) -> None:
+        """
+        Vuelve a comprobar el avatar de una sola cuenta en el índice.
+        
+        Args:
+            steamid: Steam ID (Steam3) de la cuenta
+        """
+        if self.avatar_index is None or not steamid.isdigit():
+            return
+        self.avatar_index.refresh_entry(str(int(steamid) + STEAMID64_BASE))
+    
+    def _avatar_entry_for(self, steamid: str) -> Optional[AvatarEntry]:
+        """
+        Busca el avatar de una cuenta en el índice de avatarcache.
+        
+        Args:
+            steamid: Steam ID (Steam3) de la cuenta
+            
+        Returns:
+            AvatarEntry si la cuenta tiene avatar, None en caso contrario
+        """
+        try:
+            # Convertir Steam3 ID a SteamID64
+            steamid64 = str(int(steamid) + STEAMID64_BASE)
+        except ValueError:
+            return None
+        
+        avatar_index = self.avatar_index or self._refresh_avatar_index()
+        return avatar_index.get(steamid64)
+    
     def _find_avatar(self, steamid: str) -> Optional[Path]:
         """
         Busca el avatar de una cuenta en el caché de Steam.
@@ -218,20 +679,8 @@ class SteamAccountService:
         Returns:
             Ruta del avatar si existe, None en caso contrario
         """
-        try:
-            # Convertir Steam3 ID a SteamID64
-            steam3_id = int(steamid)
-            steamid64 = str(steam3_id + 76561197960265728)
-            
-            avatar_path = self.avatar_cache_path / f"{steamid64}.png"
-            
-            if avatar_path.exists():
-                return avatar_path
-                
-        except (ValueError, OSError) as e:
-            logger.debug(f"Error buscando avatar para {steamid}: {e}")
-        
-        return None
+        avatar = self._avatar_entry_for(steamid)
+        return avatar.path if avatar else None
     
     def refresh_account_info(self, account: SteamAccount) -> SteamAccount:
         """
@@ -243,9 +692,28 @@ class SteamAccountService:
         Returns:
             Cuenta con información actualizada
         """
+        self._refresh_login_names()
+        self._refresh_avatar_entry(account.steamid)
         updated_account = self._process_steam_folder(account.steamid)
         return updated_account if updated_account else account
     
+    def resolve_folder(self, folder_name: str) -> Optional[SteamAccount]:
+        """
+        Resuelve una única carpeta de userdata, usando el índice si existe.
+        
+        Args:
+            folder_name: Nombre de la carpeta de usuario
+            
+        Returns:
+            SteamAccount si la carpeta contiene Dota 2, None en caso contrario
+        """
+        self._refresh_login_names()
+        self._refresh_avatar_entry(folder_name)
+        account = self._process_folder_safely(folder_name)
+        if self.account_index is not None:
+            self.account_index.save()
+        return account
+    
     def validate_account(self, account: SteamAccount) -> bool:
         """
         Valida que una cuenta tenga configuración válida de Dota 2.
@@ -257,8 +725,60 @@ class SteamAccountService:
             True si la cuenta es válida
         """
         return (account.config_exists and 
-                account.ruta.is_dir() and
-                len(list(account.ruta.iterdir())) > 0)
+                path_is_dir(account.ruta) and
+                dir_has_entries(account.ruta))
+    
+    def validate_accounts(self, accounts: List[SteamAccount], include_size: bool = True,
+                          max_workers: Optional[int] = None) -> List[AccountHealthReport]:
+        """
+        Valida muchas cuentas a la vez y devuelve un informe por cuenta.
+        
+        Las cuentas se revisan en un pool de hilos acotado. La comprobación
+        de carpeta vacía se detiene en la primera entrada; el tamaño y el
+        número de archivos sólo se calculan si include_size es True.
+        
+        Args:
+            accounts: Cuentas a validar
+            include_size: Recorre cada carpeta para obtener tamaño y archivos
+            max_workers: Número máximo de hilos (por defecto DISCOVERY_MAX_WORKERS)
+            
+        Returns:
+            Informes en el mismo orden que accounts
+        """
+        if not accounts:
+            return []
+        
+        workers = min(max_workers or DISCOVERY_MAX_WORKERS, len(accounts))
+        with StatScope(), ThreadPoolExecutor(max_workers=workers,
+                                             thread_name_prefix="account-health") as executor:
+            check = bind_stat_cache(self._check_account_health)
+            return list(executor.map(lambda account: check(account, include_size), accounts))
+    
+    @staticmethod
+    def _check_account_health(account: SteamAccount, include_size: bool) -> AccountHealthReport:
+        """
+        Revisa la carpeta de Dota 2 de una cuenta.
+        
+        Args:
+            account: Cuenta a revisar
+            include_size: Recorre la carpeta para obtener tamaño y archivos
+            
+        Returns:
+            Informe de la cuenta
+        """
+        report = AccountHealthReport(steamid=account.steamid, ruta=account.ruta)
+        report.exists = path_is_dir(account.ruta)
+        if not report.exists:
+            return report
+        
+        report.is_empty = not dir_has_entries(account.ruta)
+        if include_size and not report.is_empty:
+            tree = walk_tree(account.ruta)
+            report.size = tree.size
+            report.file_count = tree.file_count
+            report.unreadable = tree.unreadable
+        
+        return report
 
 
 class AccountFilterService:
@@ -365,23 +885,28 @@ class ValidationService:
         if not origen.config_exists:
             return False, f"No existe configuración en la cuenta origen: {origen.nombre}"
         
-        if not destino.ruta.parent.exists():
+        if not path_exists(destino.ruta.parent):
             return False, f"No se puede acceder a la cuenta destino: {destino.nombre}"
         
         return True, ""
     
     @staticmethod
-    def validate_steam_paths() -> Tuple[bool, str]:
+    def validate_steam_paths(userdata_path: Path = STEAM_USERDATA_PATH,
+                             avatar_cache_path: Path = AVATAR_CACHE_PATH) -> Tuple[bool, str]:
         """
         Valida que las rutas de Steam sean accesibles.
         
+        Args:
+            userdata_path: Carpeta userdata a validar
+            avatar_cache_path: Carpeta avatarcache a validar
+        
         Returns:
             Tupla (es_valido, mensaje_error)
         """
-        if not STEAM_USERDATA_PATH.exists():
+        if not path_exists(userdata_path):
             return False, "No se encontró la carpeta userdata de Steam"
         
-        if not AVATAR_CACHE_PATH.exists():
+        if not path_exists(avatar_cache_path):
             return False, "No se encontró el caché de avatares de Steam"
         
         return True, ""
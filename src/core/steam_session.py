@@ -0,0 +1,220 @@
+"""
+Sesión compartida de la instalación de Steam.
+
+Este módulo agrupa en un único objeto el estado que antes reconstruía cada
+componente por su cuenta: la raíz de Steam resuelta, sus rutas validadas y
+el servicio de cuentas con sus cachés de detección. La aplicación, el
+servicio de configuración y el diálogo de Steam reciben la misma sesión,
+de modo que la validación de rutas y los listados de carpetas se hacen una
+vez por sesión y no una vez por consumidor.
+"""
+
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from ..models.domain_models import AppConfig
+from .account_index import AccountIndex
+from .multi_root_service import MultiRootAccountService
+from .steam_service import SteamAccountService, ValidationService
+from config.settings import STEAM_USERDATA_PATH, AVATAR_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class SteamSession:
+    """
+    Estado compartido de la instalación de Steam durante una ejecución.
+
+    La raíz se resuelve de forma perezosa (ruta personalizada si es válida,
+    si no la primera ruta típica detectada) y se vuelve a resolver sólo si
+    cambia la ruta personalizada de la configuración.
+    """
+
+    def __init__(self, config: Optional[AppConfig] = None,
+                 account_index: Optional[AccountIndex] = None):
+        """
+        Inicializa la sesión.
+
+        Args:
+            config: Configuración de la aplicación (una vacía si no se indica)
+            account_index: Índice persistente compartido por la detección (opcional)
+        """
+        self.config = config if config is not None else AppConfig()
+        self.account_index = account_index
+        self._lock = threading.RLock()
+        self._steam_root: Optional[Path] = None
+        self._resolved_for: Optional[str] = None
+        self._account_service: Optional[SteamAccountService] = None
+        self._service_root: Optional[Path] = None
+        # Servicios de las instalaciones adicionales, uno por raíz
+        self._extra_services: Dict[Path, SteamAccountService] = {}
+        # Servicio sin ruta usado sólo para detectar y validar instalaciones
+        self._probe_service = SteamAccountService()
+
+    def resolve(self, refresh: bool = False) -> Optional[Path]:
+        """
+        Resuelve la raíz de Steam una vez por sesión.
+
+        Si la ruta personalizada de la configuración no es válida, se
+        descarta y se usa la detección automática. Si no responde a tiempo
+        (unidad dormida o de red) se usa la detección automática en esta
+        sesión, pero la ruta se conserva en la configuración.
+
+        Args:
+            refresh: Vuelve a resolver aunque la configuración no haya cambiado
+
+        Returns:
+            Raíz de Steam o None si no se encontró ninguna instalación
+        """
+        with self._lock:
+            if not refresh and self._resolved_for == self.config.custom_steam_path:
+                return self._steam_root
+
+            root = None
+            custom_path = self.config.custom_steam_path
+            if custom_path:
+                result = self._probe_service.check_steam_path(custom_path, refresh=refresh)
+                if result.valid_paths:
+                    logger.info(f"Steam detectado en ruta personalizada: {custom_path}")
+                    root = Path(custom_path)
+                elif result.timed_out:
+                    logger.warning(f"La ruta personalizada de Steam no respondió a tiempo: "
+                                   f"{custom_path}; se conserva y se vuelve a probar con refresh")
+                else:
+                    logger.warning(f"Ruta personalizada de Steam no válida: {custom_path}")
+                    self.config.custom_steam_path = ""
+
+            if root is None:
+                default_paths = self._probe_service.get_default_steam_paths(refresh=refresh)
+                if default_paths:
+                    logger.info(f"Steam detectado automáticamente en: {default_paths[0]}")
+                    root = Path(default_paths[0])
+
+            self._steam_root = root
+            self._resolved_for = self.config.custom_steam_path
+            return root
+
+    @property
+    def steam_root(self) -> Optional[Path]:
+        """Raíz de Steam resuelta (None si no hay instalación)."""
+        return self.resolve()
+
+    @property
+    def userdata_path(self) -> Path:
+        """Carpeta userdata de la instalación resuelta."""
+        root = self.steam_root
+        return root / "userdata" if root else STEAM_USERDATA_PATH
+
+    @property
+    def avatar_cache_path(self) -> Path:
+        """Carpeta avatarcache de la instalación resuelta."""
+        root = self.steam_root
+        return root / "config" / "avatarcache" if root else AVATAR_CACHE_PATH
+
+    @property
+    def account_service(self) -> SteamAccountService:
+        """
+        Servicio de cuentas de la instalación resuelta.
+
+        Se crea una sola vez por raíz, de modo que sus cachés (nombres de
+        loginusers.vdf, índice de avatares) se comparten entre consumidores.
+        """
+        with self._lock:
+            root = self.steam_root
+            if self._account_service is None or self._service_root != root:
+                service = SteamAccountService(str(root) if root else "",
+                                              account_index=self.account_index)
+                self._account_service = service
+                self._service_root = root
+            return self._account_service
+
+    @property
+    def steam_roots(self) -> List[Path]:
+        """
+        Raíces a escanear: la principal y las adicionales válidas.
+
+        Las adicionales salen de AppConfig.extra_steam_paths; se descartan
+        las inválidas y las que apuntan a la misma carpeta que otra raíz.
+        """
+        roots: List[Path] = []
+        seen = set()
+        candidates = [self.steam_root] + [Path(p) for p in self.config.extra_steam_paths if p]
+        for root in candidates:
+            if root is None:
+                continue
+            key = _canonical(root)
+            if key in seen:
+                continue
+            if root != self.steam_root and not self._probe_service.is_valid_steam_path(str(root)):
+                logger.warning(f"Instalación adicional de Steam no válida: {root}")
+                continue
+            seen.add(key)
+            roots.append(root)
+        return roots
+
+    @property
+    def discovery_service(self) -> Union[SteamAccountService, MultiRootAccountService]:
+        """
+        Servicio para detectar cuentas en todas las instalaciones.
+
+        Con una sola raíz es el propio account_service; con varias, un
+        MultiRootAccountService que las escanea en paralelo.
+        """
+        with self._lock:
+            primary = self.account_service
+            extra_roots = [root for root in self.steam_roots if root != self._service_root]
+            if not extra_roots:
+                return primary
+
+            services = [primary]
+            for root in extra_roots:
+                service = self._extra_services.get(root)
+                if service is None:
+                    service = SteamAccountService(str(root), account_index=self.account_index)
+                    self._extra_services[root] = service
+                services.append(service)
+            return MultiRootAccountService(services)
+
+    @property
+    def probe_service(self) -> SteamAccountService:
+        """Servicio para detectar y validar instalaciones sin ruta asociada."""
+        return self._probe_service
+
+    def set_steam_root(self, steam_path: str) -> bool:
+        """
+        Cambia la instalación de Steam de la sesión.
+
+        Args:
+            steam_path: Ruta elegida por el usuario
+
+        Returns:
+            True si la ruta es válida y se aplicó
+        """
+        if not self._probe_service._validate_steam_path(steam_path):
+            return False
+
+        with self._lock:
+            self.config.custom_steam_path = steam_path
+            self._steam_root = Path(steam_path)
+            self._resolved_for = steam_path
+        logger.info(f"Ruta de Steam configurada: {steam_path}")
+        return True
+
+    def validate_paths(self) -> Tuple[bool, str]:
+        """
+        Valida las rutas de la instalación resuelta.
+
+        Returns:
+            Tupla (es_valido, mensaje_error)
+        """
+        return ValidationService.validate_steam_paths(self.userdata_path, self.avatar_cache_path)
+
+
+def _canonical(path: Path) -> str:
+    """Clave para comparar raíces (resuelve enlaces simbólicos si puede)."""
+    try:
+        return os.path.normcase(str(path.resolve()))
+    except OSError:
+        return os.path.normcase(str(path))
@@ -0,0 +1,405 @@
+"""
+Parser de archivos KeyValues (VDF) de Valve.
+
+Este módulo centraliza la lectura de archivos .vdf/.vcfg de Steam y Dota 2
+(localconfig.vdf, loginusers.vdf, configuraciones de juego). Ofrece tres
+niveles de uso según el coste que se quiera pagar:
+
+- iter_events(): API de eventos en streaming, sin construir árbol.
+- parse_lazy(): árbol perezoso cuyos sub-bloques sólo se analizan al accederlos.
+- parse(): diccionario completo (anidado) para archivos pequeños.
+
+Además, find_value_in_file() busca la primera aparición de una clave
+leyendo por bloques de bytes y deteniéndose en cuanto la encuentra.
+"""
+
+import re
+import functools
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Tipos de evento de iter_events()
+EVENT_KEY_VALUE = "key_value"
+EVENT_START = "start"
+EVENT_END = "end"
+
+# Tokens: cadena entre comillas | llave | comentario | condicional [$WIN32] | token sin comillas
+_TOKEN_PATTERN = re.compile(
+    r'"((?:[^"\\]|\\.)*)"|([{}])|//[^\n]*|\[[^\]\n]*\]|([^\s{}"]+)',
+    re.DOTALL
+)
+
+# Para saltar un bloque sólo interesan las llaves que no están dentro de
+# cadenas o comentarios. El patrón ("unrolled loop") consume en una sola
+# coincidencia todo el texto hasta la siguiente llave significativa.
+_QUOTED = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_BLOCK_SKIP_PATTERN = re.compile(
+    r'[^{}"/]*(?:(?:' + _QUOTED + r'|//[^\n]*|/)[^{}"/]*)*([{}])',
+    re.DOTALL
+)
+
+_ESCAPE_PATTERN = re.compile(r'\\(.)', re.DOTALL)
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+
+# Lectura por bloques de find_value_in_file()
+SCAN_CHUNK_SIZE = 64 * 1024
+SCAN_OVERLAP = 1024
+
+
+class VdfParseError(ValueError):
+    """Error de sintaxis en un archivo KeyValues."""
+
+    def __init__(self, message: str, text: str = "", position: int = 0):
+        line = text.count("\n", 0, position) + 1 if text else 0
+        super().__init__(f"{message} (línea {line})" if line else message)
+        self.line = line
+
+
+def _unescape(value: str) -> str:
+    """Resuelve las secuencias de escape de una cadena entre comillas."""
+    if "\\" not in value:
+        return value
+    return _ESCAPE_PATTERN.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), value)
+
+
+def _next_token(text: str, pos: int, end: int) -> Optional[Tuple[str, Optional[str], int, int]]:
+    """
+    Obtiene el siguiente token significativo a partir de una posición.
+
+    Returns:
+        Tupla (tipo, valor, inicio, fin) o None al llegar al final.
+        El tipo es "string", "{" o "}".
+    """
+    while True:
+        match = _TOKEN_PATTERN.search(text, pos, end)
+        if match is None:
+            return None
+
+        quoted, brace, bare = match.group(1, 2, 3)
+        if quoted is not None:
+            return "string", _unescape(quoted), match.start(), match.end()
+        if brace is not None:
+            return brace, None, match.start(), match.end()
+        if bare is not None:
+            return "string", bare, match.start(), match.end()
+
+        # Comentario o condicional: se ignoran
+        pos = match.end()
+
+
+def _find_block_end(text: str, pos: int, end: int) -> int:
+    """
+    Encuentra la llave que cierra el bloque abierto justo antes de pos.
+
+    Returns:
+        Posición de la llave de cierre
+    """
+    depth = 1
+    for match in _BLOCK_SKIP_PATTERN.finditer(text, pos, end):
+        token = match.group(1)
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                return match.start(1)
+
+    raise VdfParseError("Bloque sin cerrar", text, pos)
+
+
+def iter_events(text: str) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Recorre un documento KeyValues emitiendo eventos sin construir un árbol.
+
+    Args:
+        text: Contenido del archivo
+
+    Yields:
+        (EVENT_KEY_VALUE, clave, valor), (EVENT_START, clave, None)
+        o (EVENT_END, None, None)
+
+    Raises:
+        VdfParseError: Si la estructura es inválida
+    """
+    depth = 0
+    pending_key = None
+    pos, end = 0, len(text)
+
+    while True:
+        token = _next_token(text, pos, end)
+        if token is None:
+            break
+        kind, value, start, pos = token
+
+        if kind == "string":
+            if pending_key is None:
+                pending_key = value
+            else:
+                yield EVENT_KEY_VALUE, pending_key, value
+                pending_key = None
+
+        elif kind == "{":
+            if pending_key is None:
+                raise VdfParseError("Bloque sin clave", text, start)
+            yield EVENT_START, pending_key, None
+            pending_key = None
+            depth += 1
+
+        else:
+            if pending_key is not None:
+                raise VdfParseError(f"Clave sin valor: {pending_key}", text, start)
+            if depth == 0:
+                raise VdfParseError("Llave de cierre sin apertura", text, start)
+            depth -= 1
+            yield EVENT_END, None, None
+
+    if pending_key is not None:
+        raise VdfParseError(f"Clave sin valor: {pending_key}", text, end)
+    if depth:
+        raise VdfParseError("Fin de archivo dentro de un bloque", text, end)
+
+
+def parse(text: str) -> Dict[str, Any]:
+    """
+    Analiza un documento KeyValues completo.
+
+    Las claves repetidas conservan el primer valor, igual que el árbol
+    perezoso y FindKey de Valve.
+
+    Args:
+        text: Contenido del archivo
+
+    Returns:
+        Diccionario anidado (los bloques son diccionarios y los valores str)
+    """
+    root: Dict[str, Any] = {}
+    stack: List[Dict[str, Any]] = [root]
+
+    for event, key, value in iter_events(text):
+        if event == EVENT_KEY_VALUE:
+            stack[-1].setdefault(key, value)
+        elif event == EVENT_START:
+            child: Dict[str, Any] = {}
+            stack[-1].setdefault(key, child)
+            stack.append(child)
+        else:
+            stack.pop()
+
+    return root
+
+
+class VdfNode(Mapping):
+    """
+    Bloque KeyValues analizado de forma perezosa e incremental.
+
+    Un acceso por clave sólo analiza este nivel hasta encontrar la clave.
+    Los sub-bloques se convierten en nuevos VdfNode sin analizar y su
+    llave de cierre sólo se busca cuando hace falta continuar más allá de
+    ellos, de modo que leer una clave cercana al inicio de un archivo de
+    varios megabytes no recorre el resto del documento.
+    """
+
+    __slots__ = ("_text", "_start", "_end", "_items", "_resume", "_complete", "_is_root")
+
+    def __init__(self, text: str, start: int = 0, end: Optional[int] = None,
+                 is_root: bool = True):
+        self._text = text
+        self._start = start
+        # Fin del bloque (posición de su llave de cierre); None si aún no se conoce
+        self._end = len(text) if is_root and end is None else end
+        self._items: Dict[str, Any] = {}
+        # Punto donde continuar el análisis: posición o sub-bloque a saltar
+        self._resume: Any = start
+        self._complete = False
+        self._is_root = is_root
+
+    @property
+    def is_materialized(self) -> bool:
+        """Indica si este nivel ya fue analizado por completo."""
+        return self._complete
+
+    def _resume_position(self) -> int:
+        """Posición donde continuar el análisis de este nivel."""
+        if isinstance(self._resume, VdfNode):
+            return self._resume._block_end() + 1
+        return self._resume
+
+    def _block_end(self) -> int:
+        """Posición de la llave que cierra este bloque (se calcula una vez)."""
+        if self._end is None:
+            self._end = _find_block_end(self._text, self._resume_position(), len(self._text))
+        return self._end
+
+    def _scan(self, until_key: Optional[str] = None) -> None:
+        """
+        Analiza este nivel hasta encontrar until_key o llegar al final.
+
+        Las claves repetidas conservan el primer valor, igual que FindKey
+        de Valve.
+        """
+        if self._complete:
+            return
+
+        text = self._text
+        limit = self._end if self._end is not None else len(text)
+        pos = self._resume_position()
+        pending_key = None
+
+        while True:
+            token = _next_token(text, pos, limit)
+            if token is None:
+                if pending_key is not None:
+                    raise VdfParseError(f"Clave sin valor: {pending_key}", text, limit)
+                if self._end is None:
+                    raise VdfParseError("Bloque sin cerrar", text, self._start)
+                break
+            kind, value, start, pos = token
+
+            if kind == "string":
+                if pending_key is None:
+                    pending_key = value
+                    continue
+                key, pending_key = pending_key, None
+                self._items.setdefault(key, value)
+                self._resume = pos
+
+            elif kind == "{":
+                if pending_key is None:
+                    raise VdfParseError("Bloque sin clave", text, start)
+                key, pending_key = pending_key, None
+                child = VdfNode(text, pos, is_root=False)
+                self._items.setdefault(key, child)
+                self._resume = child
+                if key == until_key:
+                    return
+                pos = child._block_end() + 1
+                continue
+
+            else:
+                if pending_key is not None:
+                    raise VdfParseError(f"Clave sin valor: {pending_key}", text, start)
+                if self._is_root:
+                    raise VdfParseError("Llave de cierre sin apertura", text, start)
+                self._end = start
+                break
+
+            if key == until_key:
+                return
+
+        self._complete = True
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._items:
+            self._scan(until_key=key)
+        return self._items[key]
+
+    def __iter__(self):
+        self._scan()
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        self._scan()
+        return len(self._items)
+
+    def get_path(self, *keys: str, default: Any = None) -> Any:
+        """
+        Obtiene un valor anidado recorriendo varias claves.
+
+        Args:
+            *keys: Claves a recorrer, de la raíz a la hoja
+            default: Valor si alguna clave no existe
+
+        Returns:
+            Valor encontrado (str o VdfNode) o default
+        """
+        node: Any = self
+        for key in keys:
+            if not isinstance(node, VdfNode) or key not in node:
+                return default
+            node = node[key]
+        return node
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materializa el bloque completo como diccionario anidado."""
+        return {key: value.to_dict() if isinstance(value, VdfNode) else value
+                for key, value in self.items()}
+
+    def __repr__(self) -> str:
+        state = "analizado" if self._complete else f"{len(self._items)} claves analizadas"
+        return f"VdfNode({state})"
+
+
+def parse_lazy(text: str) -> VdfNode:
+    """
+    Crea el árbol perezoso de un documento KeyValues.
+
+    Args:
+        text: Contenido del archivo
+
+    Returns:
+        Nodo raíz (todavía sin analizar)
+    """
+    return VdfNode(text)
+
+
+def read_text(path: Path) -> str:
+    """Lee un archivo VDF tolerando bytes no válidos en UTF-8."""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def load(path: Path) -> Dict[str, Any]:
+    """Lee y analiza por completo un archivo VDF."""
+    return parse(read_text(path))
+
+
+def load_lazy(path: Path) -> VdfNode:
+    """Lee un archivo VDF y devuelve su árbol perezoso."""
+    return parse_lazy(read_text(path))
+
+
+@functools.lru_cache(maxsize=32)
+def _key_value_pattern(key: str) -> "re.Pattern":
+    """Compila (una vez por clave) el patrón "clave" "valor" sobre bytes."""
+    return re.compile(b'"' + re.escape(key.encode('utf-8')) + rb'"\s+"((?:[^"\\]|\\.)*)"',
+                      re.DOTALL)
+
+
+def find_value_in_file(path: Path, key: str,
+                       chunk_size: int = SCAN_CHUNK_SIZE) -> Optional[str]:
+    """
+    Busca el primer valor de una clave leyendo el archivo por bloques.
+
+    La lectura se detiene en cuanto aparece la clave y sólo se decodifica
+    el valor encontrado. Es útil para archivos de varios megabytes como
+    localconfig.vdf, donde leer y decodificar todo el contenido domina el
+    coste. El valor no puede superar SCAN_OVERLAP bytes.
+
+    Args:
+        path: Ruta del archivo VDF
+        key: Clave a buscar (sensible a mayúsculas)
+        chunk_size: Tamaño de cada bloque leído
+
+    Returns:
+        Valor encontrado o None si el archivo no contiene la clave
+
+    Raises:
+        OSError: Si el archivo no se puede leer
+    """
+    pattern = _key_value_pattern(key)
+    tail = b""
+
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return None
+
+            buffer = tail + chunk
+            match = pattern.search(buffer)
+            if match:
+                return _unescape(match.group(1).decode('utf-8', errors='ignore'))
+
+            # Conservar el final por si la clave quedó partida entre bloques
+            tail = buffer[-SCAN_OVERLAP:]
@@ -5,9 +5,11 @@ Este módulo contiene la clase principal de la aplicación que coordina
 todos los componentes siguiendo principios de arquitectura limpia.
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk
-from typing import List, Optional
+from typing import Callable, List, Optional, Set, Union
 from pathlib import Path
 
 # Imports locales
@@ -16,12 +18,19 @@ from .ignored_tab import IgnoredTabController
 from ..core.steam_service import SteamAccountService, AccountFilterService, ValidationService
 from ..core.config_service import ConfigurationService, FileCopyService
 from ..core.steam_config_service import SteamConfigurationService
+from ..core.steam_session import SteamSession
+from ..core.multi_root_service import MultiRootAccountService
+from ..core.account_index import AccountIndex
+from ..core.account_watcher import AccountWatcher, AccountChangeEvent
 from ..models.domain_models import SteamAccount, AppSelection, CopyOperation, AppConfig
 from ..utils.ui_utils import MessageHelper, IconHelper, AboutDialog
 from ..utils.logging_utils import LoggingMixin, OperationContext
+from ..utils.stat_cache import StatScope
+from ..utils.copy_filter import CopyFilter
 from config.settings import (
     APP_NAME, APP_VERSION, APP_AUTHOR, APP_DESCRIPTION, WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT,
-    WINDOW_DEFAULT_WIDTH, WINDOW_DEFAULT_HEIGHT, ICON_PATH, MESSAGES
+    WINDOW_DEFAULT_WIDTH, WINDOW_DEFAULT_HEIGHT, ICON_PATH, MESSAGES, ACCOUNT_WATCH_POLL_MS,
+    DISCOVERY_DRAIN_MS
 )
 
 
@@ -51,6 +60,16 @@ class DotaTwinApp(LoggingMixin):
         self.ignored_accounts: List[SteamAccount] = []
         self.current_selection = AppSelection()
         
+        # Vigilancia de cambios en las carpetas de Steam
+        self.account_watcher: Optional[AccountWatcher] = None
+        self._watch_job: Optional[str] = None
+        
+        # Cola de la detección progresiva en curso (None si no hay ninguna)
+        self._discovery_queue: Optional[queue.Queue] = None
+        # Cuentas visibles cuya resolución se adelanta, y las ya pedidas
+        self._enrich_requests: Optional[queue.Queue] = None
+        self._enrich_requested: Set[str] = set()
+        
         # Componentes de interfaz
         self.main_tab_widget: Optional[AccountListWidget] = None
         self.ignored_tab_controller: Optional[IgnoredTabController] = None
@@ -71,8 +90,12 @@ class DotaTwinApp(LoggingMixin):
         self.config_service = ConfigurationService()
         self.app_config = self.config_service.load_config()
         
+        # Sesión de Steam compartida: raíz, rutas validadas y cachés de detección
+        self.account_index = AccountIndex()
+        self.steam_session = SteamSession(self.app_config, account_index=self.account_index)
+        
         # Inicializar servicio de configuración de Steam
-        self.steam_config_service = SteamConfigurationService(self.app_config)
+        self.steam_config_service = SteamConfigurationService(self.app_config, self.steam_session)
         
         # Verificar instalación de Steam
         if not self.steam_config_service.detect_steam_installation():
@@ -85,14 +108,23 @@ class DotaTwinApp(LoggingMixin):
                     "Puede configurar Steam más tarde desde el menú Configuración."
                 )
         
-        # Inicializar otros servicios
-        self.steam_service = SteamAccountService(self.app_config.custom_steam_path)
+        # Inicializar otros servicios (detección sobre todas las instalaciones)
+        self.steam_service = self.steam_session.discovery_service
         self.filter_service = AccountFilterService()
         self.validation_service = ValidationService()
-        self.file_service = FileCopyService(enable_backup=True)
+        self.file_service = FileCopyService(enable_backup=True,
+                                            copy_filter=self._load_copy_filter())
         
         self.logger.info("Servicios inicializados correctamente")
     
+    def _load_copy_filter(self) -> CopyFilter:
+        """Filtro del perfil de copia configurado (el por defecto si no existe)."""
+        try:
+            return CopyFilter.from_profile(self.app_config.copy_profile)
+        except ValueError as e:
+            self.logger.warning(f"{e}; se usa el perfil por defecto")
+            return CopyFilter.from_profile()
+    
     def _setup_application(self) -> None:
         """Configura la ventana principal y propiedades de la aplicación."""
         # Configurar App ID para Windows (ayuda con el icono de barra de tareas)
@@ -271,6 +303,8 @@ class DotaTwinApp(LoggingMixin):
         # Configurar callbacks
         self.main_tab_widget.on_selection_changed = self._on_selection_changed
         self.main_tab_widget.on_account_ignored = self._on_account_ignored
+        # Las filas visibles adelantan la resolución de nombre y avatar
+        self.main_tab_widget.account_enricher = self._request_enrichment
     
     def _create_ignored_tab(self) -> None:
         """Crea la pestaña de cuentas ignoradas."""
@@ -294,28 +328,251 @@ class DotaTwinApp(LoggingMixin):
         self.action_buttons.on_copy_clicked = self._on_copy_configuration
         self.action_buttons.on_cancel_clicked = self._on_cancel_selection
     
-    def _load_initial_data(self) -> None:
-        """Carga los datos iniciales de la aplicación."""
+    def _load_initial_data(self, on_complete: Optional[Callable[[], None]] = None) -> None:
+        """
+        Carga los datos iniciales de la aplicación.
+        
+        La detección de cuentas corre en un hilo aparte y las cuentas se
+        muestran a medida que llegan, de modo que la primera página aparece
+        sin esperar a que termine el escaneo completo.
+        
+        Args:
+            on_complete: Callback opcional al terminar la detección
+        """
         with OperationContext("load_initial_data", self.logger):
             # Validar instalación de Steam
-            is_valid, error_msg = self.validation_service.validate_steam_paths()
+            is_valid, error_msg = self.steam_session.validate_paths()
             if not is_valid:
                 MessageHelper.show_error("Error", error_msg)
                 return
             
-            # Detectar cuentas de Steam
-            self.all_accounts = self.steam_service.find_accounts_with_dota2()
-            
-            if not self.all_accounts:
-                MessageHelper.show_warning("Aviso", MESSAGES["no_accounts"])
-                return
-            
             # Cargar configuración guardada
             self._load_saved_configuration()
             
-            # Actualizar interfaz
-            self._refresh_account_lists()
+            # Vaciar listas antes de recibir las cuentas detectadas
+            self.all_accounts = []
+            self.available_accounts = []
+            self.ignored_accounts = []
+            if self.main_tab_widget:
+                self.main_tab_widget.set_accounts([])
+            
+            self._start_streaming_discovery(on_complete)
+    
+    def _start_streaming_discovery(self, on_complete: Optional[Callable[[], None]]) -> None:
+        """
+        Lanza la detección de cuentas en segundo plano, en dos fases.
+        
+        La fase rápida sólo lista las carpetas con Dota 2 y permite pintar
+        la lista de inmediato con nombres provisionales; después se
+        resuelven nombres y avatares y las filas visibles se actualizan a
+        medida que llegan.
+        
+        Args:
+            on_complete: Callback opcional al terminar la fase rápida
+        """
+        discovery_queue: queue.Queue = queue.Queue()
+        enrich_requests: queue.Queue = queue.Queue()
+        self._discovery_queue = discovery_queue
+        self._enrich_requests = enrich_requests
+        self._enrich_requested = set()
+        
+        def worker(service: Union[SteamAccountService, MultiRootAccountService]) -> None:
+            try:
+                accounts = service.list_accounts_with_dota2()
+                discovery_queue.put(("listed", accounts))
+                for account in service.enrich_accounts(accounts):
+                    discovery_queue.put(("enriched", account))
+            except Exception as e:
+                self.logger.error(f"Error detectando cuentas: {e}")
+            finally:
+                enrich_requests.put(None)
+                discovery_queue.put(None)  # Marca de fin
+        
+        def priority_worker(service: Union[SteamAccountService, MultiRootAccountService]) -> None:
+            # Resuelve antes que el lote las cuentas que la lista ya muestra
+            while True:
+                account = enrich_requests.get()
+                if account is None:
+                    return
+                try:
+                    service.enrich_account(account)
+                    discovery_queue.put(("enriched", account))
+                except Exception as e:
+                    self.logger.debug(f"Error resolviendo la cuenta {account.steamid}: {e}")
+        
+        threading.Thread(target=worker, args=(self.steam_service,),
+                         name="account-discovery", daemon=True).start()
+        threading.Thread(target=priority_worker, args=(self.steam_service,),
+                         name="account-enrich-visible", daemon=True).start()
+        self.root.after(DISCOVERY_DRAIN_MS, self._drain_discovered_accounts,
+                        discovery_queue, on_complete)
+    
+    def _request_enrichment(self, account: SteamAccount) -> None:
+        """
+        Adelanta la resolución de una cuenta visible sin bloquear el hilo de Tk.
+        
+        La cuenta se resuelve en el hilo de peticiones y su fila se
+        redibuja cuando el drenaje de la detección recibe el resultado.
+        
+        Args:
+            account: Cuenta aún provisional
+        """
+        if self._enrich_requests is None or self._discovery_queue is None:
+            return
+        if account.steamid in self._enrich_requested:
+            return
+        self._enrich_requested.add(account.steamid)
+        self._enrich_requests.put(account)
+    
+    def _drain_discovered_accounts(self, discovery_queue: queue.Queue,
+                                   on_complete: Optional[Callable[[], None]]) -> None:
+        """
+        Incorpora en el hilo de Tk los resultados que ya entregó la detección.
+        
+        Args:
+            discovery_queue: Cola de la detección en curso
+            on_complete: Callback opcional al terminar la fase rápida
+        """
+        # Una recarga posterior reemplaza la cola: descartar la detección anterior
+        if discovery_queue is not self._discovery_queue:
+            return
+        
+        enriched: List[SteamAccount] = []
+        finished = False
+        while True:
+            try:
+                item = discovery_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                finished = True
+                break
+            
+            kind, payload = item
+            if kind == "listed":
+                self._on_accounts_listed(payload, on_complete)
+            else:
+                enriched.append(payload)
+        
+        if enriched:
+            self._on_accounts_enriched(enriched)
+        
+        if finished:
+            self._discovery_queue = None
+            self._enrich_requests = None
+            self.logger.info("Nombres y avatares de las cuentas resueltos")
+        else:
+            self.root.after(DISCOVERY_DRAIN_MS, self._drain_discovered_accounts,
+                            discovery_queue, on_complete)
+    
+    def _on_accounts_listed(self, accounts: List[SteamAccount],
+                            on_complete: Optional[Callable[[], None]]) -> None:
+        """
+        Muestra las cuentas de la fase rápida de la detección.
+        
+        Args:
+            accounts: Cuentas listadas (con nombre provisional)
+            on_complete: Callback opcional al terminar la fase rápida
+        """
+        self.all_accounts = list(accounts)
+        self.available_accounts = self.filter_service.filter_available_accounts(
+            self.all_accounts, self.app_config.cuentas_ignoradas
+        )
+        if self.main_tab_widget:
+            self.main_tab_widget.append_accounts(self.available_accounts)
+        
+        self._on_discovery_finished(on_complete)
+    
+    def _on_accounts_enriched(self, accounts: List[SteamAccount]) -> None:
+        """
+        Redibuja las filas de las cuentas cuyos datos ya se resolvieron.
+        
+        Args:
+            accounts: Cuentas recién enriquecidas
+        """
+        if self.main_tab_widget:
+            self.main_tab_widget.refresh_accounts(accounts)
+        
+        ignored_ids = set(self.app_config.cuentas_ignoradas)
+        if self.ignored_tab_controller and any(a.steamid in ignored_ids for a in accounts):
+            self.ignored_tab_controller.set_ignored_accounts(self.ignored_accounts)
+        
+        if self.current_selection.origen in accounts or self.current_selection.destino in accounts:
+            self._update_ui_selection()
+    
+    def _on_discovery_finished(self, on_complete: Optional[Callable[[], None]]) -> None:
+        """
+        Completa la carga una vez listadas todas las cuentas.
+        
+        Args:
+            on_complete: Callback opcional al terminar la fase rápida
+        """
+        self.logger.info(f"Detección completada: {len(self.all_accounts)} cuentas")
+        
+        # Mantener la lista al día sin volver a escanear todas las carpetas
+        self._start_account_watcher()
+        
+        if not self.all_accounts:
+            MessageHelper.show_warning("Aviso", MESSAGES["no_accounts"])
+        else:
+            # La pestaña principal ya está al día; falta la de ignoradas
+            self.ignored_accounts = self.filter_service.filter_ignored_accounts(
+                self.all_accounts, self.app_config.cuentas_ignoradas
+            )
+            if self.ignored_tab_controller:
+                self.ignored_tab_controller.set_ignored_accounts(self.ignored_accounts)
+            
             self._restore_previous_selection()
+        
+        if on_complete:
+            on_complete()
+    
+    def _start_account_watcher(self) -> None:
+        """Inicia (o reinicia) la vigilancia de userdata y avatarcache."""
+        if self.account_watcher:
+            self.account_watcher.stop()
+        
+        # El vigilante sigue la instalación principal
+        self.account_watcher = AccountWatcher(self.steam_session.account_service)
+        self.account_watcher.start(self.all_accounts)
+        
+        if self._watch_job is None:
+            self._watch_job = self.root.after(ACCOUNT_WATCH_POLL_MS, self._poll_account_events)
+    
+    def _poll_account_events(self) -> None:
+        """Aplica en el hilo de Tk los cambios detectados por el vigilante."""
+        self._watch_job = None
+        
+        if self.account_watcher:
+            events = self.account_watcher.drain_events()
+            if events:
+                self._apply_account_events(events)
+        
+        self._watch_job = self.root.after(ACCOUNT_WATCH_POLL_MS, self._poll_account_events)
+    
+    def _apply_account_events(self, events: List[AccountChangeEvent]) -> None:
+        """
+        Actualiza incrementalmente las cuentas con eventos del vigilante.
+        
+        Args:
+            events: Altas, bajas y cambios detectados
+        """
+        self.all_accounts = AccountWatcher.apply_events(self.all_accounts, events)
+        
+        for event in events:
+            # El avatar pudo cambiar: forzar su recarga
+            if self.main_tab_widget:
+                self.main_tab_widget.avatar_manager.invalidate(event.steamid)
+            if self.ignored_tab_controller:
+                self.ignored_tab_controller.accounts_list.avatar_manager.invalidate(event.steamid)
+            
+            if event.kind == "removed" and event.account and \
+                    self.current_selection.has_account(event.account):
+                self.current_selection.clear()
+                self._on_selection_changed(self.current_selection)
+        
+        self._refresh_account_lists()
+        self.logger.info(f"Cambios de cuentas aplicados: {len(events)} eventos")
     
     def _load_saved_configuration(self) -> None:
         """Carga la configuración guardada previamente."""
@@ -510,6 +767,10 @@ class DotaTwinApp(LoggingMixin):
             MessageHelper.show_error("Error", "Selección inválida para copia")
             return
         
+        # La confirmación muestra los nombres reales aunque aún no se hayan resuelto
+        self.steam_service.enrich_account(self.current_selection.origen)
+        self.steam_service.enrich_account(self.current_selection.destino)
+        
         # Confirmar operación
         confirm = MessageHelper.ask_confirmation(
             "Confirmar",
@@ -529,28 +790,29 @@ class DotaTwinApp(LoggingMixin):
             backup_enabled=self.config_service.config.auto_backup
         )
         
-        # Validar operación
-        is_valid, error_msg = self.validation_service.validate_copy_operation(
-            copy_operation.origen, copy_operation.destino
-        )
+        # Validar y ejecutar la copia compartiendo las comprobaciones de rutas
+        with StatScope():
+            is_valid, error_msg = self.validation_service.validate_copy_operation(
+                copy_operation.origen, copy_operation.destino
+            )
+            
+            if is_valid:
+                with OperationContext("copy_configuration", self.logger):
+                    success, message = self.file_service.copy_configuration(copy_operation)
         
         if not is_valid:
             MessageHelper.show_error("Error de validación", error_msg)
             return
         
-        # Ejecutar copia
-        with OperationContext("copy_configuration", self.logger):
-            success, message = self.file_service.copy_configuration(copy_operation)
-            
-            if success:
-                MessageHelper.show_info("Éxito", MESSAGES["success_copy"], "success")
-                # Guardar selección exitosa
-                self.config_service.update_selection(
-                    self.current_selection.origen.steamid,
-                    self.current_selection.destino.steamid
-                )
-            else:
-                MessageHelper.show_error("Error", message)
+        if success:
+            MessageHelper.show_info("Éxito", MESSAGES["success_copy"], "success")
+            # Guardar selección exitosa
+            self.config_service.update_selection(
+                self.current_selection.origen.steamid,
+                self.current_selection.destino.steamid
+            )
+        else:
+            MessageHelper.show_error("Error", message)
         
         self.log_method_call("copy_configuration", 
                             success=success, message=message)
@@ -565,13 +827,13 @@ class DotaTwinApp(LoggingMixin):
     def _reload_accounts(self) -> None:
         """Recarga las cuentas de Steam."""
         with OperationContext("reload_accounts", self.logger):
-            # Reinicializar servicio de Steam
-            self.steam_service = SteamAccountService(self.app_config.custom_steam_path)
-            
-            # Recargar datos
-            self._load_initial_data()
+            # El servicio sólo cambia si la sesión resolvió otras instalaciones
+            self.steam_service = self.steam_session.discovery_service
             
-            MessageHelper.show_info("Cuentas recargadas", "Las cuentas de Steam han sido recargadas correctamente.")
+            # Recargar datos (el aviso se muestra al terminar la detección)
+            self._load_initial_data(on_complete=lambda: MessageHelper.show_info(
+                "Cuentas recargadas", "Las cuentas de Steam han sido recargadas correctamente."
+            ))
     
     def _configure_steam(self) -> None:
         """Abre el diálogo de configuración de Steam."""
@@ -657,6 +919,14 @@ Steam configurado en: {self.app_config.custom_steam_path or 'Detección automát
     
     def _cleanup_resources(self) -> None:
         """Limpia recursos antes del cierre."""
+        # Detener vigilancia de cuentas
+        if self._watch_job is not None:
+            self.root.after_cancel(self._watch_job)
+            self._watch_job = None
+        
+        if self.account_watcher:
+            self.account_watcher.stop()
+        
         # Limpiar caché de avatares
         if self.main_tab_widget:
             self.main_tab_widget.avatar_manager.clear_cache()
@@ -664,8 +934,9 @@ Steam configurado en: {self.app_config.custom_steam_path or 'Detección automát
         if self.ignored_tab_controller:
             self.ignored_tab_controller.accounts_list.avatar_manager.clear_cache()
         
-        # Limpiar backups antiguos
+        # Limpiar backups antiguos y esperar a que se eliminen los árboles apartados
         self.file_service.cleanup_old_backups()
+        self.file_service.wait_for_cleanup()
         
         self.logger.info("Recursos limpiados correctamente")
     
@@ -677,9 +948,17 @@ Steam configurado en: {self.app_config.custom_steam_path or 'Detección automát
         """
         Actualiza la lista de cuentas detectadas.
         
-        Método público para refrescar la detección de cuentas.
+        Método público para refrescar la detección de cuentas. Si la
+        vigilancia está activa sólo aplica los cambios pendientes; en otro
+        caso repite la detección completa.
         """
         with OperationContext("refresh_accounts", self.logger):
+            if self.account_watcher and self.account_watcher.is_running:
+                events = self.account_watcher.drain_events()
+                if events:
+                    self._apply_account_events(events)
+                return
+            
             self.all_accounts = self.steam_service.find_accounts_with_dota2()
             self._refresh_account_lists()
     
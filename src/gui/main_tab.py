@@ -100,6 +100,11 @@ class AccountRowWidget(LoggingMixin):
             self.on_ignore_account(self.account)
             self.log_method_call("ignore_account", account=self.account.steamid)
     
+    def refresh(self) -> None:
+        """Redibuja nombre y avatar tras enriquecer la cuenta."""
+        self.info_label.config(text=self.account.display_name)
+        self.avatar_label.config(image=self.avatar_manager.get_avatar(self.account))
+    
     def set_selection_state(self, selection: AppSelection) -> None:
         """
         Actualiza el estado visual basado en la selección actual.
@@ -261,6 +266,9 @@ class AccountListWidget(LoggingMixin):
         # Callbacks
         self.on_selection_changed: Optional[Callable[[AppSelection], None]] = None
         self.on_account_ignored: Optional[Callable[[SteamAccount], None]] = None
+        # Pide adelantar la resolución de las cuentas visibles aún provisionales
+        # (opcional; no debe bloquear: la fila se redibuja al llegar los datos)
+        self.account_enricher: Optional[Callable[[SteamAccount], None]] = None
         
         # Crear interfaz
         self._create_widgets()
@@ -361,6 +369,44 @@ class AccountListWidget(LoggingMixin):
         self._update_display()
         self.log_method_call("set_accounts", count=len(accounts))
     
+    def append_accounts(self, accounts: List[SteamAccount]) -> None:
+        """
+        Agrega cuentas al final de la lista sin redibujar las ya mostradas.
+        
+        Se usa durante la detección progresiva: sólo se crean widgets para
+        las cuentas nuevas que caben en la página actual; el resto sólo
+        actualiza los controles de paginación.
+        
+        Args:
+            accounts: Cuentas recién detectadas
+        """
+        if not accounts:
+            return
+        
+        self.accounts.extend(accounts)
+        self.pagination.total_items = len(self.accounts)
+        
+        page_items = self.pagination.get_page_items(self.accounts)
+        for account in page_items[len(self.current_accounts):]:
+            widget = self._create_account_widget(account)
+            self.account_widgets.append(widget)
+        self.current_accounts = page_items
+        
+        self.pagination_controls.update_pagination(self.pagination)
+        self.log_method_call("append_accounts", count=len(accounts))
+    
+    def refresh_accounts(self, accounts: List[SteamAccount]) -> None:
+        """
+        Redibuja las filas visibles de cuentas recién enriquecidas.
+        
+        Args:
+            accounts: Cuentas cuyos datos cambiaron
+        """
+        steamids = {account.steamid for account in accounts}
+        for widget in self.account_widgets:
+            if widget.account.steamid in steamids:
+                widget.refresh()
+    
     def set_selection(self, selection: AppSelection) -> None:
         """
         Establece la selección actual.
@@ -390,6 +436,9 @@ class AccountListWidget(LoggingMixin):
     
     def _create_account_widget(self, account: SteamAccount) -> AccountRowWidget:
         """Crea un widget para una cuenta específica."""
+        if self.account_enricher and not account.enriched:
+            self.account_enricher(account)
+        
         widget = AccountRowWidget(
             self.accounts_frame, 
             account, 
@@ -6,9 +6,14 @@ siguiendo el patrón Domain-Driven Design (DDD).
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, TYPE_CHECKING
 from pathlib import Path
 import json
+from ..utils.stat_cache import path_exists
+from config.settings import DEFAULT_COPY_PROFILE
+
+if TYPE_CHECKING:
+    from ..core.avatar_index import AvatarIndex
 
 
 @dataclass
@@ -23,6 +28,12 @@ class SteamAccount:
     nombre: str
     ruta: Path
     avatar: Optional[Path] = None
+    # Índice del caché de avatares con el que se resolvió la cuenta (opcional)
+    avatar_index: Optional["AvatarIndex"] = field(default=None, repr=False, compare=False)
+    # False mientras el nombre y el avatar no se han resuelto (detección rápida)
+    enriched: bool = field(default=True, compare=False)
+    # Instalación de Steam en la que se encontró la cuenta
+    steam_root: Optional[Path] = field(default=None, compare=False)
     
     @property
     def steamid64(self) -> str:
@@ -41,12 +52,23 @@ class SteamAccount:
     @property
     def has_avatar(self) -> bool:
         """Indica si la cuenta tiene un avatar válido."""
-        return self.avatar is not None and self.avatar.exists()
+        if self.avatar is None:
+            return False
+        if self.avatar_index is not None:
+            return self.avatar_index.contains(self.avatar)
+        return path_exists(self.avatar)
+    
+    @property
+    def avatar_stamp(self) -> Optional[Tuple[int, int]]:
+        """Huella (mtime_ns, tamaño) del avatar según el índice, si se conoce."""
+        if self.avatar is None or self.avatar_index is None:
+            return None
+        return self.avatar_index.stamp_for(self.avatar)
     
     @property
     def config_exists(self) -> bool:
         """Indica si existe la carpeta de configuración de Dota 2."""
-        return self.ruta.exists()
+        return path_exists(self.ruta)
     
     def __eq__(self, other) -> bool:
         """Compara cuentas por SteamID."""
@@ -250,6 +272,8 @@ class AppConfig:
     auto_backup: bool = True
     show_confirmations: bool = True
     custom_steam_path: str = ""  # Ruta personalizada de Steam
+    extra_steam_paths: List[str] = field(default_factory=list)  # Instalaciones adicionales
+    copy_profile: str = DEFAULT_COPY_PROFILE  # Perfil de COPY_PROFILES para copias y backups
     
     @classmethod
     def load_from_file(cls, file_path: Path) -> 'AppConfig':
@@ -309,7 +333,10 @@ class AppConfig:
             "items_por_pagina": self.items_por_pagina,
             "window_geometry": self.window_geometry,
             "auto_backup": self.auto_backup,
-            "show_confirmations": self.show_confirmations
+            "show_confirmations": self.show_confirmations,
+            "custom_steam_path": self.custom_steam_path,
+            "extra_steam_paths": self.extra_steam_paths.copy(),
+            "copy_profile": self.copy_profile
         }
     
     @staticmethod
@@ -339,6 +366,9 @@ class AppConfig:
         if "show_confirmations" not in data:
             data["show_confirmations"] = True
         
+        if "extra_steam_paths" not in data:
+            data["extra_steam_paths"] = []
+        
         return data
     
     def add_ignored_account(self, steamid: str) -> None:
@@ -376,7 +406,7 @@ class CopyOperation:
     def is_valid(self) -> bool:
         """Valida que la operación de copia sea posible."""
         return (self.origen.config_exists and 
-                self.destino.ruta.parent.exists() and
+                path_exists(self.destino.ruta.parent) and
                 self.origen != self.destino)
     
     @property
@@ -394,3 +424,61 @@ class CopyOperation:
         """Timestamp para identificar la operación."""
         from datetime import datetime
         return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+@dataclass
+class AccountHealthReport:
+    """
+    Resultado de validar la configuración de Dota 2 de una cuenta.
+    
+    Lo produce la validación en lote antes de copias masivas.
+    """
+    steamid: str
+    ruta: Path
+    exists: bool = False
+    is_empty: bool = True
+    size: int = 0
+    file_count: int = 0
+    unreadable: List[str] = field(default_factory=list)
+    
+    @property
+    def is_healthy(self) -> bool:
+        """Indica si la cuenta tiene una configuración utilizable."""
+        return self.exists and not self.is_empty and not self.unreadable
+    
+    @property
+    def summary(self) -> str:
+        """Resumen legible del estado de la cuenta."""
+        if not self.exists:
+            return "Sin carpeta de Dota 2"
+        if self.is_empty:
+            return "Carpeta de Dota 2 vacía"
+        text = f"{self.file_count} archivos, {self.size / 1024:.1f} KB"
+        if self.unreadable:
+            text += f", {len(self.unreadable)} entradas ilegibles"
+        return text
+
+
+@dataclass
+class BackupInfo:
+    """
+    Backup de la configuración de Dota 2 de una cuenta.
+    
+    format es "tree" para una copia completa de la carpeta, "store" para
+    un manifiesto del almacén deduplicado y "zip" para un archivo comprimido.
+    """
+    name: str
+    steamid: str
+    path: Path
+    created: float
+    format: str = "tree"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte el backup a diccionario."""
+        return {
+            "name": self.name,
+            "steamid": self.steamid,
+            "path": str(self.path),
+            "created": self.created,
+            "format": self.format,
+        }
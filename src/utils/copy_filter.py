@@ -0,0 +1,92 @@
+"""
+Filtro de archivos y carpetas para copias y backups.
+
+Un CopyFilter combina patrones de inclusión de archivos (CONFIG_PATTERNS)
+y de exclusión de carpetas (EXCLUDE_FOLDERS). Los patrones se compilan una
+sola vez en una expresión regular, de modo que decidir sobre cada entrada
+cuesta una búsqueda y no un fnmatch por patrón. Las carpetas excluidas se
+podan durante el recorrido: no se entra en ellas.
+
+Los patrones se comparan con el nombre de la entrada, sin distinguir
+mayúsculas (Steam corre sobre todo en Windows).
+"""
+
+import re
+import fnmatch
+from typing import Iterable, Optional, Pattern
+from config.settings import COPY_PROFILES, DEFAULT_COPY_PROFILE
+
+
+def _compile(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Une varios patrones glob en una sola expresión regular (None si no hay)."""
+    patterns = [pattern for pattern in patterns if pattern]
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns),
+                      re.IGNORECASE)
+
+
+class CopyFilter:
+    """
+    Decide qué archivos y carpetas entran en una copia.
+
+    Sin patrones de inclusión entran todos los archivos; sin patrones de
+    exclusión entran todas las carpetas.
+    """
+
+    def __init__(self, include: Iterable[str] = (), exclude_dirs: Iterable[str] = (),
+                 name: str = ""):
+        """
+        Inicializa el filtro.
+
+        Args:
+            include: Patrones glob de los archivos a copiar (ej. "*.cfg")
+            exclude_dirs: Patrones glob de las carpetas a omitir (ej. "cache")
+            name: Nombre del perfil del que procede (informativo)
+        """
+        self.include = tuple(include)
+        self.exclude_dirs = tuple(exclude_dirs)
+        self.name = name
+        self._include = _compile(self.include)
+        self._exclude = _compile(self.exclude_dirs)
+
+    @classmethod
+    def from_profile(cls, name: str = DEFAULT_COPY_PROFILE) -> "CopyFilter":
+        """
+        Crea el filtro de un perfil de COPY_PROFILES.
+
+        Args:
+            name: Nombre del perfil
+
+        Returns:
+            Filtro del perfil
+
+        Raises:
+            ValueError: Si el perfil no existe
+        """
+        profile = COPY_PROFILES.get(name)
+        if profile is None:
+            raise ValueError(f"Perfil de copia desconocido: {name} "
+                             f"(disponibles: {', '.join(COPY_PROFILES)})")
+        return cls(profile.get("include", ()), profile.get("exclude_dirs", ()), name)
+
+    @property
+    def is_everything(self) -> bool:
+        """Indica si el filtro deja pasar todo."""
+        return self._include is None and self._exclude is None
+
+    def includes_file(self, name: str) -> bool:
+        """Indica si un archivo con este nombre entra en la copia."""
+        return self._include is None or self._include.match(name) is not None
+
+    def includes_dir(self, name: str) -> bool:
+        """Indica si se debe entrar en una carpeta con este nombre."""
+        return self._exclude is None or self._exclude.match(name) is None
+
+    def includes(self, name: str, is_dir: bool) -> bool:
+        """Indica si una entrada entra en la copia."""
+        return self.includes_dir(name) if is_dir else self.includes_file(name)
+
+    def __repr__(self) -> str:
+        return (f"CopyFilter(name={self.name!r}, include={self.include!r}, "
+                f"exclude_dirs={self.exclude_dirs!r})")
@@ -0,0 +1,745 @@
+"""
+Utilidades de recorrido y sincronización del sistema de archivos.
+
+Recorridos basados en os.scandir, que obtiene el tipo de cada entrada con
+el propio listado del directorio y evita un stat por archivo en Windows.
+Las copias de muchos archivos pequeños se reparten entre varios hilos: su
+coste es sobre todo la latencia de abrir y cerrar cada archivo, no el
+ancho de banda.
+"""
+
+import os
+import time
+import uuid
+import shutil
+import filecmp
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path, PureWindowsPath
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from .copy_filter import CopyFilter
+from config.settings import COPY_MAX_WORKERS
+
+PathLike = Union[str, Path]
+CopyFunction = Callable[..., object]
+
+# Sufijos de las carpetas hermanas usadas al reemplazar un árbol
+STAGING_SUFFIX = ".dotatwin-staging"   # Copia en preparación
+RETIRED_SUFFIX = ".dotatwin-old"       # Árbol anterior apartado tras el cambio
+TEMP_FILE_SUFFIX = ".dotatwin-tmp"     # Archivo en escritura durante una sincronización
+
+
+@dataclass
+class TreeStats:
+    """
+    Resultado de recorrer un árbol de directorios.
+
+    Attributes:
+        size: Tamaño total de los archivos en bytes
+        file_count: Número de archivos
+        dir_count: Número de subdirectorios
+        unreadable: Rutas que no se pudieron leer
+    """
+    size: int = 0
+    file_count: int = 0
+    dir_count: int = 0
+    unreadable: List[str] = field(default_factory=list)
+
+
+def walk_tree(root: PathLike) -> TreeStats:
+    """
+    Recorre un árbol con scandir acumulando tamaño y número de archivos.
+
+    Los directorios o archivos que no se pueden leer no interrumpen el
+    recorrido: se anotan en TreeStats.unreadable.
+
+    Args:
+        root: Directorio raíz
+
+    Returns:
+        Estadísticas del árbol
+    """
+    stats = TreeStats()
+    pending = [os.fspath(root)]
+
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stats.dir_count += 1
+                            pending.append(entry.path)
+                        else:
+                            stats.size += entry.stat(follow_symlinks=False).st_size
+                            stats.file_count += 1
+                    except OSError:
+                        stats.unreadable.append(entry.path)
+        except OSError:
+            stats.unreadable.append(current)
+
+    return stats
+
+
+@dataclass
+class SyncStats:
+    """
+    Resultado de sincronizar un árbol de directorios.
+
+    Attributes:
+        copied: Archivos nuevos copiados
+        updated: Archivos existentes reescritos por haber cambiado
+        deleted: Archivos o carpetas del destino eliminados por sobrar
+        unchanged: Archivos que ya eran iguales y no se tocaron
+        bytes_written: Bytes de datos escritos en el destino
+    """
+    copied: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    bytes_written: int = 0
+
+    @property
+    def files_written(self) -> int:
+        """Número de archivos cuyo contenido se escribió."""
+        return self.copied + self.updated
+
+
+@dataclass
+class CopyProgress:
+    """
+    Avance de una copia de archivos.
+
+    Attributes:
+        files_done: Archivos copiados
+        files_total: Archivos a copiar
+        bytes_done: Bytes copiados
+        bytes_total: Bytes a copiar
+        elapsed: Segundos desde que empezó la copia
+    """
+    files_done: int = 0
+    files_total: int = 0
+    bytes_done: int = 0
+    bytes_total: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def fraction(self) -> float:
+        """Fracción completada (por bytes, o por archivos si no hay bytes)."""
+        if self.bytes_total:
+            return self.bytes_done / self.bytes_total
+        return self.files_done / self.files_total if self.files_total else 1.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes por segundo desde el inicio."""
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Segundos estimados hasta terminar (None si aún no se puede estimar)."""
+        if not self.throughput:
+            return None
+        return (self.bytes_total - self.bytes_done) / self.throughput
+
+
+ProgressCallback = Callable[[CopyProgress], None]
+
+
+class CopyCancelled(Exception):
+    """La copia se canceló antes de terminar."""
+
+
+class CancellationToken:
+    """
+    Señal para cancelar una copia desde otro hilo.
+
+    La copia la consulta antes de cada archivo; cancelar no interrumpe el
+    archivo en curso.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Pide que la copia se detenga."""
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Indica si se pidió cancelar."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Lanza CopyCancelled si se pidió cancelar."""
+        if self._event.is_set():
+            raise CopyCancelled("Copia cancelada")
+
+
+class CopyMonitor:
+    """
+    Une el aviso de progreso y la cancelación de una copia.
+
+    Las funciones de copia llaman a start() con el total previsto, a
+    check() antes de cada archivo y a advance() después. El callback se
+    invoca desde los hilos de copia: si actualiza una interfaz, debe pasar
+    el aviso a su propio hilo.
+    """
+
+    def __init__(self, callback: Optional[ProgressCallback] = None,
+                 token: Optional[CancellationToken] = None):
+        """
+        Inicializa el monitor.
+
+        Args:
+            callback: Función que recibe cada CopyProgress (opcional)
+            token: Token de cancelación (opcional)
+        """
+        self.callback = callback
+        self.token = token
+        self.progress = CopyProgress()
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def start(self, files_total: int, bytes_total: int) -> None:
+        """Fija el total previsto y notifica el avance inicial."""
+        with self._lock:
+            self._started = time.monotonic()
+            self.progress = CopyProgress(files_total=files_total, bytes_total=bytes_total)
+            snapshot = replace(self.progress)
+        self._notify(snapshot)
+
+    def check(self) -> None:
+        """Lanza CopyCancelled si se pidió cancelar."""
+        if self.token is not None:
+            self.token.raise_if_cancelled()
+
+    def advance(self, size: int) -> None:
+        """Anota un archivo copiado y notifica el avance."""
+        with self._lock:
+            self.progress.files_done += 1
+            self.progress.bytes_done += size
+            self.progress.elapsed = time.monotonic() - self._started
+            snapshot = replace(self.progress)
+        self._notify(snapshot)
+
+    def _notify(self, snapshot: CopyProgress) -> None:
+        """Invoca el callback con una copia del avance."""
+        if self.callback is not None:
+            self.callback(snapshot)
+
+
+def _same_file(source: os.DirEntry, target: os.DirEntry, compare_content: bool) -> bool:
+    """
+    Decide si un archivo del destino ya coincide con el del origen.
+
+    Con el mismo tamaño y mtime se considera igual; con compare_content
+    además se compara el contenido, y un archivo con distinto mtime pero
+    el mismo contenido también cuenta como igual.
+    """
+    source_stat = source.stat(follow_symlinks=False)
+    target_stat = target.stat(follow_symlinks=False)
+    if source_stat.st_size != target_stat.st_size:
+        return False
+    if not compare_content:
+        return source_stat.st_mtime_ns == target_stat.st_mtime_ns
+    return filecmp.cmp(source.path, target.path, shallow=False)
+
+
+def check_relative_path(relative: str) -> str:
+    """
+    Comprueba que una ruta relativa no salga de la carpeta a la que se une.
+
+    Args:
+        relative: Ruta relativa con "/" (tal como la guardan los backups)
+
+    Returns:
+        La misma ruta
+
+    Raises:
+        OSError: Si está vacía, es absoluta (también con unidad de Windows) o contiene ".."
+    """
+    parts = relative.replace("\\", "/").split("/")
+    if not relative or parts[0] == "" or ".." in parts or PureWindowsPath(relative).drive:
+        raise OSError(f"Ruta no permitida en el backup: {relative}")
+    return relative
+
+
+def _copy_file_atomic(source: str, target: str, copy_function: Optional[CopyFunction]) -> None:
+    """
+    Copia un archivo sin dejar nunca el destino a medio escribir.
+
+    Escribe en un temporal junto al destino y lo renombra encima.
+    """
+    temp_path = target + TEMP_FILE_SUFFIX
+    try:
+        (copy_function or shutil.copy2)(source, temp_path, follow_symlinks=False)
+        os.replace(temp_path, target)
+    except OSError:
+        if os.path.lexists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def _run_copies(jobs: Sequence[Tuple[str, str, int]], copy: Callable[[str, str], object],
+                max_workers: int, monitor: Optional[CopyMonitor] = None
+                ) -> List[Tuple[str, str, str]]:
+    """
+    Copia una lista de archivos repartiéndola entre varios hilos.
+
+    Un fallo no detiene el resto de copias. Los errores se devuelven en el
+    orden de jobs, no en el que terminaron los hilos, para que el resultado
+    sea el mismo en cada ejecución. Si se cancela, los archivos pendientes
+    no se copian.
+
+    Args:
+        jobs: Tuplas (origen, destino, tamaño)
+        copy: Función que copia un archivo
+        max_workers: Número máximo de hilos (1 copia en el hilo actual)
+        monitor: Progreso y cancelación (opcional)
+
+    Returns:
+        Errores como en shutil.Error: (origen, destino, mensaje)
+
+    Raises:
+        CopyCancelled: Si se canceló antes de copiar todos los archivos
+    """
+    cancelled = threading.Event()
+
+    def run(job: Tuple[str, str, int]) -> Optional[Tuple[str, str, str]]:
+        if cancelled.is_set():
+            return None
+        if monitor is not None:
+            try:
+                monitor.check()
+            except CopyCancelled:
+                cancelled.set()
+                return None
+        try:
+            copy(job[0], job[1])
+        except OSError as e:
+            return (job[0], job[1], str(e))
+        if monitor is not None:
+            monitor.advance(job[2])
+        return None
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        errors = [error for error in map(run, jobs) if error is not None]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)),
+                                thread_name_prefix="file-copy") as executor:
+            errors = [error for error in executor.map(run, jobs) if error is not None]
+
+    if cancelled.is_set():
+        raise CopyCancelled("Copia cancelada")
+    return errors
+
+
+def parallel_copytree(source: PathLike, target: PathLike,
+                      copy_function: Optional[CopyFunction] = None,
+                      max_workers: int = COPY_MAX_WORKERS,
+                      monitor: Optional[CopyMonitor] = None,
+                      copy_filter: Optional[CopyFilter] = None) -> Path:
+    """
+    Copia un árbol como shutil.copytree, con los archivos en paralelo.
+
+    Primero se crean todas las carpetas y después se copian los archivos
+    con un grupo limitado de hilos. Al final se copian los metadatos de las
+    carpetas, de la más profunda a la raíz, para que escribir archivos no
+    altere su mtime. Las carpetas que excluye el filtro no se recorren.
+
+    Args:
+        source: Carpeta origen
+        target: Carpeta destino (no debe existir)
+        copy_function: Función con la firma de shutil.copy2 (por defecto ésa)
+        max_workers: Número máximo de hilos
+        monitor: Progreso y cancelación (opcional)
+        copy_filter: Archivos y carpetas a copiar (por defecto todos)
+
+    Returns:
+        Carpeta destino
+
+    Raises:
+        FileExistsError: Si target ya existe
+        shutil.Error: Con todos los archivos que no se pudieron copiar
+        CopyCancelled: Si se canceló (target queda a medias)
+    """
+    source, target = os.fspath(source), os.fspath(target)
+    copy_function = copy_function or shutil.copy2
+    dirs: List[Tuple[str, str]] = [(source, target)]
+    jobs: List[Tuple[str, str, int]] = []
+
+    index = 0
+    while index < len(dirs):
+        source_dir, target_dir = dirs[index]
+        index += 1
+        with os.scandir(source_dir) as entries:
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                target_path = os.path.join(target_dir, entry.name)
+                is_dir = entry.is_dir()
+                if copy_filter is not None and not copy_filter.includes(entry.name, is_dir):
+                    continue
+                if is_dir:
+                    dirs.append((entry.path, target_path))
+                else:
+                    jobs.append((entry.path, target_path, entry.stat().st_size))
+
+    if monitor is not None:
+        monitor.start(len(jobs), sum(job[2] for job in jobs))
+
+    os.makedirs(target)
+    for _, target_dir in dirs[1:]:
+        os.mkdir(target_dir)
+
+    errors = _run_copies(jobs, copy_function, max_workers, monitor)
+
+    for source_dir, target_dir in reversed(dirs):
+        try:
+            shutil.copystat(source_dir, target_dir)
+        except OSError as e:
+            errors.append((source_dir, target_dir, str(e)))
+
+    if errors:
+        raise shutil.Error(errors)
+    return Path(target)
+
+
+def _scan_dir(path: str) -> Dict[str, os.DirEntry]:
+    """Lista un directorio indexando las entradas por nombre (vacío si no existe)."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name: entry for entry in entries}
+    except FileNotFoundError:
+        return {}
+
+
+@dataclass
+class _SyncPlan:
+    """Cambios que necesita una sincronización, calculados sin tocar el destino."""
+    # Entradas del destino que sobran o tienen otro tipo
+    deletions: List[str] = field(default_factory=list)
+    # Carpetas nuevas; las que ocupa ahora un archivo se crean tras borrarlo
+    new_dirs: List[str] = field(default_factory=list)
+    blocked_dirs: List[str] = field(default_factory=list)
+    # (origen, destino, tamaño, ya existía); las bloqueadas van bajo blocked_dirs
+    copies: List[Tuple[str, str, int, bool]] = field(default_factory=list)
+    blocked_copies: List[Tuple[str, str, int, bool]] = field(default_factory=list)
+    # Archivos iguales cuyo mtime hay que alinear
+    restats: List[Tuple[str, str]] = field(default_factory=list)
+    # Temporales que dejó una sincronización cortada (se eliminan siempre)
+    stale_temps: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def _is_included(entry: os.DirEntry, copy_filter: Optional[CopyFilter]) -> bool:
+    """Indica si el filtro deja pasar una entrada."""
+    return copy_filter is None or copy_filter.includes(
+        entry.name, entry.is_dir(follow_symlinks=False))
+
+
+def _find_temps(path: str) -> List[str]:
+    """Temporales de sincronización que quedan dentro de una carpeta."""
+    return [os.path.join(root, name) for root, _, files in os.walk(path)
+            for name in files if name.endswith(TEMP_FILE_SUFFIX)]
+
+
+def _plan_sync(source: str, target: str, compare_content: bool,
+               copy_filter: Optional[CopyFilter] = None) -> _SyncPlan:
+    """
+    Recorre origen y destino y calcula qué hay que cambiar.
+
+    Lo que excluye el filtro no se recorre en el origen y se deja tal cual
+    en el destino (salvo que choque con una entrada incluida del origen).
+    Los temporales de una sincronización cortada se eliminan aunque el
+    filtro los excluya, también dentro de las carpetas excluidas.
+    """
+    plan = _SyncPlan()
+    # (carpeta origen, carpeta destino, bajo una carpeta que aún ocupa un archivo)
+    pending = [(source, target, False)]
+    if not os.path.isdir(target):
+        plan.new_dirs.append(target)
+
+    while pending:
+        source_dir, target_dir, blocked = pending.pop()
+        source_entries = {name: entry for name, entry in _scan_dir(source_dir).items()
+                          if _is_included(entry, copy_filter)}
+        target_entries = {}
+        for name, entry in ({} if blocked else _scan_dir(target_dir)).items():
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if name.endswith(TEMP_FILE_SUFFIX) and not is_dir:
+                plan.stale_temps.append(entry.path)
+            elif name in source_entries or _is_included(entry, copy_filter):
+                target_entries[name] = entry
+            elif is_dir:
+                plan.stale_temps.extend(_find_temps(entry.path))
+
+        for name, entry in target_entries.items():
+            if name not in source_entries:
+                plan.deletions.append(entry.path)
+
+        for name, entry in source_entries.items():
+            target_path = os.path.join(target_dir, name)
+            existing = target_entries.get(name)
+
+            if entry.is_dir(follow_symlinks=False):
+                child_blocked = blocked
+                if existing is None:
+                    (plan.blocked_dirs if blocked else plan.new_dirs).append(target_path)
+                elif not existing.is_dir(follow_symlinks=False):
+                    plan.deletions.append(existing.path)
+                    plan.blocked_dirs.append(target_path)
+                    child_blocked = True
+                pending.append((entry.path, target_path, child_blocked))
+                continue
+
+            if existing is not None:
+                if existing.is_dir(follow_symlinks=False):
+                    plan.deletions.append(existing.path)
+                    existing = None
+                elif _same_file(entry, existing, compare_content):
+                    if entry.stat().st_mtime_ns != existing.stat().st_mtime_ns:
+                        # Mismo contenido: basta con alinear los metadatos
+                        plan.restats.append((entry.path, target_path))
+                    plan.unchanged += 1
+                    continue
+
+            job = (entry.path, target_path, entry.stat(follow_symlinks=False).st_size,
+                   existing is not None)
+            (plan.blocked_copies if blocked else plan.copies).append(job)
+
+    return plan
+
+
+def _delete_path(path: str) -> None:
+    """Elimina un archivo o una carpeta completa."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+
+def sync_tree(source: PathLike, target: PathLike, compare_content: bool = False,
+              copy_function: Optional[CopyFunction] = None,
+              max_workers: int = COPY_MAX_WORKERS,
+              monitor: Optional[CopyMonitor] = None,
+              copy_filter: Optional[CopyFilter] = None) -> SyncStats:
+    """
+    Sincroniza target con source escribiendo sólo lo que cambió.
+
+    Los archivos se comparan por tamaño y mtime (y por contenido si se
+    pide); sólo se copian los nuevos o modificados y sólo se eliminan las
+    entradas del destino que no existen en el origen. Los archivos copiados
+    conservan el mtime del origen (shutil.copy2), de modo que una segunda
+    sincronización no escribe nada.
+
+    La sincronización tiene dos fases. Primero se copian los archivos
+    nuevos o modificados a temporales junto a su destino, con varios hilos;
+    es la fase lenta y la única que se puede cancelar. Después se renombran
+    los temporales encima y se eliminan las entradas sobrantes. Si la
+    primera fase falla o se cancela, se descartan los temporales y las
+    carpetas nuevas y el destino queda como estaba. Si falla la segunda,
+    el destino puede quedar a medio actualizar, pero sin temporales.
+
+    Con un filtro sólo se sincroniza lo que deja pasar: lo excluido no se
+    copia del origen ni se elimina del destino.
+
+    Args:
+        source: Carpeta origen
+        target: Carpeta destino (se crea si no existe)
+        compare_content: Compara también el contenido de los archivos
+        copy_function: Función con la firma de shutil.copy2 (por defecto ésa)
+        max_workers: Número máximo de hilos para copiar archivos
+        monitor: Progreso y cancelación (opcional)
+        copy_filter: Archivos y carpetas a sincronizar (por defecto todos)
+
+    Returns:
+        Estadísticas de la sincronización
+
+    Raises:
+        shutil.Error: Con todos los archivos que no se pudieron copiar
+        CopyCancelled: Si se canceló durante la copia
+        OSError: Si no se puede leer el origen o escribir el destino
+    """
+    copy_function = copy_function or shutil.copy2
+    plan = _plan_sync(os.fspath(source), os.fspath(target), compare_content, copy_filter)
+    if monitor is not None:
+        jobs = plan.copies + plan.blocked_copies
+        monitor.start(len(jobs), sum(job[2] for job in jobs))
+        monitor.check()
+
+    # Fase 1: copiar a temporales (cancelable, reversible)
+    temp_paths = [job[1] + TEMP_FILE_SUFFIX for job in plan.copies]
+    created: List[str] = []
+    try:
+        for path in plan.new_dirs:
+            os.makedirs(path)
+            created.append(path)
+
+        def copy_to_temp(src: str, dst: str) -> None:
+            copy_function(src, dst + TEMP_FILE_SUFFIX, follow_symlinks=False)
+
+        errors = _run_copies([job[:3] for job in plan.copies], copy_to_temp,
+                             max_workers, monitor)
+        if errors:
+            raise shutil.Error(errors)
+        if monitor is not None:
+            monitor.check()
+    except BaseException:
+        _discard_staged(temp_paths, created)
+        raise
+
+    # Fase 2: aplicar los cambios (renombrados y borrados, rápida)
+    stats = SyncStats(unchanged=plan.unchanged)
+    staged = set(temp_paths)
+    try:
+        for path in plan.stale_temps:
+            # Los que coinciden con un temporal nuevo ya se reescribieron
+            if path not in staged and os.path.lexists(path):
+                os.unlink(path)
+        for path in plan.deletions:
+            _delete_path(path)
+            stats.deleted += 1
+        for path in plan.blocked_dirs:
+            os.makedirs(path, exist_ok=True)
+        for _, dst, _, _ in plan.copies:
+            os.replace(dst + TEMP_FILE_SUFFIX, dst)
+        for src, dst, size, _ in plan.blocked_copies:
+            _copy_file_atomic(src, dst, copy_function)
+            if monitor is not None:
+                monitor.advance(size)
+        for src, dst in plan.restats:
+            shutil.copystat(src, dst)
+    except BaseException:
+        # Los temporales ya renombrados no existen: sólo quedan los pendientes
+        _discard_staged(temp_paths, [])
+        raise
+
+    for _, _, size, existed in plan.copies + plan.blocked_copies:
+        stats.bytes_written += size
+        if existed:
+            stats.updated += 1
+        else:
+            stats.copied += 1
+    return stats
+
+
+def _discard_staged(temp_paths: List[str], created_dirs: List[str]) -> None:
+    """Deshace la primera fase de sync_tree: temporales y carpetas nuevas."""
+    for temp_path in temp_paths:
+        if os.path.lexists(temp_path):
+            os.unlink(temp_path)
+    for path in reversed(created_dirs):
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _retired_trees(target: Path) -> List[Path]:
+    """Árboles anteriores apartados junto a target, del más reciente al más antiguo."""
+    try:
+        candidates = [path for path in target.parent.iterdir()
+                      if path.name.startswith(target.name + RETIRED_SUFFIX)]
+    except OSError:
+        return []
+    return sorted(candidates, key=lambda path: path.stat().st_mtime_ns, reverse=True)
+
+
+def swap_in_tree(target: PathLike, build: Callable[[Path], object]) -> Optional[Path]:
+    """
+    Reemplaza target por un árbol construido aparte, mediante renombrados.
+
+    El árbol se construye en una carpeta hermana de preparación; sólo
+    cuando está completo se aparta el árbol actual y se renombra el nuevo
+    en su lugar. Si la construcción falla o se cancela, target queda intacto. El árbol
+    anterior no se elimina: se devuelve para que el llamador lo use como
+    backup o lo elimine más tarde.
+
+    Args:
+        target: Carpeta a reemplazar (puede no existir)
+        build: Función que crea y rellena la carpeta que recibe (aún no existe)
+
+    Returns:
+        Ruta del árbol anterior apartado, o None si target no existía
+
+    Raises:
+        OSError: Si falla la construcción o alguno de los renombrados
+    """
+    target = Path(target)
+    staging = target.with_name(target.name + STAGING_SUFFIX)
+    if os.path.lexists(staging):
+        shutil.rmtree(staging)
+
+    try:
+        build(staging)
+    except (OSError, shutil.Error, CopyCancelled):
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    retired = None
+    if os.path.lexists(target):
+        retired = target.with_name(f"{target.name}{RETIRED_SUFFIX}-{uuid.uuid4().hex[:8]}")
+        os.rename(target, retired)
+
+    try:
+        os.rename(staging, target)
+    except OSError:
+        # Dejar todo como estaba
+        if retired is not None:
+            os.rename(retired, target)
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return retired
+
+
+def swap_in_copy(source: PathLike, target: PathLike,
+                 copy_function: Optional[CopyFunction] = None,
+                 max_workers: int = COPY_MAX_WORKERS,
+                 monitor: Optional[CopyMonitor] = None,
+                 copy_filter: Optional[CopyFilter] = None) -> Optional[Path]:
+    """
+    Reemplaza target por una copia de source mediante renombrados.
+
+    Es swap_in_tree con una copia de source (parallel_copytree) como árbol nuevo.
+
+    Args:
+        source: Carpeta origen
+        target: Carpeta a reemplazar (puede no existir)
+        copy_function: Función con la firma de shutil.copy2 (por defecto ésa)
+        max_workers: Número máximo de hilos para copiar archivos
+        monitor: Progreso y cancelación (opcional)
+        copy_filter: Archivos y carpetas a copiar (por defecto todos)
+
+    Returns:
+        Ruta del árbol anterior apartado, o None si target no existía
+
+    Raises:
+        OSError: Si falla la copia o alguno de los renombrados
+        CopyCancelled: Si se canceló (target queda intacto)
+    """
+    return swap_in_tree(target, lambda staging: parallel_copytree(
+        source, staging, copy_function, max_workers, monitor, copy_filter
+    ))
+
+
+def recover_interrupted_swap(target: PathLike) -> None:
+    """
+    Repara lo que haya dejado un swap_in_copy interrumpido sobre target.
+
+    Si target falta pero hay un árbol apartado, se devuelve a su sitio (la
+    copia en preparación pudo quedar incompleta). Después se eliminan la
+    carpeta de preparación y los árboles apartados que sobren.
+
+    Args:
+        target: Carpeta reemplazada por swap_in_copy
+    """
+    target = Path(target)
+    retired = _retired_trees(target)
+
+    if retired and not os.path.lexists(target):
+        os.rename(retired.pop(0), target)
+
+    staging = target.with_name(target.name + STAGING_SUFFIX)
+    for leftover in [staging] + retired:
+        if os.path.lexists(leftover):
+            shutil.rmtree(leftover, ignore_errors=True)
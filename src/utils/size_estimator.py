@@ -0,0 +1,156 @@
+"""
+Estimación rápida del tamaño de un árbol con caché por carpeta.
+
+El tamaño de una carpeta de configuración se consulta varias veces (antes
+de copiar, antes de respaldar, al comprobar el espacio libre) y casi nunca
+cambia entre consultas. SizeEstimator recorre el árbol con os.scandir,
+usando el stat que ya trae cada entrada, y recuerda para cada carpeta su
+mtime, el total de sus archivos y sus subcarpetas. En la siguiente
+consulta, una carpeta cuyo mtime no cambió no se vuelve a listar: basta un
+stat de la carpeta.
+
+El mtime de una carpeta cambia al crear, borrar o renombrar entradas, pero
+no al reescribir un archivo en el sitio; una edición de ese tipo no se ve
+hasta que cambie la carpeta. Es una estimación, no un inventario.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from .copy_filter import CopyFilter
+from .fs_utils import PathLike, TreeStats
+from config.settings import SIZE_ESTIMATE_MAX_WORKERS
+
+
+@dataclass
+class _DirSummary:
+    """Contenido directo de una carpeta tal como estaba en mtime_ns."""
+    mtime_ns: int
+    size: int
+    file_count: int
+    subdirs: List[str]
+
+
+class SizeEstimator:
+    """
+    Calcula tamaño y número de archivos de un árbol, con caché por carpeta.
+
+    Es seguro usarlo desde varios hilos.
+    """
+
+    def __init__(self, copy_filter: Optional[CopyFilter] = None,
+                 max_workers: int = SIZE_ESTIMATE_MAX_WORKERS):
+        """
+        Inicializa el estimador.
+
+        Args:
+            copy_filter: Sólo cuenta lo que deja pasar el filtro (por defecto todo)
+            max_workers: Hilos para listar carpetas en paralelo (1 = secuencial)
+        """
+        self.copy_filter = copy_filter
+        self.max_workers = max_workers
+        self._cache: Dict[str, _DirSummary] = {}
+        self._lock = threading.Lock()
+        # Carpetas listadas en la última estimación (las demás vinieron de la caché)
+        self.last_scanned = 0
+
+    def estimate(self, root: PathLike) -> TreeStats:
+        """
+        Estima el tamaño de un árbol.
+
+        El árbol se recorre por niveles; con varios hilos, las carpetas de
+        cada nivel se listan en paralelo.
+
+        Args:
+            root: Carpeta raíz
+
+        Returns:
+            Tamaño, archivos y carpetas (las ilegibles van en unreadable)
+        """
+        stats = TreeStats()
+        frontier = [os.fspath(root)]
+        self.last_scanned = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers),
+                                thread_name_prefix="size-estimate") as executor:
+            while frontier:
+                if self.max_workers > 1 and len(frontier) > 1:
+                    results = list(executor.map(self._summarize, frontier))
+                else:
+                    results = [self._summarize(path) for path in frontier]
+                frontier = self._collect(frontier, results, stats)
+
+        return stats
+
+    def invalidate(self, root: Optional[PathLike] = None) -> None:
+        """
+        Olvida lo que hay en caché.
+
+        Args:
+            root: Sólo esta carpeta y lo que cuelga de ella (por defecto todo)
+        """
+        with self._lock:
+            if root is None:
+                self._cache.clear()
+                return
+            prefix = os.fspath(root)
+            for path in [path for path in self._cache
+                         if path == prefix or path.startswith(prefix + os.sep)]:
+                del self._cache[path]
+
+    def _collect(self, paths: List[str], results: List[Tuple[Optional[_DirSummary], bool]],
+                 stats: TreeStats) -> List[str]:
+        """Acumula los resúmenes de un nivel y devuelve las carpetas del siguiente."""
+        frontier = []
+        for path, (summary, scanned) in zip(paths, results):
+            self.last_scanned += scanned
+            if summary is None:
+                stats.unreadable.append(path)
+                continue
+            stats.size += summary.size
+            stats.file_count += summary.file_count
+            stats.dir_count += len(summary.subdirs)
+            frontier.extend(summary.subdirs)
+        return frontier
+
+    def _summarize(self, path: str) -> Tuple[Optional[_DirSummary], bool]:
+        """
+        Resume el contenido directo de una carpeta, desde la caché si sigue al día.
+
+        Returns:
+            Tupla (resumen o None si no se pudo leer, si hubo que listarla)
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None, False
+
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            return cached, False
+
+        summary = _DirSummary(mtime_ns, 0, 0, [])
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if self.copy_filter is not None and \
+                                not self.copy_filter.includes(entry.name, is_dir):
+                            continue
+                        if is_dir:
+                            summary.subdirs.append(entry.path)
+                        else:
+                            summary.size += entry.stat(follow_symlinks=False).st_size
+                            summary.file_count += 1
+                    except OSError:
+                        continue
+        except OSError:
+            return None, True
+
+        with self._lock:
+            self._cache[path] = summary
+        return summary, True
@@ -0,0 +1,251 @@
+"""
+Caché de metadatos del sistema de archivos.
+
+Durante un escaneo de cuentas o una operación de copia, la misma ruta se
+comprueba varias veces (existencia de la carpeta de Dota 2, validaciones
+de la copia, avatar...). En discos mecánicos y perfiles redirigidos por
+SMB cada comprobación es costosa, así que este módulo permite compartir
+los resultados de stat() dentro de un ámbito (StatScope) con un tiempo de
+validez y con invalidación explícita tras copiar o eliminar.
+
+Fuera de un ámbito activo las funciones consultan el disco directamente.
+El ámbito pertenece a la operación que lo abre (contexto del hilo o de la
+tarea); los hilos de un pool sólo lo usan si se les pasa con
+bind_stat_cache.
+"""
+
+import os
+import stat
+import time
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, TypeVar, Union
+from config.settings import STAT_CACHE_TTL
+
+PathLike = Union[str, Path]
+T = TypeVar("T")
+
+
+class StatCache:
+    """
+    Caché de stat() y de "carpeta no vacía" con tiempo de validez.
+
+    Es seguro usarla desde varios hilos (por ejemplo, el pool de detección).
+    """
+
+    def __init__(self, ttl: float = STAT_CACHE_TTL):
+        """
+        Inicializa la caché.
+
+        Args:
+            ttl: Segundos de validez de cada entrada
+        """
+        self.ttl = ttl
+        self._stats: Dict[str, Tuple[float, Optional[os.stat_result]]] = {}
+        self._listings: Dict[str, Tuple[float, bool]] = {}
+        self._lock = threading.Lock()
+        # Aumenta con cada invalidación; una consulta iniciada antes no guarda su resultado
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stat(self, path: PathLike) -> Optional[os.stat_result]:
+        """
+        Obtiene el stat de una ruta, reutilizando el resultado si está vigente.
+
+        Args:
+            path: Ruta a consultar
+
+        Returns:
+            Resultado de os.stat o None si la ruta no existe
+        """
+        key = os.fspath(path)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            generation = self._generation
+
+        try:
+            result: Optional[os.stat_result] = os.stat(key)
+        except OSError:
+            result = None
+
+        with self._lock:
+            if generation == self._generation:
+                self._stats[key] = (now, result)
+            self.misses += 1
+        return result
+
+    def exists(self, path: PathLike) -> bool:
+        """Indica si la ruta existe."""
+        return self.stat(path) is not None
+
+    def is_dir(self, path: PathLike) -> bool:
+        """Indica si la ruta es un directorio."""
+        result = self.stat(path)
+        return result is not None and stat.S_ISDIR(result.st_mode)
+
+    def has_entries(self, path: PathLike) -> bool:
+        """
+        Indica si un directorio contiene al menos una entrada.
+
+        Sólo lee la primera entrada del directorio en lugar de listarlo
+        entero.
+
+        Args:
+            path: Directorio a consultar
+
+        Returns:
+            True si el directorio existe y no está vacío
+        """
+        key = os.fspath(path)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._listings.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            generation = self._generation
+
+        result = _first_entry_exists(key)
+
+        with self._lock:
+            if generation == self._generation:
+                self._listings[key] = (now, result)
+            self.misses += 1
+        return result
+
+    def invalidate(self, path: PathLike) -> None:
+        """
+        Descarta las entradas de una ruta, de su contenido y de su carpeta padre.
+
+        Debe llamarse después de copiar, crear o eliminar en esa ruta.
+
+        Args:
+            path: Ruta modificada
+        """
+        key = os.fspath(path).rstrip("\\/")
+        prefixes = (key + os.sep, key + "/")
+        parent = os.path.dirname(key)
+
+        with self._lock:
+            self._generation += 1
+            for entries in (self._stats, self._listings):
+                stale = [k for k in entries
+                         if k == key or k == parent or k.startswith(prefixes)]
+                for k in stale:
+                    del entries[k]
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        with self._lock:
+            self._generation += 1
+            self._stats.clear()
+            self._listings.clear()
+
+
+def _first_entry_exists(path: str) -> bool:
+    """Comprueba si un directorio tiene alguna entrada sin listarlo completo."""
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except OSError:
+        return False
+
+
+# Caché del ámbito activo en el contexto actual (cada operación tiene el suyo)
+_active_cache: ContextVar[Optional[StatCache]] = ContextVar("stat_cache", default=None)
+
+
+class StatScope:
+    """
+    Context manager que activa una caché de stat para un escaneo u operación.
+
+    Los ámbitos anidados del mismo contexto reutilizan la caché del ámbito
+    exterior; la caché se descarta al salir del ámbito más externo. Las
+    operaciones de otros hilos no la ven.
+    """
+
+    def __init__(self, ttl: float = STAT_CACHE_TTL):
+        self.ttl = ttl
+        self._tokens = []
+
+    def __enter__(self) -> StatCache:
+        cache = _active_cache.get()
+        if cache is not None:
+            self._tokens.append(None)
+            return cache
+        cache = StatCache(self.ttl)
+        self._tokens.append(_active_cache.set(cache))
+        return cache
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        token = self._tokens.pop()
+        if token is not None:
+            _active_cache.reset(token)
+        return False  # No suprimir excepciones
+
+
+def bind_stat_cache(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Envuelve una función para que use la caché del ámbito actual en otro hilo.
+
+    Args:
+        func: Función que se ejecutará en un pool de hilos
+
+    Returns:
+        Función que activa la caché mientras se ejecuta (o func si no hay ámbito)
+    """
+    cache = _active_cache.get()
+    if cache is None:
+        return func
+
+    def bound(*args, **kwargs) -> T:
+        token = _active_cache.set(cache)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _active_cache.reset(token)
+    return bound
+
+
+def active_stat_cache() -> Optional[StatCache]:
+    """Caché del ámbito activo o None si no hay ninguno."""
+    return _active_cache.get()
+
+
+def path_exists(path: PathLike) -> bool:
+    """exists() que usa la caché del ámbito activo si la hay."""
+    cache = _active_cache.get()
+    if cache is not None:
+        return cache.exists(path)
+    return os.path.exists(path)
+
+
+def path_is_dir(path: PathLike) -> bool:
+    """is_dir() que usa la caché del ámbito activo si la hay."""
+    cache = _active_cache.get()
+    if cache is not None:
+        return cache.is_dir(path)
+    return os.path.isdir(path)
+
+
+def dir_has_entries(path: PathLike) -> bool:
+    """Indica si un directorio no está vacío, usando la caché activa si la hay."""
+    cache = _active_cache.get()
+    if cache is not None:
+        return cache.has_entries(path)
+    return _first_entry_exists(os.fspath(path))
+
+
+def invalidate_path(path: PathLike) -> None:
+    """Invalida una ruta modificada en la caché del ámbito activo."""
+    cache = _active_cache.get()
+    if cache is not None:
+        cache.invalidate(path)
@@ -62,11 +62,13 @@ class AvatarManager:
     """
     Gestor de avatares para cuentas de Steam.
     
-    Maneja la carga, redimensionado y caché de avatares.
+    Maneja la carga, redimensionado y caché de avatares. Cada avatar se
+    guarda junto con la huella (mtime, tamaño) del índice de avatarcache,
+    de modo que un avatar modificado se recarga sin consultar el disco.
     """
     
     def __init__(self):
-        self._avatar_cache: Dict[str, ImageTk.PhotoImage] = {}
+        self._avatar_cache: Dict[str, Tuple[Optional[Tuple[int, int]], ImageTk.PhotoImage]] = {}
         self._default_avatar: Optional[ImageTk.PhotoImage] = None
     
     def get_avatar(self, account: SteamAccount) -> ImageTk.PhotoImage:
@@ -79,9 +81,11 @@ class AvatarManager:
         Returns:
             Avatar como PhotoImage
         """
-        # Usar caché si existe
-        if account.steamid in self._avatar_cache:
-            return self._avatar_cache[account.steamid]
+        # Usar caché si existe y el archivo no cambió según el índice
+        stamp = account.avatar_stamp
+        cached = self._avatar_cache.get(account.steamid)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
         
         # Cargar avatar
         if account.has_avatar:
@@ -90,7 +94,7 @@ class AvatarManager:
             avatar = self._get_default_avatar()
         
         # Guardar en caché
-        self._avatar_cache[account.steamid] = avatar
+        self._avatar_cache[account.steamid] = (stamp, avatar)
         return avatar
     
     def _load_avatar_from_file(self, avatar_path: Path) -> ImageTk.PhotoImage:
@@ -113,6 +117,15 @@ class AvatarManager:
         """Limpia el caché de avatares."""
         self._avatar_cache.clear()
     
+    def invalidate(self, steamid: str) -> None:
+        """
+        Descarta el avatar en caché de una cuenta para recargarlo.
+        
+        Args:
+            steamid: Steam ID de la cuenta
+        """
+        self._avatar_cache.pop(steamid, None)
+    
     def preload_avatars(self, accounts: List[SteamAccount]) -> None:
         """
         Precarga avatares para una lista de cuentas.
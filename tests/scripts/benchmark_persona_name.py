@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la extracción de PersonaName desde localconfig.vdf.
+
+Compara la lectura completa + regex (método anterior) con el escáner por
+bloques con salida temprana (scan_persona_name) sobre archivos VDF
+sintéticos de varios megabytes.
+
+Uso:
+    python tests/scripts/benchmark_persona_name.py
+"""
+
+import re
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Agregar path del proyecto
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.steam_service import scan_persona_name
+
+SIZES_MB = [1, 5, 20]
+REPETITIONS = 20
+
+
+def legacy_extract(config_path: Path):
+    """Método anterior: leer y decodificar todo el archivo y aplicar regex."""
+    with open(config_path, encoding='utf-8', errors='ignore') as f:
+        contenido = f.read()
+    match = re.search(r'"PersonaName"\s+"([^"]+)"', contenido)
+    return match.group(1) if match else None
+
+
+def build_vdf(path: Path, size_mb: int, name_at_end: bool) -> None:
+    """
+    Genera un localconfig.vdf sintético con bloques de apps y amigos.
+
+    Args:
+        path: Archivo a generar
+        size_mb: Tamaño aproximado en megabytes
+        name_at_end: Si True, PersonaName queda al final (peor caso)
+    """
+    persona = '\t\t"PersonaName"\t\t"BenchmarkUser"\n'
+    block = ('\t\t"{0}"\n\t\t{{\n\t\t\t"LastPlayed"\t\t"1690000000"\n'
+             '\t\t\t"Playtime"\t\t"{0}"\n\t\t\t"cloud"\t\t"{{ \\"quota\\" \\"1\\" }}"\n\t\t}}\n')
+
+    target = size_mb * 1024 * 1024
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('"UserLocalConfigStore"\n{\n\t"friends"\n\t{\n')
+        if not name_at_end:
+            f.write(persona)
+        written, app_id = 0, 0
+        while written < target:
+            chunk = block.format(app_id)
+            f.write(chunk)
+            written += len(chunk)
+            app_id += 1
+        if name_at_end:
+            f.write(persona)
+        f.write('\t}\n}\n')
+
+
+def measure(func, path: Path) -> float:
+    """Devuelve el tiempo medio por llamada en milisegundos."""
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        result = func(path)
+    elapsed = (time.perf_counter() - start) / REPETITIONS * 1000
+    assert result == "BenchmarkUser", result
+    return elapsed
+
+
+def main() -> None:
+    """Ejecuta el benchmark e imprime la tabla de resultados."""
+    print(f"{'Tamaño':>8} {'Posición':>9} {'Anterior (ms)':>14} {'Bloques (ms)':>13} {'Mejora':>8}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size_mb in SIZES_MB:
+            for name_at_end in (False, True):
+                path = Path(temp_dir) / f"localconfig_{size_mb}_{name_at_end}.vdf"
+                build_vdf(path, size_mb, name_at_end)
+
+                legacy = measure(legacy_extract, path)
+                chunked = measure(scan_persona_name, path)
+
+                position = "final" if name_at_end else "inicio"
+                print(f"{size_mb:>6}MB {position:>9} {legacy:>14.2f} {chunked:>13.2f} "
+                      f"{legacy / chunked:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
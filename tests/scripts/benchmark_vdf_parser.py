@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del parser KeyValues (VDF) sobre documentos de varios megabytes.
+
+Mide el análisis completo, el recorrido por eventos y el acceso a una sola
+clave mediante el árbol perezoso, que sólo analiza los bloques necesarios.
+
+Uso:
+    python tests/scripts/benchmark_vdf_parser.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Agregar path del proyecto
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.vdf_parser import parse, parse_lazy, iter_events
+
+SIZES_MB = [1, 5, 20]
+REPETITIONS = 3
+
+
+def build_document(size_mb: int) -> str:
+    """Genera un localconfig.vdf sintético con muchas apps y datos de nube."""
+    parts = ['"UserLocalConfigStore"\n{\n\t"friends"\n\t{\n'
+             '\t\t"PersonaName"\t\t"BenchmarkUser"\n\t}\n\t"apps"\n\t{\n']
+    target = size_mb * 1024 * 1024
+    written, app_id = 0, 0
+    while written < target:
+        block = (f'\t\t"{app_id}"\n\t\t{{\n\t\t\t"LastPlayed"\t\t"1690000000"\n'
+                 f'\t\t\t"cloud"\n\t\t\t{{\n\t\t\t\t"quota"\t\t"{app_id}"\n'
+                 f'\t\t\t\t"data"\t\t"{{ \\"k\\" \\"v\\" }}"\n\t\t\t}}\n\t\t}}\n')
+        parts.append(block)
+        written += len(block)
+        app_id += 1
+    parts.append('\t}\n}\n')
+    return "".join(parts)
+
+
+def measure(func) -> float:
+    """Devuelve el tiempo medio por llamada en milisegundos."""
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        func()
+    return (time.perf_counter() - start) / REPETITIONS * 1000
+
+
+def main() -> None:
+    """Ejecuta el benchmark e imprime la tabla de resultados."""
+    print(f"{'Tamaño':>8} {'Completo (ms)':>14} {'Eventos (ms)':>13} {'Perezoso 1 clave (ms)':>22}")
+
+    for size_mb in SIZES_MB:
+        text = build_document(size_mb)
+
+        full = measure(lambda: parse(text))
+        events = measure(lambda: sum(1 for _ in iter_events(text)))
+        lazy = measure(lambda: parse_lazy(text).get_path(
+            "UserLocalConfigStore", "friends", "PersonaName"))
+
+        print(f"{size_mb:>6}MB {full:>14.1f} {events:>13.1f} {lazy:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
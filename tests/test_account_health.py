@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la validación en lote de cuentas.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.core.steam_service import SteamAccountService
+from src.models.domain_models import SteamAccount
+from src.utils.fs_utils import walk_tree
+
+
+class TestAccountHealth(unittest.TestCase):
+    """Tests para SteamAccountService.validate_accounts."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+
+        full = self.base / "100" / "570"
+        (full / "local" / "cfg").mkdir(parents=True)
+        (full / "remote" / "cfg").mkdir(parents=True)
+        (full / "local" / "cfg" / "autoexec.cfg").write_text("bind x y")
+        (full / "remote" / "cfg" / "config.cfg").write_text("1234567890")
+        (self.base / "200" / "570").mkdir(parents=True)
+
+        self.accounts = [
+            SteamAccount("100", "Completa", full),
+            SteamAccount("200", "Vacía", self.base / "200" / "570"),
+            SteamAccount("300", "Sin carpeta", self.base / "300" / "570"),
+        ]
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_report_per_account_in_order(self):
+        """Se devuelve un informe por cuenta, en el orden de entrada."""
+        reports = SteamAccountService().validate_accounts(self.accounts, max_workers=2)
+
+        self.assertEqual([r.steamid for r in reports], ["100", "200", "300"])
+
+        full, empty, missing = reports
+        self.assertTrue(full.is_healthy)
+        self.assertEqual(full.file_count, 2)
+        self.assertEqual(full.size, len("bind x y") + len("1234567890"))
+        self.assertTrue(empty.exists)
+        self.assertTrue(empty.is_empty)
+        self.assertFalse(empty.is_healthy)
+        self.assertFalse(missing.exists)
+        self.assertFalse(missing.is_healthy)
+
+    def test_without_size_skips_walk(self):
+        """Sin include_size sólo se comprueban existencia y contenido."""
+        reports = SteamAccountService().validate_accounts(self.accounts, include_size=False)
+
+        self.assertTrue(reports[0].is_healthy)
+        self.assertEqual(reports[0].file_count, 0)
+        self.assertEqual(reports[0].size, 0)
+
+    def test_empty_input(self):
+        """Una lista vacía no crea el pool."""
+        self.assertEqual(SteamAccountService().validate_accounts([]), [])
+
+    def test_walk_tree_records_unreadable(self):
+        """Una raíz inexistente se anota como ilegible en lugar de fallar."""
+        stats = walk_tree(self.base / "inexistente")
+        self.assertEqual(stats.file_count, 0)
+        self.assertEqual(stats.unreadable, [str(self.base / "inexistente")])
+
+
+if __name__ == "__main__":
+    unittest.main()
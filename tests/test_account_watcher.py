@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la vigilancia incremental de cuentas de Steam.
+"""
+
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.core.account_watcher import (
+    AccountWatcher, AccountChangeEvent, PollingBackend, InotifyBackend
+)
+from src.models.domain_models import SteamAccount
+from tests.test_steam_service import create_fake_steam, make_service
+
+
+class TestAccountWatcher(unittest.TestCase):
+    """Tests para AccountWatcher y sus backends."""
+
+    def setUp(self):
+        """Crea una instalación simulada con dos cuentas."""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.steam_root = create_fake_steam(Path(self._temp_dir.name),
+                                            {"100": "Primera", "300": "Tercera"})
+        self.service = make_service(self.steam_root)
+        self.accounts = self.service.find_accounts_with_dota2()
+        self.userdata = self.steam_root / "userdata"
+        self.avatars = self.steam_root / "config" / "avatarcache"
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _poll(self, backend):
+        """Ejecuta un ciclo del backend sin esperar al intervalo real."""
+        return backend.poll(threading.Event())
+
+    def test_polling_backend_detects_changes(self):
+        """El sondeo detecta altas, bajas y cambios por carpeta."""
+        backend = PollingBackend(self.userdata, self.avatars, interval=0)
+
+        create_fake_steam(self.steam_root, {"200": "Segunda"})
+        shutil.rmtree(self.userdata / "300")
+        (self.userdata / "100" / "config" / "localconfig.vdf").write_text(
+            '"PersonaName"\t\t"Renombrada"\n')
+
+        self.assertEqual(self._poll(backend), {"100", "200", "300"})
+        self.assertEqual(self._poll(backend), set())
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify sólo existe en Linux")
+    def test_inotify_backend_detects_new_account(self):
+        """inotify informa la carpeta nueva y el cambio de localconfig.vdf."""
+        backend = InotifyBackend(self.userdata, self.avatars, debounce=0.05)
+        try:
+            create_fake_steam(self.steam_root, {"200": "Segunda"})
+            self.assertIn("200", self._poll(backend))
+
+            (self.userdata / "100" / "config" / "localconfig.vdf").write_text("x")
+            self.assertIn("100", self._poll(backend))
+        finally:
+            backend.close()
+
+    def test_process_changes_emits_events(self):
+        """Las carpetas modificadas se traducen en eventos por cuenta."""
+        watcher = AccountWatcher(self.service)
+        watcher._known = {account.steamid: account for account in self.accounts}
+
+        create_fake_steam(self.steam_root, {"200": "Segunda"})
+        shutil.rmtree(self.userdata / "300")
+
+        events = watcher.process_changes({"200", "300", "999"})
+
+        self.assertEqual([(e.kind, e.steamid) for e in events],
+                         [("added", "200"), ("removed", "300")])
+        self.assertEqual([(e.kind, e.steamid) for e in watcher.drain_events()],
+                         [("added", "200"), ("removed", "300")])
+
+    def test_apply_events_keeps_folder_order(self):
+        """Aplicar eventos conserva el orden de la detección completa."""
+        nueva = SteamAccount("200", "Segunda", Path("/200/570"))
+        renombrada = SteamAccount("100", "Renombrada", Path("/100/570"))
+
+        updated = AccountWatcher.apply_events(self.accounts, [
+            AccountChangeEvent("added", "200", nueva),
+            AccountChangeEvent("changed", "100", renombrada),
+            AccountChangeEvent("removed", "300", self.accounts[1]),
+        ])
+
+        self.assertEqual([(a.steamid, a.nombre) for a in updated],
+                         [("100", "Renombrada"), ("200", "Segunda")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para los backups comprimidos en zip.
+"""
+
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.backup_archive import (
+    INDEX_NAME, archive_info, extract_archive, extract_files, write_archive
+)
+from src.core.config_service import FileCopyService
+from src.models.domain_models import SteamAccount
+from tests.test_fs_utils import read_tree, write_tree
+
+
+class TestBackupArchive(unittest.TestCase):
+    """Tests para write_archive y la restauración desde zip."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.source = self.base / "570"
+        write_tree(self.source, {
+            "remote/cfg/dotakeys.vcfg": '"bind" "F1" "+attack"\n' * 500,
+            "remote/cfg/video.txt": "1080p",
+        })
+        (self.source / "local" / "vacia").mkdir(parents=True)
+        self.archive = self.base / "backups" / "backup_200_20240101_000000.zip"
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_archive_is_compressed_and_indexed(self):
+        """El zip comprime el texto y lleva un índice con la cuenta."""
+        backup = write_archive(self.source, self.archive, "200")
+
+        self.assertEqual((backup.format, backup.steamid), ("zip", "200"))
+        self.assertLess(self.archive.stat().st_size, 2000)
+        with zipfile.ZipFile(self.archive) as archive:
+            self.assertIn(INDEX_NAME, archive.namelist())
+        self.assertEqual(archive_info(self.archive), backup)
+
+    def test_extract_restores_tree_and_mtimes(self):
+        """extract_archive recupera contenido, carpetas vacías y fechas exactas."""
+        video = self.source / "remote" / "cfg" / "video.txt"
+        os.utime(video, ns=(1_000_000_123, 1_000_000_123))
+        write_archive(self.source, self.archive, "200", compression="lzma")
+
+        target = self.base / "restaurado"
+        extract_archive(self.archive, target)
+
+        self.assertEqual(read_tree(target), read_tree(self.source))
+        self.assertTrue((target / "local" / "vacia").is_dir())
+        self.assertEqual((target / "remote" / "cfg" / "video.txt").stat().st_mtime_ns,
+                         1_000_000_123)
+
+    def test_extract_single_file(self):
+        """extract_files sólo sobrescribe los archivos pedidos."""
+        write_archive(self.source, self.archive, "200")
+        write_tree(self.source, {"remote/cfg/dotakeys.vcfg": "cambiado",
+                                 "remote/cfg/video.txt": "720p"})
+
+        extract_files(self.archive, ["remote/cfg/video.txt"], self.source)
+
+        self.assertEqual(read_tree(self.source),
+                         {"remote/cfg/dotakeys.vcfg": "cambiado", "remote/cfg/video.txt": "1080p"})
+        with self.assertRaises(FileNotFoundError):
+            extract_files(self.archive, ["no/existe.txt"], self.source)
+
+    def test_unreadable_folder_fails_the_backup(self):
+        """Una subcarpeta ilegible hace fallar el backup en vez de omitirse."""
+        real_scandir = os.scandir
+        unreadable = str(self.source / "remote" / "cfg")
+
+        def scandir(path="."):
+            if os.fspath(path) == unreadable:
+                raise PermissionError(13, "Permiso denegado", unreadable)
+            return real_scandir(path)
+
+        with patch.object(os, "scandir", side_effect=scandir):
+            with self.assertRaises(OSError):
+                write_archive(self.source, self.archive, "200")
+
+        self.assertEqual(list(self.archive.parent.iterdir()), [])
+
+    def test_invalid_archive_is_ignored(self):
+        """Un zip sin índice no se considera un backup."""
+        self.archive.parent.mkdir(parents=True)
+        with zipfile.ZipFile(self.archive, "w") as archive:
+            archive.writestr("otro.txt", "x")
+        self.assertIsNone(archive_info(self.archive))
+
+
+class TestFileCopyServiceArchives(unittest.TestCase):
+    """Tests para los backups zip de FileCopyService."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.account = SteamAccount(steamid="200", nombre="Destino",
+                                    ruta=self.base / "userdata" / "200" / "570")
+        write_tree(self.account.ruta, {"remote/cfg/dotakeys.vcfg": "original",
+                                       "remote/cfg/video.txt": "1080p"})
+        self._cwd = os.getcwd()
+        os.chdir(self.base)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._temp_dir.cleanup()
+
+    def test_zip_backup_restore_and_cleanup(self):
+        """Los zip se listan, se restauran enteros o por archivo y se limpian."""
+        service = FileCopyService(enable_backup=False, backup_format="zip")
+        backup = service.backup_account(self.account)
+        self.assertEqual(service.list_backups("200"), [backup])
+        self.assertEqual(service.find_backup(str(backup.path)), backup)
+
+        write_tree(self.account.ruta, {"remote/cfg/dotakeys.vcfg": "cambiado",
+                                       "remote/cfg/video.txt": "720p"})
+        success, _ = service.restore_backup(backup, self.account,
+                                            files=["remote/cfg/video.txt"])
+        self.assertTrue(success)
+        self.assertEqual(read_tree(self.account.ruta)["remote/cfg/dotakeys.vcfg"], "cambiado")
+        self.assertEqual(read_tree(self.account.ruta)["remote/cfg/video.txt"], "1080p")
+
+        success, _ = service.restore_backup(backup, self.account)
+        service.wait_for_cleanup()
+        self.assertTrue(success)
+        self.assertEqual(read_tree(self.account.ruta)["remote/cfg/dotakeys.vcfg"], "original")
+
+        service.cleanup_old_backups(max_backups=0)
+        self.assertFalse(backup.path.exists())
+
+    def test_single_file_restore_rejects_paths_outside_the_backup(self):
+        """Restaurar un archivo con ".." o ruta absoluta falla en todos los formatos."""
+        for backup_format in ("tree", "store", "zip"):
+            service = FileCopyService(enable_backup=False, backup_format=backup_format)
+            backup = service.backup_account(self.account)
+            # Un archivo real junto al backup, alcanzable con ".."
+            (Path(backup.path).parent / "fuera.txt").write_text("ajeno")
+
+            for relative in ("../fuera.txt", "../../fuera.txt", "/etc/hostname"):
+                success, _ = service.restore_backup(backup, self.account, files=[relative])
+                self.assertFalse(success, (backup_format, relative))
+            self.assertFalse((self.account.ruta.parent / "fuera.txt").exists())
+
+    def test_backup_names_are_unique_across_formats(self):
+        """Backups del mismo segundo en formatos distintos no comparten nombre."""
+        with patch("src.core.backup_store.datetime") as fake_datetime:
+            fake_datetime.fromtimestamp.return_value.strftime.return_value = "20240101_000000"
+            backups = [FileCopyService(enable_backup=False, backup_format=backup_format)
+                       .backup_account(self.account)
+                       for backup_format in ("tree", "zip", "store")]
+
+        self.assertEqual([backup.name for backup in backups],
+                         ["backup_200_20240101_000000", "backup_200_20240101_000000_1",
+                          "backup_200_20240101_000000_2"])
+        service = FileCopyService(enable_backup=False)
+        for backup in backups:
+            self.assertEqual(service.find_backup(backup.name), backup)
+        self.assertEqual(service.find_backup(backups[1].path.name), backups[1])
+
+    def test_ambiguous_backup_name_is_rejected(self):
+        """find_backup falla si un nombre corresponde a más de un backup."""
+        service = FileCopyService(enable_backup=False, backup_format="zip")
+        backup = service.backup_account(self.account)
+        # Una copia completa antigua con el mismo nombre que el zip
+        write_tree(service.backup_dir / backup.name, {"remote/cfg/video.txt": "720p"})
+
+        with self.assertRaises(ValueError):
+            service.find_backup(backup.name)
+        self.assertEqual(service.find_backup(backup.path.name), backup)
+
+if __name__ == "__main__":
+    unittest.main()
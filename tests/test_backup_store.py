@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el almacén de backups deduplicado.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.backup_store import BackupStore
+from src.core.config_service import FileCopyService
+from src.models.domain_models import SteamAccount
+from tests.test_fs_utils import read_tree, write_tree
+
+
+class TestBackupStore(unittest.TestCase):
+    """Tests para BackupStore."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.source = self.base / "570"
+        write_tree(self.source, {
+            "remote/cfg/dotakeys.vcfg": "keys" * 100,
+            "remote/cfg/video.txt": "1080p",
+            "remote/cfg/copia.txt": "keys" * 100,
+            "local/vacia/.keep": "",
+        })
+        (self.source / "remote" / "sin_archivos").mkdir()
+        self.store = BackupStore(self.base / "store")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _blob_count(self) -> int:
+        return sum(1 for _ in self.store._iter_blobs())
+
+    def test_identical_files_are_stored_once(self):
+        """Los archivos con el mismo contenido comparten blob."""
+        backup = self.store.create_backup(self.source, "200")
+
+        self.assertEqual(backup.format, "store")
+        self.assertEqual(backup.steamid, "200")
+        self.assertEqual(self._blob_count(), 3)
+
+    def test_second_backup_only_stores_changes(self):
+        """Un backup sin cambios no escribe blobs; uno con cambios sólo los nuevos."""
+        self.store.create_backup(self.source, "200")
+        blobs = self._blob_count()
+
+        self.store.create_backup(self.source, "200")
+        self.assertEqual(self._blob_count(), blobs)
+
+        (self.source / "remote" / "cfg" / "video.txt").write_text("1440p")
+        self.store.create_backup(self.source, "200")
+        self.assertEqual(self._blob_count(), blobs + 1)
+        self.assertEqual(len(self.store.list_backups("200")), 3)
+
+    def test_restore_rebuilds_tree_with_metadata(self):
+        """restore recupera contenido, carpetas vacías y fechas de modificación."""
+        video = self.source / "remote" / "cfg" / "video.txt"
+        os.utime(video, ns=(1_000_000_000, 1_000_000_000))
+        backup = self.store.create_backup(self.source, "200")
+        expected = read_tree(self.source)
+
+        video.write_text("720p!")
+        (self.source / "remote" / "cfg" / "nuevo.txt").write_text("x")
+        retired = self.store.restore(backup.name, self.source)
+
+        self.assertEqual(read_tree(self.source), expected)
+        self.assertTrue((self.source / "remote" / "sin_archivos").is_dir())
+        self.assertEqual(video.stat().st_mtime_ns, 1_000_000_000)
+        self.assertEqual(read_tree(retired)["remote/cfg/nuevo.txt"], "x")
+
+    def test_gc_removes_unreferenced_blobs(self):
+        """gc elimina sólo los blobs que no usa ningún manifiesto."""
+        first = self.store.create_backup(self.source, "200")
+        (self.source / "remote" / "cfg" / "video.txt").write_text("1440p")
+        second = self.store.create_backup(self.source, "200")
+
+        self.assertEqual(self.store.gc(), 0)
+        self.store.delete(first.name)
+        self.assertEqual(self.store.gc(), 1)
+
+        target = self.base / "restaurado"
+        self.store.materialize(second.name, target)
+        self.assertEqual(read_tree(target), read_tree(self.source))
+
+    def test_names_skip_those_taken_by_other_formats(self):
+        """El almacén no reutiliza un nombre que ya usa otro formato de backup."""
+        taken = {"backup_200_20240101_000000", "backup_200_20240101_000000_1"}
+        store = BackupStore(self.base / "store", name_taken=taken.__contains__)
+        with patch("src.core.backup_store.datetime") as fake_datetime:
+            fake_datetime.fromtimestamp.return_value.strftime.return_value = "20240101_000000"
+            backup = store.create_backup(self.source, "200")
+
+        self.assertEqual(backup.name, "backup_200_20240101_000000_2")
+
+
+class TestFileCopyServiceBackups(unittest.TestCase):
+    """Tests para los backups de FileCopyService con el almacén."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.account = SteamAccount(steamid="200", nombre="Destino",
+                                    ruta=self.base / "userdata" / "200" / "570")
+        write_tree(self.account.ruta, {"remote/cfg/dotakeys.vcfg": "original"})
+        self._cwd = os.getcwd()
+        os.chdir(self.base)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._temp_dir.cleanup()
+
+    def test_backup_list_and_restore(self):
+        """Los backups del almacén se listan, se buscan y se restauran."""
+        service = FileCopyService(backup_format="store")
+        backup = service.backup_account(self.account)
+        write_tree(self.account.ruta, {"remote/cfg/dotakeys.vcfg": "cambiado"})
+
+        self.assertEqual(service.find_backup(backup.name), backup)
+        success, _ = service.restore_backup(backup, self.account)
+        service.wait_for_cleanup()
+
+        self.assertTrue(success)
+        self.assertEqual(read_tree(self.account.ruta), {"remote/cfg/dotakeys.vcfg": "original"})
+        # Antes de restaurar se respaldó la configuración cambiada
+        self.assertEqual([b.format for b in service.list_backups("200")], ["store", "store"])
+
+    def test_cleanup_keeps_newest_backups(self):
+        """cleanup_old_backups borra manifiestos antiguos y sus blobs huérfanos."""
+        service = FileCopyService(backup_format="store")
+        for content in ("uno", "dos", "tres"):
+            write_tree(self.account.ruta, {"remote/cfg/dotakeys.vcfg": content})
+            service.backup_account(self.account)
+
+        service.cleanup_old_backups(max_backups=1)
+
+        backups = service.list_backups()
+        self.assertEqual(len(backups), 1)
+        self.assertEqual(sum(1 for _ in service.backup_store._iter_blobs()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el modo de línea de comandos.
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.cli.main import CliApp, CliError, run
+from src.core.config_service import FileCopyService
+from src.core.steam_probe import clear_probe_cache
+from src.models.domain_models import AppConfig
+from tests.test_steam_service import create_fake_steam
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class TestCli(unittest.TestCase):
+    """Tests para los subcomandos de la CLI."""
+
+    def setUp(self):
+        """Crea una instalación simulada y trabaja en un directorio temporal."""
+        clear_probe_cache()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.steam = create_fake_steam(self.base / "Steam",
+                                       {"100": "Origen", "200": "Destino", "300": "Ignorada"})
+        self.config_file = self.base / "config.json"
+        AppConfig(cuentas_ignoradas=["300"]).save_to_file(self.config_file)
+
+        self._cwd = os.getcwd()
+        os.chdir(self.base)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        clear_probe_cache()
+        self._temp_dir.cleanup()
+
+    def _run(self, *args):
+        """Ejecuta la CLI y devuelve (código, JSON)."""
+        out = io.StringIO()
+        code = run(["--config", str(self.config_file), "--steam-path", str(self.steam), *args],
+                   out=out)
+        return code, json.loads(out.getvalue())
+
+    def test_scan_lists_available_accounts(self):
+        """scan devuelve las cuentas no ignoradas con su nombre."""
+        code, result = self._run("scan")
+
+        self.assertEqual(code, 0)
+        self.assertTrue(result["ok"])
+        self.assertEqual([(a["steamid"], a["nombre"]) for a in result["accounts"]],
+                         [("100", "Origen"), ("200", "Destino")])
+
+        code, result = self._run("scan", "--fast", "--include-ignored")
+        self.assertEqual([a["steamid"] for a in result["accounts"]], ["100", "200", "300"])
+
+    def test_copy_backup_and_restore(self):
+        """copy sobrescribe el destino y restore recupera el backup."""
+        cfg = self.steam / "userdata" / "{}" / "570" / "remote" / "cfg" / "dotakeys.vcfg"
+        Path(str(cfg).format("100")).write_text("origen")
+        Path(str(cfg).format("200")).write_text("destino")
+
+        code, result = self._run("backup", "200")
+        self.assertEqual(code, 0)
+        self.assertTrue(Path(result["backup"]).exists())
+
+        code, result = self._run("copy", "100", "200", "--no-backup")
+        self.assertEqual(code, 0, result)
+        self.assertEqual(result["sync"]["updated"], 1)
+        self.assertEqual(Path(str(cfg).format("200")).read_text(), "origen")
+
+        code, result = self._run("restore", "200")
+        self.assertEqual(code, 0, result)
+        self.assertEqual(Path(str(cfg).format("200")).read_text(), "destino")
+
+    def test_full_copy_waits_for_previous_tree_removal(self):
+        """copy no termina hasta eliminar el árbol anterior apartado."""
+        with patch.object(FileCopyService, "wait_for_cleanup", autospec=True,
+                          side_effect=FileCopyService.wait_for_cleanup) as wait:
+            code, result = self._run("copy", "100", "200", "--full", "--no-backup",
+                                     "--profile", "completo")
+
+        self.assertEqual(code, 0, result)
+        wait.assert_called_once()
+        self.assertEqual(list((self.steam / "userdata" / "200").glob("570?*")), [])
+
+    def test_errors_are_reported_as_json(self):
+        """Los errores se devuelven como JSON con código distinto de cero."""
+        code, result = self._run("copy", "100", "999")
+        self.assertEqual(code, 1)
+        self.assertFalse(result["ok"])
+        self.assertIn("999", result["error"])
+
+        code, result = self._run("restore", "100")
+        self.assertEqual(code, 1)
+
+    def test_daemon_is_skipped_with_steam_path(self):
+        """Con --steam-path, --daemon no envía el comando al servicio."""
+        with patch("src.cli.daemon.DaemonClient",
+                   side_effect=AssertionError("comando enviado al servicio")):
+            code, result = self._run("--daemon", "scan")
+
+        self.assertEqual(code, 0)
+        self.assertEqual([a["steamid"] for a in result["accounts"]], ["100", "200"])
+
+    def test_bad_arguments_are_cli_errors_but_internal_type_errors_are_not(self):
+        """Sólo los argumentos mal formados se informan como argumentos inválidos."""
+        app = CliApp(self.config_file, str(self.steam))
+        with self.assertRaises(CliError):
+            app.execute("scan", {"no_existe": True})
+
+        with patch.object(CliApp, "list_ignored", autospec=True,
+                          side_effect=TypeError("fallo interno")):
+            with self.assertRaisesRegex(TypeError, "fallo interno"):
+                app.execute("list-ignored")
+
+    def test_list_ignored(self):
+        """list-ignored devuelve las cuentas ignoradas de la configuración."""
+        code, result = self._run("list-ignored")
+        self.assertEqual((code, result["ignored"]), (0, ["300"]))
+
+    def test_does_not_import_gui_modules(self):
+        """La CLI no importa tkinter ni PIL."""
+        script = ("import sys; import src.cli.main; "
+                  "print(any(m.split('.')[0] in ('tkinter', 'PIL') for m in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", script], cwd=str(PROJECT_ROOT),
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
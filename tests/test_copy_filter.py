@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para los filtros y perfiles de copia.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.core.backup_store import BackupStore
+from src.core.config_service import FileCopyService
+from src.models.domain_models import CopyOperation, SteamAccount
+from src.utils.copy_filter import CopyFilter
+from src.utils.fs_utils import parallel_copytree, sync_tree
+from tests.test_fs_utils import read_tree, write_tree
+
+
+class TestCopyFilter(unittest.TestCase):
+    """Tests para CopyFilter."""
+
+    def test_patterns_match_names_ignoring_case(self):
+        """Los patrones se comparan con el nombre sin distinguir mayúsculas."""
+        copy_filter = CopyFilter(["*.cfg", "*.vcfg"], ["cache", "log*"])
+
+        self.assertTrue(copy_filter.includes_file("autoexec.CFG"))
+        self.assertTrue(copy_filter.includes_file("dotakeys.vcfg"))
+        self.assertFalse(copy_filter.includes_file("dotakeys.vcfg.bak"))
+        self.assertFalse(copy_filter.includes_dir("Cache"))
+        self.assertFalse(copy_filter.includes_dir("logs"))
+        self.assertTrue(copy_filter.includes_dir("cfg"))
+        self.assertFalse(copy_filter.is_everything)
+
+    def test_empty_filter_includes_everything(self):
+        """Sin patrones todo entra."""
+        copy_filter = CopyFilter()
+        self.assertTrue(copy_filter.is_everything)
+        self.assertTrue(copy_filter.includes("cualquier.bin", is_dir=False))
+        self.assertTrue(copy_filter.includes("cache", is_dir=True))
+
+    def test_profiles(self):
+        """Los perfiles se crean por nombre y uno desconocido es un error."""
+        self.assertTrue(CopyFilter.from_profile("completo").is_everything)
+        only_config = CopyFilter.from_profile("solo_configuracion")
+        self.assertFalse(only_config.includes_file("replay.dem"))
+        self.assertFalse(only_config.includes_dir("cache"))
+        self.assertEqual(CopyFilter.from_profile().name, "completo")
+        with self.assertRaises(ValueError):
+            CopyFilter.from_profile("no_existe")
+
+
+class TestFilteredCopies(unittest.TestCase):
+    """Tests para copias, sincronizaciones y backups con filtro."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.source = self.base / "origen" / "570"
+        self.target = self.base / "destino" / "570"
+        write_tree(self.source, {
+            "remote/cfg/dotakeys.vcfg": "keys",
+            "remote/cfg/notas.md": "md",
+            "local/cache/grande.bin": "cache origen",
+            "local/logs/console.log": "log",
+        })
+        self.filter = CopyFilter(["*.vcfg"], ["cache", "logs"])
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_copytree_prunes_excluded(self):
+        """parallel_copytree no copia lo excluido ni crea sus carpetas."""
+        parallel_copytree(self.source, self.target, copy_filter=self.filter)
+
+        self.assertEqual(read_tree(self.target), {"remote/cfg/dotakeys.vcfg": "keys"})
+        self.assertFalse((self.target / "local" / "cache").exists())
+
+    def test_sync_leaves_excluded_target_entries_alone(self):
+        """La sincronización no elimina del destino lo que excluye el filtro."""
+        write_tree(self.target, {"local/cache/propia.bin": "cache destino",
+                                 "remote/cfg/propio.md": "md destino",
+                                 "remote/cfg/sobra.vcfg": "sobra"})
+
+        stats = sync_tree(self.source, self.target, copy_filter=self.filter)
+
+        self.assertEqual(read_tree(self.target), {
+            "local/cache/propia.bin": "cache destino",
+            "remote/cfg/propio.md": "md destino",
+            "remote/cfg/dotakeys.vcfg": "keys",
+        })
+        self.assertEqual((stats.copied, stats.deleted), (1, 1))
+
+    def test_backup_store_skips_excluded(self):
+        """Los backups del almacén respetan el filtro."""
+        store = BackupStore(self.base / "store")
+        backup = store.create_backup(self.source, "100", self.filter)
+
+        restored = self.base / "restaurado"
+        store.materialize(backup.name, restored)
+        self.assertEqual(read_tree(restored), {"remote/cfg/dotakeys.vcfg": "keys"})
+
+    def test_service_copy_and_restore_keep_destination_cache(self):
+        """Con un perfil selectivo, copia y restauración conservan la caché del destino."""
+        write_tree(self.target, {"remote/cfg/dotakeys.vcfg": "viejo",
+                                 "local/cache/propia.bin": "cache destino"})
+        cwd = os.getcwd()
+        os.chdir(self.base)
+        try:
+            service = FileCopyService(sync_mode=False,
+                                      copy_filter=CopyFilter.from_profile("sin_temporales"))
+            operation = CopyOperation(SteamAccount("100", "Origen", self.source),
+                                      SteamAccount("200", "Destino", self.target))
+            success, _ = service.copy_configuration(operation)
+            self.assertTrue(success)
+            self.assertEqual(read_tree(self.target)["local/cache/propia.bin"], "cache destino")
+            self.assertEqual(read_tree(self.target)["remote/cfg/dotakeys.vcfg"], "keys")
+
+            backup = service.list_backups("200")[0]
+            success, _ = service.restore_backup(backup, operation.destino)
+            service.wait_for_cleanup()
+        finally:
+            os.chdir(cwd)
+
+        self.assertTrue(success)
+        self.assertEqual(read_tree(self.target), {"remote/cfg/dotakeys.vcfg": "viejo",
+                                                  "local/cache/propia.bin": "cache destino"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el servicio en segundo plano de la CLI.
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.cli.daemon import AccountDaemon, DaemonApp, DaemonClient, DaemonUnavailable
+from src.core.steam_probe import clear_probe_cache
+from src.core.steam_service import SteamAccountService
+from src.models.domain_models import AppConfig
+from tests.test_steam_service import create_fake_steam
+
+
+@unittest.skipIf(sys.platform == "win32", "Los tests usan un socket Unix")
+class TestAccountDaemon(unittest.TestCase):
+    """Tests para AccountDaemon y DaemonClient."""
+
+    def setUp(self):
+        """Arranca el servicio sobre una instalación simulada."""
+        clear_probe_cache()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.steam = create_fake_steam(self.base / "Steam", {"100": "Uno", "200": "Dos"})
+        self.config_file = self.base / "config.json"
+        AppConfig(custom_steam_path=str(self.steam)).save_to_file(self.config_file)
+
+        self._cwd = os.getcwd()
+        os.chdir(self.base)
+
+        self.app = DaemonApp(self.config_file)
+        self.app.start()
+        self.address = str(self.base / "daemon.sock")
+        self.daemon = AccountDaemon(self.app, self.address)
+        self._thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self._thread.start()
+        self.assertTrue(self.daemon.ready.wait(5))
+
+    def tearDown(self):
+        self.daemon.stop()
+        self._thread.join(5)
+        os.chdir(self._cwd)
+        clear_probe_cache()
+        self._temp_dir.cleanup()
+
+    def _client(self) -> DaemonClient:
+        return DaemonClient(self.address, config_file=self.config_file)
+
+    def test_scan_is_served_from_memory(self):
+        """Las consultas no vuelven a escanear userdata."""
+        with patch.object(SteamAccountService, "_list_user_folders",
+                          side_effect=AssertionError("userdata reescaneado")):
+            with self._client() as client:
+                for _ in range(3):
+                    result = client.request("scan")
+                    self.assertTrue(result["ok"], result)
+
+        self.assertEqual([(a["steamid"], a["nombre"]) for a in result["accounts"]],
+                         [("100", "Uno"), ("200", "Dos")])
+
+    def test_ignore_and_copy(self):
+        """ignore guarda la configuración y copy usa las cuentas en memoria."""
+        client = self._client()
+        self.assertEqual(client.request("ignore", {"steamid": "200"})["ignored"], ["200"])
+        self.assertEqual([a["steamid"] for a in client.request("scan")["accounts"]], ["100"])
+        self.assertEqual(AppConfig.load_from_file(self.config_file).cuentas_ignoradas, ["200"])
+
+        result = client.request("copy", {"origen_id": "100", "destino_id": "200",
+                                         "backup": False})
+        self.assertTrue(result["ok"], result)
+
+        result = client.request("desconocido")
+        self.assertFalse(result["ok"])
+
+    def test_external_config_changes_are_reloaded(self):
+        """Un cambio del archivo de configuración se aplica en la siguiente petición."""
+        config = AppConfig.load_from_file(self.config_file)
+        config.cuentas_ignoradas = ["100"]
+        config.save_to_file(self.config_file)
+        os.utime(self.config_file, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+        result = self._client().request("scan")
+        self.assertEqual([a["steamid"] for a in result["accounts"]], ["200"])
+
+    def test_new_accounts_are_picked_up_by_the_watcher(self):
+        """Una cuenta creada en disco aparece sin reiniciar el servicio."""
+        create_fake_steam(self.steam, {"300": "Tres"})
+
+        client = self._client()
+        deadline = time.monotonic() + 10
+        steamids = []
+        while time.monotonic() < deadline:
+            steamids = [a["steamid"] for a in client.request("scan")["accounts"]]
+            if "300" in steamids:
+                break
+            time.sleep(0.1)
+        self.assertIn("300", steamids)
+
+    def test_second_daemon_does_not_take_over_live_socket(self):
+        """Otro servicio con otra clave no desplaza al que está escuchando."""
+        other = AccountDaemon(self.app, self.address, authkey=b"otra clave")
+        with self.assertRaises(RuntimeError):
+            other.serve_forever()
+
+        self.assertTrue(self._client().request("ping")["ok"])
+
+    def test_stale_socket_is_replaced(self):
+        """Un socket sin nadie escuchando se elimina al arrancar."""
+        stale = str(self.base / "abandonado.sock")
+        dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        dead.bind(stale)
+        dead.close()
+
+        daemon = AccountDaemon(self.app, stale, authkey=b"clave")
+        daemon._remove_stale_socket()
+        self.assertFalse(os.path.lexists(stale))
+
+    def test_wrong_key_and_shutdown(self):
+        """Una clave incorrecta se rechaza y "shutdown" detiene el servicio."""
+        with self.assertRaises(DaemonUnavailable):
+            DaemonClient(self.address, authkey=b"incorrecta").request("ping")
+
+        self.assertTrue(self._client().request("ping")["ok"])
+        self.assertTrue(self._client().request("shutdown")["ok"])
+        self._thread.join(5)
+        self.assertFalse(self._thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la copia de archivos con estrategias aceleradas.
+"""
+
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.utils.fast_copy import FastCopier, STRATEGIES
+
+
+def unsupported(*args, **kwargs):
+    """Simula una estrategia no admitida por el sistema de archivos."""
+    raise OSError(errno.EOPNOTSUPP, "no admitido")
+
+
+class TestFastCopier(unittest.TestCase):
+    """Tests para FastCopier."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.source = self.base / "origen.bin"
+        self.data = os.urandom(3 * 1024 * 1024 + 17)
+        self.source.write_bytes(self.data)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_copy_preserves_content_and_metadata(self):
+        """La copia es idéntica y conserva el mtime, como shutil.copy2."""
+        os.utime(self.source, (1_000_000, 1_000_000))
+        copier = FastCopier()
+
+        target = copier.copy2(str(self.source), str(self.base / "copia.bin"))
+
+        self.assertEqual(Path(target).read_bytes(), self.data)
+        self.assertEqual(Path(target).stat().st_mtime, 1_000_000)
+        counts = copier.strategy_counts()
+        self.assertEqual(sum(counts.values()), 1)
+        self.assertIn(next(iter(counts)), STRATEGIES)
+
+    def test_falls_back_and_remembers_unsupported(self):
+        """Las estrategias no admitidas se saltan y no se reintentan."""
+        copier = FastCopier()
+        with patch.object(FastCopier, "_copy_reflink", side_effect=unsupported) as reflink, \
+                patch.object(FastCopier, "_copy_copy_file_range", side_effect=unsupported), \
+                patch.object(FastCopier, "_copy_sendfile", side_effect=unsupported):
+            for name in ("a.bin", "b.bin"):
+                self.assertEqual(copier.copy_file(self.source, self.base / name), "buffered")
+                self.assertEqual((self.base / name).read_bytes(), self.data)
+
+        reflink.assert_called_once()
+        self.assertEqual(copier.strategy_counts(), {"buffered": 2})
+
+    def test_partial_write_is_discarded_before_fallback(self):
+        """Lo escrito por una estrategia que falla a mitad no queda en el destino."""
+        def partial(fsrc, fdst, size):
+            fdst.write(b"basura")
+            unsupported()
+
+        copier = FastCopier()
+        with patch.object(FastCopier, "_copy_reflink", side_effect=partial), \
+                patch.object(FastCopier, "_copy_copy_file_range", side_effect=unsupported), \
+                patch.object(FastCopier, "_copy_sendfile", side_effect=unsupported):
+            copier.copy_file(self.source, self.base / "copia.bin")
+
+        self.assertEqual((self.base / "copia.bin").read_bytes(), self.data)
+
+    def test_kernel_copy_that_makes_no_progress_falls_back(self):
+        """Si el kernel devuelve 0 bytes, la copia no se da por buena."""
+        copier = FastCopier()
+        with patch.object(FastCopier, "_copy_reflink", side_effect=unsupported), \
+                patch.object(os, "copy_file_range", return_value=0, create=True), \
+                patch.object(os, "sendfile", return_value=0, create=True):
+            strategy = copier.copy_file(self.source, self.base / "copia.bin")
+
+        self.assertEqual(strategy, "buffered")
+        self.assertEqual((self.base / "copia.bin").read_bytes(), self.data)
+
+    def test_real_errors_are_raised(self):
+        """Un error que no indica falta de soporte se propaga."""
+        def no_space(*args):
+            raise OSError(errno.ENOSPC, "sin espacio")
+
+        with patch.object(FastCopier, "_copy_reflink", side_effect=no_space):
+            with self.assertRaises(OSError):
+                FastCopier().copy_file(self.source, self.base / "copia.bin")
+
+    def test_works_as_copytree_function(self):
+        """Puede usarse como copy_function de shutil.copytree."""
+        tree = self.base / "arbol"
+        (tree / "cfg").mkdir(parents=True)
+        (tree / "cfg" / "a.cfg").write_text("a")
+        (tree / "vacio.txt").write_text("")
+        copier = FastCopier()
+
+        shutil.copytree(tree, self.base / "copia", copy_function=copier.copy2)
+
+        self.assertEqual((self.base / "copia" / "cfg" / "a.cfg").read_text(), "a")
+        self.assertEqual(sum(copier.strategy_counts().values()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la sincronización y el reemplazo de carpetas.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.config_service import FileCopyService
+from src.models.domain_models import CopyOperation, SteamAccount
+from src.utils.copy_filter import CopyFilter
+from src.utils.fs_utils import (
+    CancellationToken, CopyCancelled, CopyMonitor, sync_tree, parallel_copytree,
+    swap_in_copy, recover_interrupted_swap, STAGING_SUFFIX, RETIRED_SUFFIX, TEMP_FILE_SUFFIX
+)
+
+
+def write_tree(root: Path, files: dict) -> None:
+    """Crea los archivos indicados (ruta relativa -> contenido)."""
+    for relative, content in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def read_tree(root: Path) -> dict:
+    """Lee todos los archivos de un árbol (ruta relativa -> contenido)."""
+    return {path.relative_to(root).as_posix(): path.read_text()
+            for path in root.rglob("*") if path.is_file()}
+
+
+class TestSyncTree(unittest.TestCase):
+    """Tests para sync_tree."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.source = self.base / "origen"
+        self.target = self.base / "destino"
+        write_tree(self.source, {"local/cfg/autoexec.cfg": "bind a b",
+                                 "remote/cfg/dotakeys.vcfg": "keys",
+                                 "remote/cfg/video.txt": "1080p"})
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_first_sync_copies_everything(self):
+        """Sobre un destino vacío se copian todos los archivos."""
+        stats = sync_tree(self.source, self.target)
+
+        self.assertEqual(read_tree(self.target), read_tree(self.source))
+        self.assertEqual((stats.copied, stats.updated, stats.deleted), (3, 0, 0))
+
+    def test_second_sync_writes_nothing(self):
+        """Volver a sincronizar un destino idéntico no escribe ningún archivo."""
+        sync_tree(self.source, self.target)
+
+        with patch("src.utils.fs_utils.shutil.copy2") as copy2:
+            stats = sync_tree(self.source, self.target)
+
+        copy2.assert_not_called()
+        self.assertEqual((stats.files_written, stats.unchanged, stats.bytes_written), (0, 3, 0))
+
+    def test_only_changes_are_applied(self):
+        """Sólo se escriben los archivos cambiados y se borran los que sobran."""
+        sync_tree(self.source, self.target)
+        write_tree(self.source, {"remote/cfg/video.txt": "4k!!", "local/nuevo.cfg": "x"})
+        write_tree(self.target, {"remote/cfg/sobra.txt": "basura", "viejo/a.txt": "a"})
+
+        stats = sync_tree(self.source, self.target)
+
+        self.assertEqual(read_tree(self.target), read_tree(self.source))
+        self.assertEqual((stats.copied, stats.updated, stats.deleted, stats.unchanged),
+                         (1, 1, 2, 2))
+        self.assertFalse((self.target / "viejo").exists())
+
+    def test_type_conflicts_are_replaced(self):
+        """Un archivo que en el origen es carpeta (o al revés) se reemplaza."""
+        write_tree(self.target, {"local": "era un archivo", "remote/cfg/video.txt/x": "carpeta"})
+
+        sync_tree(self.source, self.target)
+
+        self.assertEqual(read_tree(self.target), read_tree(self.source))
+
+    def test_content_check_detects_same_size_edits(self):
+        """La comparación de contenido detecta cambios que no alteran tamaño ni mtime."""
+        sync_tree(self.source, self.target)
+        video = self.target / "remote" / "cfg" / "video.txt"
+        stat = video.stat()
+        video.write_text("1440p")
+        os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(sync_tree(self.source, self.target).updated, 0)
+        stats = sync_tree(self.source, self.target, compare_content=True)
+
+        self.assertEqual(stats.updated, 1)
+        self.assertEqual(video.read_text(), "1080p")
+
+    def test_content_check_only_touches_metadata_when_equal(self):
+        """Con el mismo contenido y distinto mtime sólo se alinean los metadatos."""
+        sync_tree(self.source, self.target)
+        video = self.target / "remote" / "cfg" / "video.txt"
+        os.utime(video, (1, 1))
+
+        stats = sync_tree(self.source, self.target, compare_content=True)
+
+        self.assertEqual((stats.files_written, stats.unchanged), (0, 3))
+        self.assertEqual(video.stat().st_mtime_ns,
+                         (self.source / "remote" / "cfg" / "video.txt").stat().st_mtime_ns)
+
+
+class TestParallelCopytree(unittest.TestCase):
+    """Tests para parallel_copytree."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.source = self.base / "origen"
+        write_tree(self.source, {f"cfg/{i:03d}.cfg": str(i) for i in range(50)})
+        write_tree(self.source, {"remote/dotakeys.vcfg": "keys", "raiz.txt": "r"})
+        (self.source / "vacia").mkdir()
+        os.utime(self.source / "cfg", ns=(1_000_000_000, 1_000_000_000))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_copies_like_copytree(self):
+        """El resultado es el de copytree, incluidas carpetas vacías y fechas."""
+        target = parallel_copytree(self.source, self.base / "destino", max_workers=4)
+
+        self.assertEqual(read_tree(target), read_tree(self.source))
+        self.assertTrue((target / "vacia").is_dir())
+        self.assertEqual((target / "cfg").stat().st_mtime_ns, 1_000_000_000)
+
+    def test_errors_are_aggregated_in_source_order(self):
+        """Todos los fallos se reúnen en un shutil.Error con orden estable."""
+        def failing_copy(src, dst, **kwargs):
+            if src.endswith(("007.cfg", "003.cfg")):
+                raise OSError("sin permiso")
+            return shutil.copy2(src, dst)
+
+        with self.assertRaises(shutil.Error) as context:
+            parallel_copytree(self.source, self.base / "destino", failing_copy, max_workers=8)
+
+        failed = [Path(src).name for src, _, _ in context.exception.args[0]]
+        self.assertEqual(failed, ["003.cfg", "007.cfg"])
+        self.assertEqual(len(read_tree(self.base / "destino")), 50)
+
+    def test_sync_tree_copies_in_parallel(self):
+        """sync_tree con varios hilos da las mismas estadísticas que en secuencia."""
+        stats = sync_tree(self.source, self.base / "destino", max_workers=4)
+        self.assertEqual((stats.copied, stats.files_written), (52, 52))
+
+        write_tree(self.source, {"cfg/000.cfg": "cambiado"})
+        stats = sync_tree(self.source, self.base / "destino", max_workers=4)
+        self.assertEqual((stats.updated, stats.unchanged), (1, 51))
+
+
+class TestCopyProgressAndCancellation(unittest.TestCase):
+    """Tests para el progreso y la cancelación de las copias."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.source = self.base / "origen"
+        self.target = self.base / "destino"
+        write_tree(self.source, {f"cfg/{i}.cfg": "x" * i for i in range(10)})
+        write_tree(self.target, {"cfg/0.cfg": "viejo", "sobra.txt": "s"})
+        self.token = CancellationToken()
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _cancelling_copy(self, after: int):
+        """Función de copia que cancela tras copiar after archivos."""
+        copied = []
+
+        def copy(src, dst, **kwargs):
+            shutil.copy2(src, dst)
+            copied.append(src)
+            if len(copied) == after:
+                self.token.cancel()
+        return copy
+
+    def test_progress_reports_planned_totals(self):
+        """El progreso llega hasta los archivos y bytes previstos."""
+        updates = []
+        sync_tree(self.source, self.target, monitor=CopyMonitor(updates.append))
+
+        last = updates[-1]
+        self.assertEqual((last.files_done, last.files_total), (10, 10))
+        self.assertEqual((last.bytes_done, last.bytes_total), (45, 45))
+        self.assertEqual(last.fraction, 1.0)
+        self.assertEqual(updates[0].files_done, 0)
+
+    def test_cancelled_sync_leaves_target_intact(self):
+        """Cancelar una sincronización no deja cambios ni temporales."""
+        before = read_tree(self.target)
+        with self.assertRaises(CopyCancelled):
+            sync_tree(self.source, self.target, copy_function=self._cancelling_copy(3),
+                      max_workers=1, monitor=CopyMonitor(token=self.token))
+
+        self.assertEqual(read_tree(self.target), before)
+
+    def test_failed_sync_leaves_target_intact(self):
+        """Si falla un archivo no se aplica ningún cambio."""
+        def failing_copy(src, dst, **kwargs):
+            if src.endswith("5.cfg"):
+                raise OSError("disco lleno")
+            return shutil.copy2(src, dst)
+
+        before = read_tree(self.target)
+        with self.assertRaises(shutil.Error):
+            sync_tree(self.source, self.target, copy_function=failing_copy)
+        self.assertEqual(read_tree(self.target), before)
+
+    def test_failed_apply_phase_removes_pending_temps(self):
+        """Si falla un renombrado de la segunda fase no quedan temporales."""
+        real_replace = os.replace
+        calls = []
+
+        def failing_replace(src, dst):
+            calls.append(src)
+            if len(calls) == 3:
+                raise OSError("renombrado fallido")
+            return real_replace(src, dst)
+
+        with patch("src.utils.fs_utils.os.replace", side_effect=failing_replace):
+            with self.assertRaises(OSError):
+                sync_tree(self.source, self.target)
+
+        self.assertEqual([p for p in self.target.rglob("*") if p.name.endswith(TEMP_FILE_SUFFIX)],
+                         [])
+        sync_tree(self.source, self.target)
+        self.assertEqual(read_tree(self.target), read_tree(self.source))
+
+    def test_stale_temps_are_removed_despite_filter(self):
+        """Los temporales de una sincronización cortada se eliminan aunque el filtro los excluya."""
+        write_tree(self.target, {"cfg/1.cfg" + TEMP_FILE_SUFFIX: "resto",
+                                 "cache/a.bin" + TEMP_FILE_SUFFIX: "resto",
+                                 "cache/propio.bin": "cache"})
+
+        sync_tree(self.source, self.target, copy_filter=CopyFilter(["*.cfg"], ["cache"]))
+
+        self.assertEqual(read_tree(self.target)["cache/propio.bin"], "cache")
+        self.assertEqual([p for p in self.target.rglob("*") if p.name.endswith(TEMP_FILE_SUFFIX)],
+                         [])
+
+    def test_cancelled_full_copy_leaves_target_intact(self):
+        """Cancelar una copia completa descarta la carpeta en preparación."""
+        with self.assertRaises(CopyCancelled):
+            swap_in_copy(self.source, self.target, copy_function=self._cancelling_copy(2),
+                         monitor=CopyMonitor(token=self.token))
+
+        self.assertEqual(read_tree(self.target), {"cfg/0.cfg": "viejo", "sobra.txt": "s"})
+        self.assertEqual(sorted(p.name for p in self.base.iterdir()), ["destino", "origen"])
+
+    def test_sync_replaces_files_and_folders_of_other_type(self):
+        """Un archivo que pasa a ser carpeta (y al revés) se sustituye."""
+        write_tree(self.target, {"cfg/3.cfg/dentro.txt": "d", "sub": "archivo"})
+        write_tree(self.source, {"sub/nuevo.cfg": "n"})
+
+        sync_tree(self.source, self.target)
+        self.assertEqual(read_tree(self.target), read_tree(self.source))
+
+    def test_copy_configuration_reports_cancellation(self):
+        """FileCopyService devuelve un error de cancelación y no toca el destino."""
+        operation = CopyOperation(SteamAccount("100", "Origen", self.source),
+                                  SteamAccount("200", "Destino", self.target))
+        self.token.cancel()
+        success, message = FileCopyService(enable_backup=False).copy_configuration(
+            operation, cancel_token=self.token)
+
+        self.assertFalse(success)
+        self.assertIn("cancelada", message)
+        self.assertEqual(read_tree(self.target), {"cfg/0.cfg": "viejo", "sobra.txt": "s"})
+
+
+class TestSwapInCopy(unittest.TestCase):
+    """Tests para la copia preparada con intercambio de carpetas."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.source = self.base / "origen"
+        self.target = self.base / "570"
+        write_tree(self.source, {"cfg/nuevo.cfg": "nuevo"})
+        write_tree(self.target, {"cfg/viejo.cfg": "viejo"})
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _siblings(self) -> list:
+        return sorted(p.name for p in self.base.iterdir() if p.name not in ("origen", "570"))
+
+    def test_swap_keeps_previous_tree_aside(self):
+        """El destino pasa a ser la copia y el árbol anterior queda apartado."""
+        retired = swap_in_copy(self.source, self.target)
+
+        self.assertEqual(read_tree(self.target), {"cfg/nuevo.cfg": "nuevo"})
+        self.assertEqual(read_tree(retired), {"cfg/viejo.cfg": "viejo"})
+        self.assertTrue(retired.name.startswith("570" + RETIRED_SUFFIX))
+
+    def test_failed_copy_leaves_target_intact(self):
+        """Si la copia falla a mitad, el destino no se toca."""
+        def failing_copy(src, dst, **kwargs):
+            Path(dst).write_text("a medias")
+            raise OSError("disco lleno")
+
+        with self.assertRaises(OSError):
+            swap_in_copy(self.source, self.target, copy_function=failing_copy)
+
+        self.assertEqual(read_tree(self.target), {"cfg/viejo.cfg": "viejo"})
+        self.assertEqual(self._siblings(), [])
+
+    def test_recover_after_interrupted_swap(self):
+        """Un intercambio cortado entre los dos renombrados se repara."""
+        retired = swap_in_copy(self.source, self.target)
+        # Simular el corte: el destino aún no estaba en su sitio
+        os.rename(self.target, self.target.with_name("570" + STAGING_SUFFIX))
+
+        recover_interrupted_swap(self.target)
+
+        self.assertEqual(read_tree(self.target), {"cfg/viejo.cfg": "viejo"})
+        self.assertFalse(retired.exists())
+        self.assertEqual(self._siblings(), [])
+
+
+class TestFileCopySync(unittest.TestCase):
+    """Tests para el modo sincronización de FileCopyService."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self._temp_dir.name)
+        write_tree(base / "100" / "570", {"remote/cfg/dotakeys.vcfg": "origen"})
+        write_tree(base / "200" / "570", {"remote/cfg/dotakeys.vcfg": "destino",
+                                          "remote/cfg/sobra.txt": "x"})
+        self.operation = CopyOperation(SteamAccount("100", "Origen", base / "100" / "570"),
+                                       SteamAccount("200", "Destino", base / "200" / "570"),
+                                       backup_enabled=False)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_copy_uses_sync_on_existing_destination(self):
+        """La copia sobre un destino existente no lo borra entero."""
+        service = FileCopyService()
+        with patch("src.core.config_service.shutil.rmtree") as rmtree:
+            success, _ = service.copy_configuration(self.operation)
+
+        self.assertTrue(success)
+        rmtree.assert_not_called()
+        self.assertEqual(read_tree(self.operation.destino.ruta),
+                         read_tree(self.operation.origen.ruta))
+        self.assertEqual((service.last_sync_stats.updated, service.last_sync_stats.deleted), (1, 1))
+
+    def test_full_copy_mode_is_still_available(self):
+        """Con sync_mode=False se mantiene la copia completa."""
+        service = FileCopyService(sync_mode=False)
+        success, _ = service.copy_configuration(self.operation)
+        service.wait_for_cleanup()
+
+        self.assertTrue(success)
+        self.assertIsNone(service.last_sync_stats)
+        self.assertEqual(read_tree(self.operation.destino.ruta),
+                         read_tree(self.operation.origen.ruta))
+        # El árbol anterior se eliminó en segundo plano
+        self.assertEqual(sorted(p.name for p in self.operation.destino.ruta.parent.iterdir()),
+                         ["570"])
+
+    def test_full_copy_moves_previous_tree_to_backup(self):
+        """Con backup, el árbol anterior se mueve a la carpeta de backups sin copiarlo."""
+        cwd = os.getcwd()
+        os.chdir(self._temp_dir.name)
+        try:
+            self.operation.backup_enabled = True
+            service = FileCopyService(sync_mode=False, backup_format="tree")
+            with patch.object(FileCopyService, "_create_backup",
+                              side_effect=AssertionError("backup copiado")):
+                success, _ = service.copy_configuration(self.operation)
+            backups = service.list_backups("200")
+        finally:
+            os.chdir(cwd)
+
+        self.assertTrue(success)
+        self.assertEqual(len(backups), 1)
+        self.assertEqual(read_tree(backups[0].path)["remote/cfg/sobra.txt"], "x")
+
+
+if __name__ == "__main__":
+    unittest.main()
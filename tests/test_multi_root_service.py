@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la detección sobre varias instalaciones de Steam.
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.core.account_watcher import AccountChangeEvent, AccountWatcher
+from src.core.multi_root_service import MultiRootAccountService
+from src.core.steam_probe import clear_probe_cache
+from src.core.steam_session import SteamSession
+from src.models.domain_models import AppConfig, SteamAccount
+from tests.test_steam_service import create_fake_steam, make_service
+
+
+class TestMultiRootDiscovery(unittest.TestCase):
+    """Tests para MultiRootAccountService y SteamSession.discovery_service."""
+
+    def setUp(self):
+        """Crea una instalación principal y otra secundaria con un SteamID repetido."""
+        clear_probe_cache()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self._temp_dir.name)
+        self.primary = create_fake_steam(base / "Steam", {"100": "Principal", "300": "Repetida"})
+        self.secondary = create_fake_steam(base / "Biblioteca", {"200": "Secundaria",
+                                                                 "300": "Copia"})
+
+    def tearDown(self):
+        clear_probe_cache()
+        self._temp_dir.cleanup()
+
+    def _service(self) -> MultiRootAccountService:
+        return MultiRootAccountService([make_service(self.primary), make_service(self.secondary)])
+
+    def test_accounts_from_all_roots_are_merged(self):
+        """Se combinan las cuentas de ambas raíces sin SteamIDs repetidos."""
+        accounts = self._service().find_accounts_with_dota2()
+
+        by_id = {account.steamid: account for account in accounts}
+        self.assertEqual(sorted(by_id), ["100", "200", "300"])
+        self.assertEqual(len(accounts), 3)
+        self.assertEqual(by_id["100"].steam_root, self.primary)
+        self.assertEqual(by_id["200"].steam_root, self.secondary)
+        # Ante un conflicto gana la instalación principal
+        self.assertEqual(by_id["300"].nombre, "Repetida")
+        self.assertEqual(by_id["300"].steam_root, self.primary)
+
+    def test_merged_accounts_keep_folder_order(self):
+        """La combinación sigue el orden por SteamID en el que apply_events inserta."""
+        accounts = self._service().find_accounts_with_dota2()
+        self.assertEqual([account.steamid for account in accounts], ["100", "200", "300"])
+
+        nueva = SteamAccount("250", "Nueva", Path("/250/570"))
+        updated = AccountWatcher.apply_events(accounts, [AccountChangeEvent("added", "250", nueva)])
+        self.assertEqual([account.steamid for account in updated], ["100", "200", "250", "300"])
+
+    def test_enrichment_uses_the_account_root(self):
+        """Cada cuenta se enriquece con el servicio de su propia instalación."""
+        service = self._service()
+        accounts = service.list_accounts_with_dota2()
+        self.assertFalse(any(account.enriched for account in accounts))
+
+        enriched = list(service.enrich_accounts(accounts))
+
+        self.assertEqual(len(enriched), 3)
+        names = {account.steamid: account.nombre for account in accounts}
+        self.assertEqual(names, {"100": "Principal", "200": "Secundaria", "300": "Repetida"})
+
+    def test_session_adds_valid_extra_roots(self):
+        """La sesión incluye las raíces adicionales válidas y descarta el resto."""
+        config = AppConfig(custom_steam_path=str(self.primary),
+                           extra_steam_paths=[str(self.secondary), str(self.primary),
+                                              str(self.secondary / "inexistente")])
+        session = SteamSession(config)
+
+        self.assertEqual(session.steam_roots, [self.primary, self.secondary])
+        service = session.discovery_service
+        self.assertIsInstance(service, MultiRootAccountService)
+        self.assertIs(service.primary, session.account_service)
+        self.assertEqual(len(service.find_accounts_with_dota2()), 3)
+
+    def test_single_root_uses_account_service(self):
+        """Sin raíces adicionales la detección usa el servicio de siempre."""
+        session = SteamSession(AppConfig(custom_steam_path=str(self.primary)))
+        self.assertIs(session.discovery_service, session.account_service)
+
+    def test_extra_paths_are_persisted(self):
+        """La ruta personalizada y las raíces adicionales se guardan en disco."""
+        config_file = Path(self._temp_dir.name) / "config.json"
+        config = AppConfig(custom_steam_path=str(self.primary),
+                           extra_steam_paths=[str(self.secondary)])
+        self.assertTrue(config.save_to_file(config_file))
+
+        loaded = AppConfig.load_from_file(config_file)
+        self.assertEqual(loaded.custom_steam_path, str(self.primary))
+        self.assertEqual(loaded.extra_steam_paths, [str(self.secondary)])
+        self.assertIn("extra_steam_paths", json.loads(config_file.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la estimación de tamaño y la comprobación de espacio libre.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.core.config_service import FileCopyService
+from src.models.domain_models import CopyOperation, SteamAccount
+from src.utils.copy_filter import CopyFilter
+from src.utils.size_estimator import SizeEstimator
+from tests.test_fs_utils import read_tree, write_tree
+
+
+class TestSizeEstimator(unittest.TestCase):
+    """Tests para SizeEstimator."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name) / "570"
+        write_tree(self.root, {
+            "remote/cfg/dotakeys.vcfg": "12345",
+            "remote/cfg/video.txt": "123",
+            "local/cache/grande.bin": "1234567890",
+        })
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_totals(self):
+        """Suma tamaños, archivos y carpetas, en secuencia y en paralelo."""
+        for workers in (1, 4):
+            stats = SizeEstimator(max_workers=workers).estimate(self.root)
+            self.assertEqual((stats.size, stats.file_count, stats.dir_count), (18, 3, 4))
+            self.assertEqual(stats.unreadable, [])
+
+    def test_unchanged_folders_come_from_cache(self):
+        """Sólo se vuelven a listar las carpetas cuyo mtime cambió."""
+        estimator = SizeEstimator()
+        estimator.estimate(self.root)
+        self.assertEqual(estimator.last_scanned, 5)
+
+        self.assertEqual(estimator.estimate(self.root).size, 18)
+        self.assertEqual(estimator.last_scanned, 0)
+
+        write_tree(self.root, {"remote/cfg/nuevo.cfg": "12"})
+        self.assertEqual(estimator.estimate(self.root).size, 20)
+        self.assertEqual(estimator.last_scanned, 1)
+
+        estimator.invalidate(self.root / "remote")
+        estimator.estimate(self.root)
+        self.assertEqual(estimator.last_scanned, 2)
+
+    def test_filter(self):
+        """Lo excluido por el filtro no cuenta."""
+        estimator = SizeEstimator(CopyFilter(["*.vcfg"], ["cache"]))
+        stats = estimator.estimate(self.root)
+        self.assertEqual((stats.size, stats.file_count), (5, 1))
+
+    def test_missing_root(self):
+        """Una raíz que no existe se informa como ilegible."""
+        missing = self.root / "no_existe"
+        stats = SizeEstimator().estimate(missing)
+        self.assertEqual((stats.size, stats.unreadable), (0, [str(missing)]))
+
+
+class TestDiskSpacePreflight(unittest.TestCase):
+    """Tests para la comprobación de espacio libre de FileCopyService."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        self.source = self.base / "origen" / "570"
+        self.target = self.base / "destino" / "570"
+        write_tree(self.source, {"remote/cfg/dotakeys.vcfg": "x" * 1000})
+        write_tree(self.target, {"remote/cfg/dotakeys.vcfg": "y" * 400})
+        self.operation = CopyOperation(SteamAccount("100", "Origen", self.source),
+                                       SteamAccount("200", "Destino", self.target))
+        self._cwd = os.getcwd()
+        os.chdir(self.base)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._temp_dir.cleanup()
+
+    def test_plan_counts_copy_and_backup(self):
+        """En un mismo volumen se suman la copia y el backup."""
+        service = FileCopyService(backup_format="zip")
+        self.assertEqual(list(service.plan_disk_usage(self.operation).values()), [1400])
+
+        service = FileCopyService(enable_backup=False)
+        self.assertEqual(list(service.plan_disk_usage(self.operation).values()), [1000])
+
+    def test_copy_refused_without_space(self):
+        """Sin espacio libre la copia no empieza y el destino no cambia."""
+        service = FileCopyService(backup_format="zip")
+        usage = shutil.disk_usage(self.base)._replace(free=1024)
+        with mock.patch("src.core.config_service.shutil.disk_usage", return_value=usage):
+            success, message = service.copy_configuration(self.operation)
+
+        self.assertFalse(success)
+        self.assertIn("Espacio insuficiente", message)
+        self.assertEqual(read_tree(self.target), {"remote/cfg/dotakeys.vcfg": "y" * 400})
+        self.assertEqual(service.list_backups("200"), [])
+
+    def test_preflight_can_be_disabled(self):
+        """Con preflight=False no se consulta el espacio libre."""
+        service = FileCopyService(enable_backup=False, preflight=False)
+        with mock.patch("src.core.config_service.shutil.disk_usage") as disk_usage:
+            success, _ = service.copy_configuration(self.operation)
+        self.assertTrue(success)
+        disk_usage.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la caché de metadatos del sistema de archivos.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from src.utils.stat_cache import (
+    StatCache, StatScope, active_stat_cache, bind_stat_cache, path_exists,
+    dir_has_entries, invalidate_path
+)
+from src.core.steam_service import SteamAccountService
+from src.models.domain_models import SteamAccount
+
+
+class TestStatCache(unittest.TestCase):
+    """Tests para StatCache y StatScope."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self._temp_dir.name)
+        (self.base / "570").mkdir()
+        (self.base / "570" / "config.cfg").write_text("x")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_repeated_checks_hit_the_cache(self):
+        """Las comprobaciones repetidas de una ruta sólo hacen un stat."""
+        cache = StatCache(ttl=60)
+
+        with patch("src.utils.stat_cache.os.stat", wraps=os.stat) as stat:
+            self.assertTrue(cache.exists(self.base / "570"))
+            self.assertTrue(cache.is_dir(self.base / "570"))
+            self.assertFalse(cache.exists(self.base / "otra"))
+            self.assertFalse(cache.exists(self.base / "otra"))
+
+        self.assertEqual(stat.call_count, 2)
+        self.assertEqual(cache.hits, 2)
+
+    def test_entries_expire_after_ttl(self):
+        """Con TTL cero cada consulta vuelve al disco."""
+        cache = StatCache(ttl=0)
+        cache.exists(self.base)
+        cache.exists(self.base)
+        self.assertEqual(cache.misses, 2)
+
+    def test_invalidate_covers_children_and_parent(self):
+        """Invalidar una carpeta descarta su contenido y su carpeta padre."""
+        cache = StatCache(ttl=60)
+        folder = self.base / "570"
+        for path in (self.base, folder, folder / "config.cfg"):
+            cache.exists(path)
+        self.assertTrue(cache.has_entries(folder))
+
+        (folder / "config.cfg").unlink()
+        folder.rmdir()
+        cache.invalidate(folder)
+
+        self.assertFalse(cache.exists(folder / "config.cfg"))
+        self.assertFalse(cache.exists(folder))
+        self.assertFalse(cache.has_entries(folder))
+
+    def test_scope_is_shared_and_nested(self):
+        """Los ámbitos anidados comparten caché y se cierran con el exterior."""
+        self.assertIsNone(active_stat_cache())
+
+        with StatScope() as outer:
+            with StatScope() as inner:
+                self.assertIs(inner, outer)
+            self.assertTrue(path_exists(self.base / "570"))
+            self.assertIs(active_stat_cache(), outer)
+
+            self.assertFalse(path_exists(self.base / "nueva"))
+            (self.base / "nueva").mkdir()
+            self.assertFalse(path_exists(self.base / "nueva"))
+            invalidate_path(self.base / "nueva")
+            self.assertTrue(path_exists(self.base / "nueva"))
+
+        self.assertIsNone(active_stat_cache())
+        self.assertTrue(dir_has_entries(self.base / "570"))
+
+    def test_lookup_started_before_invalidate_is_not_stored(self):
+        """Un stat que termina después de invalidar no deja su resultado en caché."""
+        cache = StatCache(ttl=60)
+        folder = self.base / "nueva"
+        real_stat = os.stat
+
+        def stat_then_create(path, *args, **kwargs):
+            # La carpeta se crea e invalida mientras el stat está en curso
+            try:
+                return real_stat(path, *args, **kwargs)
+            finally:
+                folder.mkdir()
+                cache.invalidate(folder)
+
+        with patch("src.utils.stat_cache.os.stat", side_effect=stat_then_create):
+            self.assertFalse(cache.exists(folder))
+        self.assertTrue(cache.exists(folder))
+
+    def test_scopes_of_other_threads_are_independent(self):
+        """Un ámbito no se comparte con otro hilo salvo que se le pase explícitamente."""
+        entered = threading.Event()
+        release = threading.Event()
+        seen = {}
+
+        def other_operation():
+            with StatScope() as cache:
+                seen["other"] = cache
+                entered.set()
+                release.wait(5)
+            seen["after"] = active_stat_cache()
+
+        thread = threading.Thread(target=other_operation)
+        with StatScope() as cache:
+            thread.start()
+            entered.wait(5)
+            self.assertIsNot(seen["other"], cache)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                self.assertIsNone(executor.submit(active_stat_cache).result())
+                self.assertIs(executor.submit(bind_stat_cache(active_stat_cache)).result(), cache)
+        self.assertIsNone(active_stat_cache())
+        release.set()
+        thread.join(5)
+        self.assertIsNone(seen["after"])
+
+    def test_validate_account_without_listing_directory(self):
+        """validate_account comprueba que la carpeta no esté vacía sin listarla."""
+        account = SteamAccount("100", "Cuenta", self.base / "570")
+        service = SteamAccountService()
+
+        with patch.object(Path, "iterdir", side_effect=AssertionError("iterdir() llamado")):
+            with StatScope() as cache:
+                self.assertTrue(service.validate_account(account))
+                self.assertTrue(service.validate_account(account))
+
+        self.assertGreater(cache.hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la comprobación concurrente de rutas de Steam.
+"""
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.core.steam_probe import probe_steam_candidates, probe_steam_paths, clear_probe_cache
+from src.core.steam_service import SteamAccountService
+from tests.test_steam_service import create_fake_steam
+
+
+class TestSteamProbe(unittest.TestCase):
+    """Tests para probe_steam_paths."""
+
+    def setUp(self):
+        clear_probe_cache()
+
+    def tearDown(self):
+        clear_probe_cache()
+
+    def test_candidates_are_probed_concurrently(self):
+        """Las rutas se comprueban a la vez y se respeta el orden."""
+        # Sólo se pasa la barrera si las tres comprobaciones están en curso a la vez
+        barrier = threading.Barrier(3, timeout=5)
+
+        def probe(path):
+            barrier.wait()
+            return [path] if path != "B" else []
+
+        result = probe_steam_paths(["A", "B", "C"], probe, timeout=10)
+
+        self.assertEqual(result, ["A", "C"])
+        self.assertFalse(barrier.broken)
+
+    def test_stalled_candidate_is_skipped_after_timeout(self):
+        """Una ruta que no responde se descarta sin bloquear al resto."""
+        release = threading.Event()
+        stalled_finished = threading.Event()
+
+        def probe(path):
+            if path == "dormida":
+                release.wait(30)
+                stalled_finished.set()
+            return [path]
+
+        try:
+            result = probe_steam_candidates(["dormida", "C"], probe, timeout=0.1)
+            # La respuesta llegó mientras la ruta dormida seguía bloqueada
+            self.assertFalse(stalled_finished.is_set())
+        finally:
+            release.set()
+
+        self.assertEqual((result.valid_paths, result.timed_out), (["C"], ["dormida"]))
+
+    def test_answer_is_cached_per_candidate_list(self):
+        """La misma lista de candidatas no se vuelve a comprobar salvo refresh."""
+        calls = []
+
+        def probe(path):
+            calls.append(path)
+            return [path]
+
+        probe_steam_paths(["A", "B"], probe)
+        probe_steam_paths(["A", "B"], probe)
+        self.assertEqual(sorted(calls), ["A", "B"])
+
+        probe_steam_paths(["A", "B"], probe, refresh=True)
+        self.assertEqual(len(calls), 4)
+
+    def test_timed_out_answer_is_reported_and_not_cached(self):
+        """Una candidata sin respuesta se informa aparte y se vuelve a comprobar."""
+        release = threading.Event()
+        calls = []
+
+        def probe(path):
+            calls.append(path)
+            if len(calls) == 1:
+                release.wait(5)
+            return [path]
+
+        try:
+            result = probe_steam_candidates(["dormida"], probe, timeout=0.05)
+        finally:
+            release.set()
+        self.assertEqual((result.valid_paths, result.timed_out), ([], ["dormida"]))
+
+        result = probe_steam_candidates(["dormida"], probe)
+        self.assertEqual((result.valid_paths, result.timed_out), (["dormida"], []))
+        self.assertEqual(len(calls), 2)
+
+    def test_cache_is_per_probe_function(self):
+        """La misma lista con otra función de sondeo no reutiliza la respuesta."""
+        self.assertEqual(probe_steam_paths(["A"], lambda path: [path]), ["A"])
+        self.assertEqual(probe_steam_paths(["A"], lambda path: []), [])
+
+    def test_service_validates_through_probe(self):
+        """SteamAccountService valida rutas mediante el motor de sondeo."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            steam_root = create_fake_steam(Path(temp_dir), {})
+            service = SteamAccountService()
+
+            self.assertTrue(service.is_valid_steam_path(str(steam_root)))
+            self.assertFalse(service.is_valid_steam_path(str(steam_root / "otra")))
+            self.assertFalse(service.is_valid_steam_path(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
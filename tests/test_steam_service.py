@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la detección de cuentas de SteamAccountService.
+
+Construye instalaciones de Steam simuladas en directorios temporales
+para validar la detección sin depender de una instalación real.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.steam_service import (
+    SteamAccountService, scan_persona_name, load_login_user_names
+)
+from src.core.account_index import AccountIndex
+from src.core.avatar_index import AvatarIndex
+
+STEAMID64_BASE = 76561197960265728
+
+
+def create_fake_steam(root: Path, accounts: dict, avatars=()) -> Path:
+    """
+    Crea una instalación de Steam simulada.
+
+    Args:
+        root: Directorio donde crear la instalación
+        accounts: Mapa steamid -> PersonaName (None para cuentas sin Dota 2)
+        avatars: Steam IDs que tendrán avatar en caché
+
+    Returns:
+        Ruta de la instalación simulada
+    """
+    (root / "steamapps").mkdir(parents=True, exist_ok=True)
+    (root / "steam.exe").touch()
+    avatar_dir = root / "config" / "avatarcache"
+    avatar_dir.mkdir(parents=True, exist_ok=True)
+
+    for steamid, nombre in accounts.items():
+        user_path = root / "userdata" / steamid
+        (user_path / "config").mkdir(parents=True, exist_ok=True)
+        if nombre is None:
+            continue
+        (user_path / "570" / "remote" / "cfg").mkdir(parents=True, exist_ok=True)
+        (user_path / "570" / "remote" / "cfg" / "dotakeys.vcfg").write_text("keys")
+        (user_path / "config" / "localconfig.vdf").write_text(
+            '"UserLocalConfigStore"\n{\n\t"friends"\n\t{\n'
+            f'\t\t"PersonaName"\t\t"{nombre}"\n\t}}\n}}\n',
+            encoding="utf-8"
+        )
+
+    for steamid in avatars:
+        (avatar_dir / f"{int(steamid) + STEAMID64_BASE}.png").write_bytes(b"png")
+
+    return root
+
+
+def write_login_users(root: Path, names: dict) -> Path:
+    """
+    Escribe config/loginusers.vdf con los nombres indicados.
+
+    Args:
+        root: Instalación de Steam simulada
+        names: Mapa Steam3 ID -> PersonaName
+
+    Returns:
+        Ruta del archivo escrito
+    """
+    users = "".join(
+        f'\t"{int(steamid) + STEAMID64_BASE}"\n\t{{\n'
+        f'\t\t"AccountName"\t\t"cuenta{steamid}"\n'
+        f'\t\t"PersonaName"\t\t"{nombre}"\n\t}}\n'
+        for steamid, nombre in names.items()
+    )
+    path = root / "config" / "loginusers.vdf"
+    path.write_text(f'"users"\n{{\n{users}}}\n', encoding="utf-8")
+    return path
+
+
+def make_service(steam_root: Path, **kwargs) -> SteamAccountService:
+    """Crea un servicio apuntando a la instalación simulada."""
+    service = SteamAccountService(str(steam_root), **kwargs)
+    service.avatar_cache_path = steam_root / "config" / "avatarcache"
+    return service
+
+
+class TestAccountDiscovery(unittest.TestCase):
+    """Tests para find_accounts_with_dota2."""
+
+    def setUp(self):
+        """Crea una instalación simulada con varias cuentas."""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.steam_root = create_fake_steam(
+            Path(self._temp_dir.name),
+            {"300": "Tercera", "100": "Primera", "200": "Segunda", "400": None},
+            avatars=("100",)
+        )
+        self.service = make_service(self.steam_root)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_parallel_discovery_is_deterministic(self):
+        """La detección concurrente devuelve cuentas ordenadas por carpeta."""
+        accounts = self.service.find_accounts_with_dota2(parallel=True, max_workers=4)
+
+        self.assertEqual([a.steamid for a in accounts], ["100", "200", "300"])
+        self.assertEqual([a.nombre for a in accounts], ["Primera", "Segunda", "Tercera"])
+        self.assertIsNotNone(accounts[0].avatar)
+        self.assertIsNone(accounts[1].avatar)
+
+    def test_parallel_matches_sequential(self):
+        """Los modos secuencial y paralelo producen el mismo resultado."""
+        sequential = self.service.find_accounts_with_dota2(parallel=False)
+        parallel = self.service.find_accounts_with_dota2(parallel=True)
+
+        self.assertEqual([(a.steamid, a.nombre, a.ruta, a.avatar) for a in sequential],
+                         [(a.steamid, a.nombre, a.ruta, a.avatar) for a in parallel])
+
+    def test_errors_are_isolated_per_folder(self):
+        """Un error inesperado en una carpeta no detiene la detección."""
+        original = SteamAccountService._process_steam_folder
+
+        def failing(service, folder_name):
+            if folder_name == "200":
+                raise RuntimeError("fallo simulado")
+            return original(service, folder_name)
+
+        with patch.object(SteamAccountService, "_process_steam_folder", failing):
+            accounts = self.service.find_accounts_with_dota2()
+
+        self.assertEqual([a.steamid for a in accounts], ["100", "300"])
+
+    def test_streaming_discovery_yields_in_order(self):
+        """iter_accounts_with_dota2 entrega las cuentas una a una y en orden."""
+        stream = self.service.iter_accounts_with_dota2()
+
+        first = next(stream)
+        self.assertEqual(first.steamid, "100")
+        self.assertEqual([a.steamid for a in stream], ["200", "300"])
+
+    def test_streaming_discovery_can_stop_early(self):
+        """Cerrar el generador antes de terminar no produce errores."""
+        stream = self.service.iter_accounts_with_dota2(max_workers=2)
+        self.assertEqual(next(stream).steamid, "100")
+        stream.close()
+
+    def test_fast_listing_does_not_read_files(self):
+        """La fase rápida lista las cuentas con nombre provisional sin leer VDF."""
+        with patch.object(SteamAccountService, "_extract_username") as extract, \
+                patch.object(SteamAccountService, "_find_avatar") as find_avatar:
+            accounts = self.service.list_accounts_with_dota2()
+
+        extract.assert_not_called()
+        find_avatar.assert_not_called()
+        self.assertEqual([a.steamid for a in accounts], ["100", "200", "300"])
+        self.assertTrue(all(not a.enriched and a.avatar is None for a in accounts))
+
+    def test_enrichment_resolves_accounts_in_place(self):
+        """El enriquecimiento completa nombre y avatar sobre los mismos objetos."""
+        accounts = self.service.list_accounts_with_dota2()
+        primera = accounts[0]
+
+        self.assertIs(self.service.enrich_account(primera), primera)
+        self.assertEqual(primera.nombre, "Primera")
+        self.assertTrue(primera.has_avatar)
+
+        with patch.object(SteamAccountService, "_extract_username",
+                          wraps=self.service._extract_username) as extract:
+            enriched = list(self.service.enrich_accounts(accounts, max_workers=2))
+
+        self.assertEqual(extract.call_count, 2)
+        self.assertEqual([a.nombre for a in enriched], ["Segunda", "Tercera"])
+        self.assertTrue(all(a.enriched for a in accounts))
+
+    def test_concurrent_enrichment_keeps_first_result(self):
+        """Si la cuenta se resolvió en otro hilo mientras tanto, no se sobrescribe."""
+        accounts = self.service.list_accounts_with_dota2()
+        primera = accounts[0]
+        stale = self.service._process_folder_safely(primera.steamid)
+
+        self.service.enrich_account(primera)
+        primera.nombre = "Resuelta antes"
+        self.service._apply_enrichment(primera, stale)
+
+        self.assertEqual(primera.nombre, "Resuelta antes")
+
+    def test_missing_installation_returns_empty(self):
+        """Sin userdata no se detectan cuentas."""
+        service = make_service(self.steam_root / "inexistente")
+        self.assertEqual(service.find_accounts_with_dota2(), [])
+
+
+class TestPersonaNameScan(unittest.TestCase):
+    """Tests para la extracción por bloques de PersonaName."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.vdf = Path(self._temp_dir.name) / "localconfig.vdf"
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_name_split_across_chunks(self):
+        """El nombre se encuentra aunque quede partido entre dos bloques."""
+        padding = '"x"\t\t"' + "a" * 5000 + '"\n'
+        self.vdf.write_text(padding + '\t"PersonaName"\t\t"Jugadór"\n', encoding="utf-8")
+
+        for chunk_size in (7, 64, 5003, 5010, 1 << 16):
+            self.assertEqual(scan_persona_name(self.vdf, chunk_size=chunk_size), "Jugadór")
+
+    def test_missing_name_returns_none(self):
+        """Sin PersonaName el escáner devuelve None."""
+        self.vdf.write_text('"UserLocalConfigStore"\n{\n}\n')
+        self.assertIsNone(scan_persona_name(self.vdf, chunk_size=8))
+
+    def test_extract_username_without_config(self):
+        """Sin localconfig.vdf el nombre es "Desconocido"."""
+        service = SteamAccountService()
+        self.assertEqual(service._extract_username(Path(self._temp_dir.name)), "Desconocido")
+
+
+class TestAvatarIndex(unittest.TestCase):
+    """Tests para el índice del caché de avatares."""
+
+    def setUp(self):
+        """Crea una instalación con avatar para una de dos cuentas."""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.steam_root = create_fake_steam(Path(self._temp_dir.name),
+                                            {"100": "Primera", "200": "Segunda"},
+                                            avatars=("100",))
+        self.avatar_dir = self.steam_root / "config" / "avatarcache"
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_scan_indexes_only_avatar_files(self):
+        """Sólo se indexan archivos <SteamID64>.png, con tamaño y fecha."""
+        (self.avatar_dir / "notas.txt").write_text("x")
+        (self.avatar_dir / "abc.png").write_bytes(b"x")
+
+        index = AvatarIndex(self.avatar_dir).scan()
+        entry = index.get(str(100 + STEAMID64_BASE))
+
+        self.assertEqual(len(index), 1)
+        self.assertEqual(entry.size, 3)
+        self.assertEqual(entry.stamp, (entry.mtime_ns, 3))
+        self.assertIsNone(index.get(str(200 + STEAMID64_BASE)))
+
+    def test_accounts_resolve_avatars_against_index(self):
+        """has_avatar consulta el índice y resolve_folder lo actualiza."""
+        service = make_service(self.steam_root)
+        primera, segunda = service.find_accounts_with_dota2()
+
+        self.assertTrue(primera.has_avatar)
+        self.assertFalse(segunda.has_avatar)
+        self.assertIsNotNone(primera.avatar_stamp)
+
+        (self.avatar_dir / f"{100 + STEAMID64_BASE}.png").unlink()
+        with patch.object(Path, "exists", side_effect=AssertionError("exists() llamado")):
+            self.assertTrue(primera.has_avatar)
+
+        self.assertIsNone(service.resolve_folder("100").avatar)
+        self.assertFalse(primera.has_avatar)
+
+
+class TestLoginUsers(unittest.TestCase):
+    """Tests para la resolución de nombres mediante loginusers.vdf."""
+
+    def setUp(self):
+        """Crea una instalación con loginusers.vdf que cubre sólo una cuenta."""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.steam_root = create_fake_steam(Path(self._temp_dir.name),
+                                            {"100": "Local1", "200": "Local2"})
+        self.login_users = write_login_users(self.steam_root, {"100": "Global1"})
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _scan_tracking_reads(self, service):
+        """Detecta cuentas registrando qué localconfig.vdf se leyeron."""
+        reads = []
+
+        def tracking(config_path, chunk_size=None):
+            reads.append(config_path.parent.parent.name)
+            return scan_persona_name(config_path)
+
+        with patch("src.core.steam_service.scan_persona_name", tracking):
+            accounts = service.find_accounts_with_dota2()
+        return accounts, reads
+
+    def test_load_login_user_names(self):
+        """Los SteamID64 se traducen a los Steam3 ID de las carpetas."""
+        self.assertEqual(load_login_user_names(self.login_users), {"100": "Global1"})
+        self.assertEqual(load_login_user_names(self.steam_root / "no.vdf"), {})
+
+    def test_localconfig_read_only_for_misses(self):
+        """Sólo se lee localconfig.vdf de las cuentas ausentes en loginusers.vdf."""
+        accounts, reads = self._scan_tracking_reads(make_service(self.steam_root))
+
+        self.assertEqual([a.nombre for a in accounts], ["Global1", "Local2"])
+        self.assertEqual(reads, ["200"])
+
+    def test_changed_login_users_invalidates_index(self):
+        """Un cambio en loginusers.vdf actualiza los nombres indexados."""
+        index_file = Path(self._temp_dir.name) / "account_index.json"
+        make_service(self.steam_root, account_index=AccountIndex(index_file)).find_accounts_with_dota2()
+
+        write_login_users(self.steam_root, {"100": "Global1", "200": "Global2 nuevo"})
+        service = make_service(self.steam_root, account_index=AccountIndex(index_file))
+        accounts, reads = self._scan_tracking_reads(service)
+
+        self.assertEqual([a.nombre for a in accounts], ["Global1", "Global2 nuevo"])
+        self.assertEqual(reads, [])
+
+
+    def test_login_users_change_only_reresolves_names(self):
+        """Un cambio en loginusers.vdf no reprocesa las carpetas indexadas."""
+        index_file = Path(self._temp_dir.name) / "account_index.json"
+        make_service(self.steam_root, account_index=AccountIndex(index_file)).find_accounts_with_dota2()
+
+        write_login_users(self.steam_root, {"200": "Global2"})
+        service = make_service(self.steam_root, account_index=AccountIndex(index_file))
+        with patch.object(SteamAccountService, "_process_steam_folder",
+                          wraps=service._process_steam_folder) as process:
+            accounts, reads = self._scan_tracking_reads(service)
+
+        # "100" salió de loginusers.vdf: sólo esa cuenta vuelve a su localconfig.vdf
+        self.assertEqual([a.nombre for a in accounts], ["Local1", "Global2"])
+        self.assertEqual(reads, ["100"])
+        self.assertEqual([call.args[0] for call in process.call_args_list], ["100"])
+
+class TestAccountIndex(unittest.TestCase):
+    """Tests para el índice persistente de cuentas."""
+
+    def setUp(self):
+        """Crea una instalación simulada y un archivo de índice temporal."""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self._temp_dir.name)
+        self.steam_root = create_fake_steam(base / "Steam", {"100": "Primera", "200": "Segunda"})
+        self.index_file = base / "account_index.json"
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _scan(self):
+        """Ejecuta una detección con un índice recién cargado desde disco."""
+        service = make_service(self.steam_root, account_index=AccountIndex(self.index_file))
+        return service.find_accounts_with_dota2()
+
+    def test_warm_start_skips_file_reads(self):
+        """Con huellas sin cambios no se vuelve a leer localconfig.vdf."""
+        cold = self._scan()
+        self.assertTrue(self.index_file.exists())
+
+        with patch.object(SteamAccountService, "_extract_username") as extract:
+            warm = self._scan()
+
+        extract.assert_not_called()
+        self.assertEqual([(a.steamid, a.nombre, a.ruta) for a in cold],
+                         [(a.steamid, a.nombre, a.ruta) for a in warm])
+
+    def test_changed_localconfig_is_reparsed(self):
+        """Sólo se reprocesa la carpeta cuya huella cambió."""
+        self._scan()
+
+        config = self.steam_root / "userdata" / "200" / "config" / "localconfig.vdf"
+        config.write_text('"UserLocalConfigStore"\n{\n\t"PersonaName"\t\t"Renombrada"\n}\n')
+
+        original = SteamAccountService._extract_username
+        calls = []
+
+        def tracking(service, user_path):
+            calls.append(user_path.name)
+            return original(service, user_path)
+
+        with patch.object(SteamAccountService, "_extract_username", tracking):
+            accounts = self._scan()
+
+        self.assertEqual(calls, ["200"])
+        self.assertEqual(accounts[1].nombre, "Renombrada")
+
+    def test_removed_folder_is_pruned(self):
+        """Las carpetas eliminadas desaparecen del resultado y del índice."""
+        self._scan()
+
+        shutil.rmtree(self.steam_root / "userdata" / "100")
+        accounts = self._scan()
+
+        self.assertEqual([a.steamid for a in accounts], ["200"])
+
+
+if __name__ == "__main__":
+    unittest.main()
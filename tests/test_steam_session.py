@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para la sesión compartida de Steam.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.steam_config_service import SteamConfigurationService
+from src.core.steam_probe import ProbeResult, clear_probe_cache
+from src.core.steam_service import SteamAccountService
+from src.core.steam_session import SteamSession
+from src.models.domain_models import AppConfig
+from tests.test_steam_service import create_fake_steam
+
+
+class TestSteamSession(unittest.TestCase):
+    """Tests para SteamSession."""
+
+    def setUp(self):
+        """Crea dos instalaciones simuladas."""
+        clear_probe_cache()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self._temp_dir.name)
+        self.primary = create_fake_steam(base / "Steam", {"100": "Primera"})
+        self.secondary = create_fake_steam(base / "Otra", {"200": "Segunda"})
+
+    def tearDown(self):
+        clear_probe_cache()
+        self._temp_dir.cleanup()
+
+    def test_consumers_share_one_resolution(self):
+        """La raíz se resuelve una vez y todos los consumidores la reutilizan."""
+        session = SteamSession(AppConfig())
+
+        with patch.object(SteamAccountService, "get_default_steam_paths",
+                          return_value=[str(self.primary)]) as defaults:
+            config_service = SteamConfigurationService(session.config, session)
+            self.assertTrue(config_service.detect_steam_installation())
+            self.assertTrue(config_service.detect_steam_installation())
+            service = session.account_service
+
+        defaults.assert_called_once()
+        self.assertIs(config_service.steam_service, service)
+        self.assertEqual(service.userdata_dir, self.primary / "userdata")
+        self.assertEqual(Path(service.avatar_cache_path), self.primary / "config" / "avatarcache")
+        self.assertEqual(session.validate_paths(), (True, ""))
+        self.assertEqual([a.steamid for a in service.find_accounts_with_dota2()], ["100"])
+
+    def test_invalid_custom_path_falls_back_to_detection(self):
+        """Una ruta personalizada inválida se descarta en favor de la detectada."""
+        config = AppConfig(custom_steam_path=str(self.primary / "inexistente"))
+
+        with patch.object(SteamAccountService, "get_default_steam_paths",
+                          return_value=[str(self.secondary)]):
+            session = SteamSession(config)
+            self.assertEqual(session.steam_root, self.secondary)
+
+        self.assertEqual(config.custom_steam_path, "")
+
+    def test_custom_path_kept_when_probe_times_out(self):
+        """Una ruta personalizada que no responde a tiempo no se borra."""
+        config = AppConfig(custom_steam_path=str(self.primary))
+        timed_out = ProbeResult(timed_out=[str(self.primary)])
+
+        with patch.object(SteamAccountService, "check_steam_path", return_value=timed_out), \
+                patch.object(SteamAccountService, "get_default_steam_paths",
+                             return_value=[str(self.secondary)]):
+            session = SteamSession(config)
+            self.assertEqual(session.steam_root, self.secondary)
+
+        self.assertEqual(config.custom_steam_path, str(self.primary))
+        self.assertEqual(session.resolve(refresh=True), self.primary)
+
+    def test_set_steam_root_switches_service(self):
+        """Cambiar la instalación crea un nuevo servicio para la nueva raíz."""
+        session = SteamSession(AppConfig(custom_steam_path=str(self.primary)))
+        first = session.account_service
+
+        self.assertFalse(session.set_steam_root(str(self.primary / "inexistente")))
+        self.assertIs(session.account_service, first)
+
+        self.assertTrue(session.set_steam_root(str(self.secondary)))
+        self.assertEqual(session.config.custom_steam_path, str(self.secondary))
+        self.assertIsNot(session.account_service, first)
+        self.assertEqual(session.account_service.userdata_dir, self.secondary / "userdata")
+
+
+if __name__ == "__main__":
+    unittest.main()
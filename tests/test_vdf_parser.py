@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el parser de archivos KeyValues (VDF).
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.core.vdf_parser import (
+    parse, parse_lazy, iter_events, find_value_in_file, VdfNode, VdfParseError,
+    EVENT_KEY_VALUE, EVENT_START, EVENT_END
+)
+
+SAMPLE = r'''
+// Comentario de cabecera
+"UserLocalConfigStore"
+{
+	"friends"
+	{
+		"PersonaName"		"Jugador \"Pro\""
+		"Ruta"		"C:\\Steam"
+	}
+	"apps"
+	{
+		"570"	{ "Playtime" "120" "cloud" "{ \"a\" }" }
+		"730"
+		{
+			"Playtime"		"5"	[$WIN32]
+		}
+	}
+	unquoted	value
+}
+'''
+
+
+class TestVdfParser(unittest.TestCase):
+    """Tests para parse, iter_events y el árbol perezoso."""
+
+    def test_parse_nested_document(self):
+        """El análisis completo respeta anidamiento, escapes y comentarios."""
+        data = parse(SAMPLE)
+        store = data["UserLocalConfigStore"]
+
+        self.assertEqual(store["friends"]["PersonaName"], 'Jugador "Pro"')
+        self.assertEqual(store["friends"]["Ruta"], "C:\\Steam")
+        self.assertEqual(store["apps"]["570"], {"Playtime": "120", "cloud": '{ "a" }'})
+        self.assertEqual(store["apps"]["730"]["Playtime"], "5")
+        self.assertEqual(store["unquoted"], "value")
+
+    def test_event_stream(self):
+        """iter_events emite aperturas, pares y cierres en orden."""
+        events = list(iter_events('"a" { "b" "1" "c" { } }'))
+
+        self.assertEqual(events, [
+            (EVENT_START, "a", None),
+            (EVENT_KEY_VALUE, "b", "1"),
+            (EVENT_START, "c", None),
+            (EVENT_END, None, None),
+            (EVENT_END, None, None),
+        ])
+
+    def test_lazy_tree_only_parses_accessed_blocks(self):
+        """Los sub-bloques no se analizan hasta que se accede a ellos."""
+        root = parse_lazy(SAMPLE)
+        store = root["UserLocalConfigStore"]
+        apps = store["apps"]
+
+        self.assertEqual(store["friends"]["PersonaName"], 'Jugador "Pro"')
+        self.assertIsInstance(apps, VdfNode)
+        self.assertFalse(apps.is_materialized)
+        self.assertEqual(root.get_path("UserLocalConfigStore", "apps", "570", "Playtime"), "120")
+        self.assertFalse(apps.is_materialized)
+        self.assertEqual(len(apps), 2)
+        self.assertTrue(apps.is_materialized)
+        self.assertFalse(apps["730"].is_materialized)
+        self.assertFalse(store.is_materialized)
+        self.assertEqual(store["unquoted"], "value")
+
+    def test_lazy_tree_matches_full_parse(self):
+        """Materializar el árbol perezoso equivale al análisis completo."""
+        self.assertEqual(parse_lazy(SAMPLE).to_dict(), parse(SAMPLE))
+
+    def test_invalid_documents_raise(self):
+        """Las estructuras inválidas producen VdfParseError."""
+        for text in ('"a" { "b" "1"', '"a" }', '"a" { "b" }', '{ "a" "b" }'):
+            with self.assertRaises(VdfParseError):
+                parse(text)
+
+        with self.assertRaises(VdfParseError):
+            len(parse_lazy('"a" { "b" "1"')["a"])
+
+    def test_find_value_in_file(self):
+        """La búsqueda por bloques encuentra el primer valor de la clave."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "localconfig.vdf"
+            path.write_text(SAMPLE, encoding="utf-8")
+
+            self.assertEqual(find_value_in_file(path, "PersonaName", chunk_size=16),
+                             'Jugador "Pro"')
+            self.assertEqual(find_value_in_file(path, "Playtime"), "120")
+            self.assertIsNone(find_value_in_file(path, "AccountName"))
+
+
+if __name__ == "__main__":
+    unittest.main()